@@ -4,6 +4,7 @@ Admin command handlers for AbaQuiz.
 Handles user management, broadcasting, and system monitoring.
 """
 
+import asyncio
 import time
 from datetime import datetime
 
@@ -11,11 +12,13 @@ from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 
-from src.bot import keyboards, messages
+from src.bot import messages
 from src.bot.middleware import admin_middleware, dm_only_middleware
+from src.bot.render_cache import VARIANT_BONUS, get_render_cache
 from src.config.logging import get_logger, log_user_action
 from src.config.settings import get_settings
 from src.database.repository import get_repository
+from src.services.telegram_sender import get_telegram_sender
 
 logger = get_logger(__name__)
 
@@ -342,20 +345,38 @@ async def broadcast_command(
         f"Message: {message_text[:100]}{'...' if len(message_text) > 100 else ''}"
     )
 
-    success_count = 0
-    failure_count = 0
+    # Run in the background so the send loop doesn't hold up update processing
+    context.application.create_task(
+        _execute_broadcast(update, context, users, message_text),
+        update=update,
+    )
 
-    for user in users:
-        try:
-            await context.bot.send_message(
-                chat_id=user["telegram_id"],
-                text=f"*Announcement*\n\n{message_text}",
-                parse_mode=ParseMode.MARKDOWN,
-            )
-            success_count += 1
-        except Exception as e:
-            failure_count += 1
-            logger.warning(f"Failed to broadcast to {user['telegram_id']}: {e}")
+
+async def _execute_broadcast(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    users: list[dict],
+    message_text: str,
+) -> None:
+    """Send a broadcast message to all users and report the results."""
+    sender = get_telegram_sender(context.bot)
+    text = f"*Announcement*\n\n{message_text}"
+
+    # The sender paces these to the global and per-chat limits
+    results = await asyncio.gather(*(
+        sender.send_message(
+            chat_id=user["telegram_id"],
+            text=text,
+            parse_mode=ParseMode.MARKDOWN,
+        )
+        for user in users
+    ))
+
+    success_count = sum(1 for result in results if result.ok)
+    failure_count = len(results) - success_count
+    for result in results:
+        if not result.ok:
+            logger.warning(f"Failed to broadcast to {result.chat_id}: {result.error}")
 
     await update.message.reply_text(
         f"Broadcast complete!\n"
@@ -678,6 +699,19 @@ async def scheduler_command(
         lines.append(f"Success: {stats['total_success']}")
         lines.append(f"Failures: {stats['total_failures']}")
 
+    # Outgoing message pacing
+    sender_stats = get_telegram_sender(context.bot).get_stats()
+    lines.append("\n*Sender:*")
+    lines.append(f"Queue Depth: {sender_stats['queue_depth']}")
+    lines.append(f"Throughput: {sender_stats['throughput_per_second']} msg/s")
+    lines.append(
+        f"Sent: {sender_stats['sent']} | "
+        f"Permanent Failures: {sender_stats['permanent_failures']} | "
+        f"Failures: {sender_stats['failures']}"
+    )
+    if sender_stats["paused_for_seconds"] > 0:
+        lines.append(f"Flood Pause: {sender_stats['paused_for_seconds']:.0f}s remaining")
+
     # Upcoming jobs (next 5)
     if status["jobs"]:
         lines.append("\n*Next Scheduled Jobs:*")
@@ -745,7 +779,11 @@ async def bonus_command(
         )
         return
 
-    await _execute_bonus_push(update, context, users, repo)
+    # Run in the background so the send loop doesn't hold up update processing
+    context.application.create_task(
+        _execute_bonus_push(update, context, users, repo),
+        update=update,
+    )
 
 
 async def _execute_bonus_push(
@@ -759,11 +797,10 @@ async def _execute_bonus_push(
         f"Sending bonus questions to {len(users)} users..."
     )
 
-    success_count = 0
-    failure_count = 0
-    no_questions_count = 0
+    sender = get_telegram_sender(context.bot)
+    render_cache = get_render_cache()
 
-    for user in users:
+    async def push_to_user(user: dict) -> str:
         telegram_id = user["telegram_id"]
         internal_user_id = user["id"]
 
@@ -772,29 +809,28 @@ async def _execute_bonus_push(
             question = await repo.get_unseen_question_for_user(internal_user_id)
 
             if not question:
-                no_questions_count += 1
-                continue
+                return "no_question"
 
-            # Format and send question
-            question_text = messages.format_question(question)
-            keyboard = keyboards.build_answer_keyboard(
-                question_id=question["id"],
-                question_type=question["question_type"],
-                options=question.get("options"),
-            )
+            # Format (cached per question) and send
+            rendered = render_cache.get_question(question, VARIANT_BONUS)
 
-            message = await context.bot.send_message(
+            result = await sender.send_message(
                 chat_id=telegram_id,
-                text=f"*Bonus Question!*\n\n{question_text}",
-                reply_markup=keyboard,
+                text=rendered.text,
+                reply_markup=rendered.keyboard,
                 parse_mode=ParseMode.MARKDOWN,
             )
+            if not result.ok:
+                logger.warning(
+                    f"Failed to send bonus question to {telegram_id}: {result.error}"
+                )
+                return "failed"
 
             # Record sent question with is_bonus=True
             await repo.record_sent_question(
                 user_id=internal_user_id,
                 question_id=question["id"],
-                message_id=message.message_id,
+                message_id=result.message.message_id,
                 is_scheduled=False,
                 is_bonus=True,
             )
@@ -809,11 +845,16 @@ async def _execute_bonus_push(
                 f"{telegram_id}:{question['id']}"
             ] = time.time()
 
-            success_count += 1
+            return "sent"
 
         except Exception as e:
-            failure_count += 1
             logger.warning(f"Failed to send bonus question to {telegram_id}: {e}")
+            return "failed"
+
+    outcomes = await asyncio.gather(*(push_to_user(user) for user in users))
+    success_count = outcomes.count("sent")
+    failure_count = outcomes.count("failed")
+    no_questions_count = outcomes.count("no_question")
 
     # Report results
     result_lines = [
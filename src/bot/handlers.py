@@ -22,6 +22,7 @@ from src.bot.middleware import (
     ensure_user_exists,
     rate_limit_middleware,
 )
+from src.bot.render_cache import VARIANT_DAILY, get_render_cache
 from src.config.constants import (
     ACHIEVEMENTS,
     CONTENT_AREA_ALIASES,
@@ -34,6 +35,8 @@ from src.config.constants import (
 from src.config.logging import get_logger, log_user_action
 from src.config.settings import get_settings
 from src.database.repository import get_repository
+from src.gamification.achievements import get_achievement_engine
+from src.services.telegram_sender import SendResult, get_telegram_sender
 
 logger = get_logger(__name__)
 
@@ -74,7 +77,10 @@ async def start_command(
     db_user = await repo.get_user_by_telegram_id(user.id)
 
     if db_user and db_user.get("onboarding_complete"):
-        # Returning user
+        # Returning user - undo automatic pruning (e.g. they had blocked the bot)
+        if await repo.restore_pruned_user(user.id):
+            logger.info(f"Restored pruned subscriber {user.id}")
+
         await update.message.reply_text(
             "Welcome back! Use /quiz to get a practice question, "
             "or /help to see all commands.",
@@ -431,15 +437,10 @@ async def daily_command(
 
     if daily_question["user_answer"] is None:
         # Unanswered - resend with answer buttons
-        question_text = messages.format_question(daily_question, show_area=True)
-        keyboard = keyboards.build_answer_keyboard(
-            question_id=daily_question["question_id"],
-            question_type=daily_question["question_type"],
-            options=daily_question.get("options"),
-        )
+        rendered = get_render_cache().get_question(daily_question, VARIANT_DAILY)
         await update.message.reply_text(
-            f"*Your latest daily question:*\n\n{question_text}",
-            reply_markup=keyboard,
+            rendered.text,
+            reply_markup=rendered.keyboard,
             parse_mode=ParseMode.MARKDOWN,
         )
     else:
@@ -455,7 +456,7 @@ async def send_question_to_user(
     context: ContextTypes.DEFAULT_TYPE,
     content_area: Optional[str] = None,
     is_scheduled: bool = True,
-) -> bool:
+) -> Optional[SendResult]:
     """
     Send a question to a user.
 
@@ -466,7 +467,8 @@ async def send_question_to_user(
         is_scheduled: Whether this is a scheduled question
 
     Returns:
-        True if question was sent successfully
+        SendResult of the question message, or None if there was no
+        question to send (unknown user or no unseen questions)
     """
     settings = get_settings()
     repo = await get_repository(settings.database_path)
@@ -475,7 +477,7 @@ async def send_question_to_user(
     db_user = await repo.get_user_by_telegram_id(user_id)
     if not db_user:
         logger.warning(f"User {user_id} not found")
-        return False
+        return None
 
     internal_user_id = db_user["id"]
 
@@ -501,38 +503,38 @@ async def send_question_to_user(
             difficulty_min=difficulty_min,
         )
 
+    sender = get_telegram_sender(context.bot)
+
     if not question:
         # No questions available
-        try:
-            await context.bot.send_message(
-                chat_id=user_id,
-                text="No new questions available right now. Check back later!",
-            )
-        except Exception as e:
-            logger.error(f"Failed to send message to {user_id}: {e}")
-        return False
-
-    # Format and send question
-    question_text = messages.format_question(question)
-    keyboard = keyboards.build_answer_keyboard(
-        question_id=question["id"],
-        question_type=question["question_type"],
-        options=question.get("options"),
-    )
-
-    try:
-        message = await context.bot.send_message(
+        await sender.send_message(
             chat_id=user_id,
-            text=question_text,
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN,
+            text="No new questions available right now. Check back later!",
+            interactive=not is_scheduled,
         )
+        return None
+
+    # Format (cached per question) and send
+    rendered = get_render_cache().get_question(question)
 
+    # User-requested questions skip ahead of scheduled delivery waves
+    result = await sender.send_message(
+        chat_id=user_id,
+        text=rendered.text,
+        reply_markup=rendered.keyboard,
+        parse_mode=ParseMode.MARKDOWN,
+        interactive=not is_scheduled,
+    )
+    if not result.ok:
+        logger.error(f"Failed to send question to {user_id}: {result.error}")
+        return result
+
+    try:
         # Record sent question
         await repo.record_sent_question(
             user_id=internal_user_id,
             question_id=question["id"],
-            message_id=message.message_id,
+            message_id=result.message.message_id,
             is_scheduled=is_scheduled,
         )
 
@@ -554,11 +556,12 @@ async def send_question_to_user(
         log_user_action(
             logger, user_id, f"[Question {question['id']}]", direction="<<"
         )
-        return True
 
     except Exception as e:
-        logger.error(f"Failed to send question to {user_id}: {e}")
-        return False
+        # The question was delivered; only the bookkeeping is missing
+        logger.error(f"Failed to record question sent to {user_id}: {e}")
+
+    return result
 
 
 async def select_content_area_for_user(
@@ -704,27 +707,29 @@ async def answer_callback(
 
         await repo.add_points(internal_user_id, points)
 
-    # Check for new achievements
-    new_achievement = await check_achievements(internal_user_id, repo)
-
-    # Get source citation if available
-    source_citation = question.get("source_citation")
+    # Check for new achievements (incremental, driven by this answer)
+    new_achievement = await get_achievement_engine().record_answer(
+        internal_user_id,
+        repo,
+        content_area=question["content_area"],
+        is_correct=is_correct,
+        current_streak=new_streak,
+    )
 
-    # Format response
+    # Format response (question-only parts come from the render cache)
+    render_cache = get_render_cache()
     if is_correct:
         response, has_expand = messages.format_correct_answer(
             explanation=question["explanation"],
             points_earned=points,
             streak=new_streak,
             new_achievement=new_achievement,
-            source_citation=source_citation,
+            rendered_citation=render_cache.get_citation(question),
         )
     else:
-        response, has_expand = messages.format_incorrect_answer(
-            correct_answer=question["correct_answer"],
-            explanation=question["explanation"],
+        response, has_expand = render_cache.get_incorrect_feedback(
+            question,
             streak_broken=not streak_increased and new_streak == 1,
-            source_citation=source_citation,
         )
 
     await query.answer("Correct! ✅" if is_correct else "Incorrect ❌")
@@ -984,19 +989,14 @@ async def expand_source_callback(
 
     # Re-render message with expanded=True
     # We need to reconstruct the feedback portion with expanded citation
+    render_cache = get_render_cache()
     if is_correct:
         response, _ = messages.format_correct_answer(
             explanation=question["explanation"],
-            source_citation=source_citation,
-            expanded=True,
+            rendered_citation=render_cache.get_citation(question, expanded=True),
         )
     else:
-        response, _ = messages.format_incorrect_answer(
-            correct_answer=question["correct_answer"],
-            explanation=question["explanation"],
-            source_citation=source_citation,
-            expanded=True,
-        )
+        response, _ = render_cache.get_incorrect_feedback(question, expanded=True)
 
     # Get the original message and replace only the feedback portion
     try:
@@ -1030,59 +1030,14 @@ async def check_achievements(
     repo,
 ) -> Optional[AchievementType]:
     """
-    Check and award any newly earned achievements.
+    Re-evaluate all achievements for a user from the database.
+
+    The answer path uses the incremental engine directly; this full
+    re-check is for when counters may be out of date.
 
     Returns the first newly unlocked achievement, if any.
     """
-    stats = await repo.get_user_stats(user_id)
-    if not stats:
-        return None
-
-    total_answered = await repo.get_total_questions_answered(user_id)
-    current_streak = stats.get("current_streak", 0)
-
-    new_achievement = None
-
-    # Check question count achievements
-    count_achievements = [
-        (1, AchievementType.FIRST_STEPS),
-        (100, AchievementType.CENTURY_CLUB),
-        (500, AchievementType.KNOWLEDGE_SEEKER),
-    ]
-
-    for count, achievement in count_achievements:
-        if total_answered >= count:
-            if await repo.grant_achievement(user_id, achievement):
-                new_achievement = new_achievement or achievement
-
-    # Check streak achievements
-    streak_achievements = [
-        (7, AchievementType.WEEK_WARRIOR),
-        (30, AchievementType.MONTHLY_MASTER),
-        (100, AchievementType.STREAK_LEGEND),
-    ]
-
-    for days, achievement in streak_achievements:
-        if current_streak >= days:
-            if await repo.grant_achievement(user_id, achievement):
-                new_achievement = new_achievement or achievement
-
-    # Check content area mastery (90%+ with 20+ answers)
-    area_stats = await repo.get_user_accuracy_by_area(user_id)
-    mastery_achievements = [
-        (ContentArea.ETHICS, AchievementType.ETHICS_EXPERT),
-        (ContentArea.BEHAVIOR_ASSESSMENT, AchievementType.ASSESSMENT_ACE),
-        (ContentArea.BEHAVIOR_CHANGE_PROCEDURES, AchievementType.PROCEDURES_PRO),
-        (ContentArea.EXPERIMENTAL_DESIGN, AchievementType.DESIGN_SPECIALIST),
-    ]
-
-    for area, achievement in mastery_achievements:
-        area_stat = area_stats.get(area.value, {})
-        if area_stat.get("total", 0) >= 20 and area_stat.get("accuracy", 0) >= 0.9:
-            if await repo.grant_achievement(user_id, achievement):
-                new_achievement = new_achievement or achievement
-
-    return new_achievement
+    return await get_achievement_engine().evaluate_user(user_id, repo)
 
 
 # =============================================================================
@@ -1259,7 +1214,12 @@ async def stop_command(
 
     log_user_action(logger, user.id, "/stop")
 
-    await repo.update_user(user.id, is_subscribed=False)
+    await repo.update_user(
+        user.id,
+        is_subscribed=False,
+        unsubscribed_reason=None,
+        unsubscribed_at=None,
+    )
 
     await update.message.reply_text(
         "You've been unsubscribed from daily questions.\n\n"
@@ -1407,7 +1367,12 @@ async def subscription_callback(
     settings = get_settings()
     repo = await get_repository(settings.database_path)
 
-    await repo.update_user(user_id, is_subscribed=new_status)
+    await repo.update_user(
+        user_id,
+        is_subscribed=new_status,
+        unsubscribed_reason=None,
+        unsubscribed_at=None,
+    )
 
     status_text = "subscribed to" if new_status else "unsubscribed from"
     await query.edit_message_text(
@@ -148,6 +148,7 @@ def format_correct_answer(
     new_achievement: Optional[AchievementType] = None,
     source_citation: Optional[dict[str, Any]] = None,
     expanded: bool = False,
+    rendered_citation: Optional[tuple[str, bool]] = None,
 ) -> tuple[str, bool]:
     """
     Format feedback for a correct answer.
@@ -159,6 +160,8 @@ def format_correct_answer(
         new_achievement: Newly unlocked achievement (if any)
         source_citation: Source citation dict (section, heading, quote)
         expanded: Whether to show expanded quote
+        rendered_citation: Pre-rendered format_source_citation() result
+            (used instead of source_citation when given)
 
     Returns:
         Tuple of (formatted_message, has_expandable_quote)
@@ -187,8 +190,10 @@ def format_correct_answer(
 
     # Add source citation if available
     has_expandable = False
-    if source_citation:
-        citation_text, has_expandable = format_source_citation(source_citation, expanded)
+    if rendered_citation is None and source_citation:
+        rendered_citation = format_source_citation(source_citation, expanded)
+    if rendered_citation:
+        citation_text, has_expandable = rendered_citation
         if citation_text:
             lines.append(f"\n{citation_text}")
 
@@ -201,6 +206,7 @@ def format_incorrect_answer(
     streak_broken: bool = False,
     source_citation: Optional[dict[str, Any]] = None,
     expanded: bool = False,
+    rendered_citation: Optional[tuple[str, bool]] = None,
 ) -> tuple[str, bool]:
     """
     Format feedback for an incorrect answer.
@@ -211,6 +217,8 @@ def format_incorrect_answer(
         streak_broken: Whether the streak was broken
         source_citation: Source citation dict (section, heading, quote)
         expanded: Whether to show expanded quote
+        rendered_citation: Pre-rendered format_source_citation() result
+            (used instead of source_citation when given)
 
     Returns:
         Tuple of (formatted_message, has_expandable_quote)
@@ -225,8 +233,10 @@ def format_incorrect_answer(
 
     # Add source citation if available
     has_expandable = False
-    if source_citation:
-        citation_text, has_expandable = format_source_citation(source_citation, expanded)
+    if rendered_citation is None and source_citation:
+        rendered_citation = format_source_citation(source_citation, expanded)
+    if rendered_citation:
+        citation_text, has_expandable = rendered_citation
         if citation_text:
             lines.append(f"\n{citation_text}")
 
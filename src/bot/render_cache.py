@@ -0,0 +1,200 @@
+"""
+Question render cache for AbaQuiz.
+
+Question text, answer buttons, and explanation/citation blocks are the same
+for every recipient of a question, so they are rendered once and reused by
+the scheduled, /quiz, /daily, and bonus delivery paths.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+from telegram import InlineKeyboardMarkup
+
+from src.bot import keyboards, messages
+from src.config.logging import get_logger
+from src.database.repository import add_question_change_listener
+
+logger = get_logger(__name__)
+
+# Question variants and the header shown above the question text
+VARIANT_DEFAULT = "default"
+VARIANT_BONUS = "bonus"
+VARIANT_DAILY = "daily"
+
+VARIANT_HEADERS: dict[str, str] = {
+    VARIANT_DEFAULT: "",
+    VARIANT_BONUS: "*Bonus Question!*\n\n",
+    VARIANT_DAILY: "*Your latest daily question:*\n\n",
+}
+
+
+@dataclass(frozen=True)
+class RenderedQuestion:
+    """Ready-to-send question message."""
+
+    text: str
+    keyboard: InlineKeyboardMarkup
+
+
+def _question_id(question: dict[str, Any]) -> int:
+    """Get the question ID from a question row or a sent-question join row."""
+    if question.get("id") is not None:
+        return question["id"]
+    return question["question_id"]
+
+
+class QuestionRenderCache:
+    """
+    Bounded LRU cache of rendered question content.
+
+    Entries are keyed by (question_id, variant, content version). The
+    version is bumped whenever the repository reports the question as
+    edited or reviewed, so stale renders are never served.
+    """
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, Hashable, int], Any] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: tuple[int, Hashable, int]) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def _put(self, key: tuple[int, Hashable, int], value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _key(self, question_id: int, variant: Hashable) -> tuple[int, Hashable, int]:
+        return (question_id, variant, self._versions.get(question_id, 0))
+
+    def get_question(
+        self,
+        question: dict[str, Any],
+        variant: str = VARIANT_DEFAULT,
+    ) -> RenderedQuestion:
+        """
+        Get the rendered text and answer keyboard for a question.
+
+        Args:
+            question: Question dict (from the questions table or a sent-question join)
+            variant: One of VARIANT_DEFAULT, VARIANT_BONUS, VARIANT_DAILY
+
+        Returns:
+            RenderedQuestion with text and keyboard
+        """
+        question_id = _question_id(question)
+        key = self._key(question_id, ("question", variant))
+
+        rendered = self._get(key)
+        if rendered is None:
+            text = messages.format_question(question, show_area=True)
+            rendered = RenderedQuestion(
+                text=f"{VARIANT_HEADERS.get(variant, '')}{text}",
+                keyboard=keyboards.build_answer_keyboard(
+                    question_id=question_id,
+                    question_type=question["question_type"],
+                    options=question.get("options"),
+                ),
+            )
+            self._put(key, rendered)
+
+        return rendered
+
+    def get_citation(
+        self,
+        question: dict[str, Any],
+        expanded: bool = False,
+    ) -> tuple[str, bool]:
+        """
+        Get the rendered source citation block for a question.
+
+        Returns:
+            Tuple of (formatted_text, has_expandable_quote)
+        """
+        key = self._key(_question_id(question), ("citation", expanded))
+
+        rendered = self._get(key)
+        if rendered is None:
+            citation = question.get("source_citation")
+            rendered = messages.format_source_citation(
+                citation if isinstance(citation, dict) else None,
+                expanded,
+            )
+            self._put(key, rendered)
+
+        return rendered
+
+    def get_incorrect_feedback(
+        self,
+        question: dict[str, Any],
+        streak_broken: bool = False,
+        expanded: bool = False,
+    ) -> tuple[str, bool]:
+        """
+        Get the rendered feedback for an incorrect answer.
+
+        Incorrect feedback has no per-user parts besides the streak notice,
+        so the whole message is cached per variant.
+
+        Returns:
+            Tuple of (formatted_message, has_expandable_quote)
+        """
+        key = self._key(_question_id(question), ("incorrect", streak_broken, expanded))
+
+        rendered = self._get(key)
+        if rendered is None:
+            rendered = messages.format_incorrect_answer(
+                correct_answer=question["correct_answer"],
+                explanation=question["explanation"],
+                streak_broken=streak_broken,
+                rendered_citation=self.get_citation(question, expanded),
+            )
+            self._put(key, rendered)
+
+        return rendered
+
+    def invalidate(self, question_id: Optional[int] = None) -> None:
+        """
+        Invalidate cached renders for a question (or everything if None).
+
+        Bumping the version makes old entries unreachable; they age out of
+        the LRU naturally.
+        """
+        if question_id is None:
+            self._entries.clear()
+            self._versions.clear()
+        else:
+            self._versions[question_id] = self._versions.get(question_id, 0) + 1
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global cache instance
+_render_cache: Optional[QuestionRenderCache] = None
+
+
+def get_render_cache() -> QuestionRenderCache:
+    """Get or create the global render cache instance."""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = QuestionRenderCache()
+        add_question_change_listener(_render_cache.invalidate)
+    return _render_cache
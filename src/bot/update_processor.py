@@ -0,0 +1,124 @@
+"""
+Per-user ordered update processor for AbaQuiz.
+
+Processes Telegram updates concurrently across users while keeping the
+updates of any single user strictly serialized, so answer taps from one
+user never race each other and one slow handler cannot stall everyone else.
+"""
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Hashable, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Limit handed to PTB, whose semaphore is taken before do_process_update and
+# would otherwise let one user's queued updates hold every slot
+_PTB_UNBOUNDED = sys.maxsize
+
+
+class _KeyQueue:
+    """Ordering state for a single user key."""
+
+    __slots__ = ("lock", "pending")
+
+    def __init__(self) -> None:
+        # asyncio.Lock wakes waiters in FIFO order, which preserves arrival order
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Update processor that shards updates by user ID into keyed queues.
+
+    Updates for different users run concurrently (bounded by
+    handler_limit). Updates for the same user run one at a time
+    in the order they were received. Updates without a user or chat are
+    processed as soon as a slot is free, without ordering guarantees.
+
+    The concurrency bound is applied after the per-user lock, so updates
+    waiting behind their own user's earlier updates never hold a slot.
+
+    Usage:
+        Application.builder().concurrent_updates(PerUserUpdateProcessor(256))
+    """
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        super().__init__(_PTB_UNBOUNDED)
+        self.handler_limit = max_concurrent_updates
+        self._handler_slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self._queues: dict[Hashable, _KeyQueue] = {}
+
+    @staticmethod
+    def get_update_key(update: object) -> Optional[Hashable]:
+        """
+        Get the ordering key for an update.
+
+        Uses the effective user ID, falling back to the effective chat ID.
+
+        Args:
+            update: Incoming update (usually a telegram.Update)
+
+        Returns:
+            Ordering key, or None if the update has no user or chat
+        """
+        user = getattr(update, "effective_user", None)
+        if user is not None:
+            return ("user", user.id)
+
+        chat = getattr(update, "effective_chat", None)
+        if chat is not None:
+            return ("chat", chat.id)
+
+        return None
+
+    @property
+    def active_keys(self) -> int:
+        """Number of users with updates queued or in progress."""
+        return len(self._queues)
+
+    async def do_process_update(
+        self,
+        update: object,
+        coroutine: Awaitable[Any],
+    ) -> None:
+        """Run the update coroutine after any earlier updates for the same user."""
+        key = self.get_update_key(update)
+        if key is None:
+            async with self._handler_slots:
+                await coroutine
+            return
+
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = _KeyQueue()
+            self._queues[key] = queue
+        queue.pending += 1
+
+        try:
+            async with queue.lock, self._handler_slots:
+                await coroutine
+        finally:
+            queue.pending -= 1
+            if queue.pending == 0:
+                # Drop idle keys so memory tracks active users, not all users
+                self._queues.pop(key, None)
+
+    async def initialize(self) -> None:
+        """Nothing to allocate up front; queues are created on demand."""
+
+    async def shutdown(self) -> None:
+        """Log any users that still had updates queued."""
+        if self._queues:
+            logger.warning(
+                f"Update processor shutting down with {len(self._queues)} "
+                f"user queue(s) still active"
+            )
+        self._queues.clear()
@@ -42,6 +42,13 @@ class Settings:
         )
         self.morning_quiz_hour = bot_config.get("morning_quiz_hour", 8)
         self.evening_quiz_hour = bot_config.get("evening_quiz_hour", 20)
+        # Updates processed concurrently across users (per-user order is kept)
+        self.max_concurrent_updates = bot_config.get("max_concurrent_updates", 256)
+        # Outgoing message pacing (Telegram allows ~30 msg/s, ~1 msg/s per chat)
+        self.send_rate_per_second = bot_config.get("send_rate_per_second", 25)
+        self.send_per_chat_interval_seconds = bot_config.get(
+            "send_per_chat_interval_seconds", 1.0
+        )
 
         # Debug settings
         debug_config = self._config.get("debug", {})
@@ -66,6 +73,15 @@ class Settings:
         self.notification_dedup_window_seconds = admin_config.get(
             "notification_dedup_window_seconds", 60
         )
+        self.notification_dedup_max_keys = admin_config.get(
+            "notification_dedup_max_keys", 10000
+        )
+        self.notification_log_queue_size = admin_config.get(
+            "notification_log_queue_size", 1000
+        )
+        self.notification_log_flush_seconds = admin_config.get(
+            "notification_log_flush_seconds", 1.0
+        )
 
         # Rate limiting
         rate_config = self._config.get("rate_limit", {})
@@ -84,6 +100,8 @@ class Settings:
         self.openai_model = gen_config.get("openai_model", "gpt-5.2")
         self.reasoning_effort = gen_config.get("reasoning_effort", "low")
         self.reasoning_summary = gen_config.get("reasoning_summary", "auto")
+        # Shards retrieved per question; each is one heading-bounded section
+        self.file_search_max_results = gen_config.get("file_search_max_results", 8)
 
         # Question selection
         sel_config = self._config.get("question_selection", {})
@@ -118,6 +136,18 @@ class Settings:
             "bcba_weights", {}
         )
 
+        # Analytics rollups and raw event retention
+        rollup_config = self._config.get("rollups", {})
+        self.rollup_compact_interval_minutes = rollup_config.get(
+            "compact_interval_minutes", 15
+        )
+        # Days of raw rows to keep per table; tables not listed are kept forever
+        self.rollup_retention_days: dict[str, int] = rollup_config.get(
+            "retention_days", {"api_usage": 90, "notification_log": 30}
+        )
+        # Expired rows are appended here as JSONL before deletion; empty to just delete
+        self.rollup_archive_dir = rollup_config.get("archive_dir", "./data/archive")
+
         # Messages
         self.rejection_messages: list[str] = self._config.get(
             "rejection_messages", []
@@ -131,6 +161,11 @@ class Settings:
         self.web_enabled = self._get_env_bool("WEB_ENABLED", web_config.get("enabled", True))
         self.web_host = os.getenv("WEB_HOST", web_config.get("host", "127.0.0.1"))
         self.web_port = int(os.getenv("WEB_PORT", web_config.get("port", 8080)))
+        # Seconds a cached admin page is served before revalidating; 0 disables
+        self.web_cache_ttl_seconds: dict[str, float] = web_config.get(
+            "cache_ttl_seconds",
+            {"dashboard": 30, "questions": 15, "review": 10, "pool_stats": 60},
+        )
 
     def _require_env(self, name: str) -> str:
         """Get required environment variable or raise error."""
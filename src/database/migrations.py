@@ -19,6 +19,11 @@ from src.database.models import (
     CREATE_QUESTION_REPORTS_TABLE,
     CREATE_QUESTION_STATS_TABLE,
     CREATE_QUESTION_REVIEWS_TABLE,
+    CREATE_TABLE_ROW_COUNTS_TABLE,
+    FTS_INDEXES,
+    ROLLUP_TABLES,
+    fts_index_sql,
+    is_internal_table,
 )
 
 logger = get_logger(__name__)
@@ -106,9 +111,84 @@ async def run_migrations(db_path: str) -> None:
             await migrate_to_v6(db)
             await set_schema_version(db, 6)
 
+        # Migration v7: Track why/when users were automatically unsubscribed
+        if current_version < 7:
+            await migrate_to_v7(db)
+            await set_schema_version(db, 7)
+
+        # Migration v8: Add rollup tables for analytics
+        if current_version < 8:
+            await migrate_to_v8(db)
+            await set_schema_version(db, 8)
+
+        # Migration v9: Add full-text search indexes
+        if current_version < 9:
+            await migrate_to_v9(db)
+            await set_schema_version(db, 9)
+
+        # Migration v10: Add per-table write versions to table_row_counts
+        if current_version < 10:
+            await migrate_to_v10(db)
+            await set_schema_version(db, 10)
+
+        # Not versioned: covers tables added by any migration above
+        await install_row_count_triggers(db)
+
         await db.commit()
 
 
+async def install_row_count_triggers(db: aiosqlite.Connection) -> None:
+    """
+    Keep table_row_counts exact for every app table.
+
+    Creates insert/update/delete triggers for tables that lack them and
+    seeds their count in the same transaction. Every write also bumps the
+    table's version. Idempotent; runs after migrations so new tables are
+    picked up.
+    """
+    await db.execute(CREATE_TABLE_ROW_COUNTS_TABLE)
+
+    async with db.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND sql NOT LIKE 'CREATE VIRTUAL%'"
+    ) as cursor:
+        tables = [row[0] for row in await cursor.fetchall()]
+
+    for table in tables:
+        if is_internal_table(table):
+            continue
+
+        async with db.execute(
+            "SELECT 1 FROM table_row_counts WHERE table_name = ?", (table,)
+        ) as cursor:
+            if await cursor.fetchone():
+                continue
+
+        await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_row_count_ai AFTER INSERT ON [{table}] BEGIN
+                UPDATE table_row_counts SET row_count = row_count + 1, version = version + 1
+                WHERE table_name = '{table}';
+            END
+        """)
+        await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_row_count_au AFTER UPDATE ON [{table}] BEGIN
+                UPDATE table_row_counts SET version = version + 1
+                WHERE table_name = '{table}';
+            END
+        """)
+        await db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_row_count_ad AFTER DELETE ON [{table}] BEGIN
+                UPDATE table_row_counts SET row_count = row_count - 1, version = version + 1
+                WHERE table_name = '{table}';
+            END
+        """)
+        await db.execute(
+            f"INSERT INTO table_row_counts (table_name, row_count) "
+            f"SELECT ?, COUNT(*) FROM [{table}]",
+            (table,),
+        )
+        logger.info(f"Installed row count triggers on {table}")
+
+
 async def migrate_to_v1(db: aiosqlite.Connection) -> None:
     """
     Migration to schema version 1.
@@ -408,3 +488,101 @@ async def migrate_to_v6(db: aiosqlite.Connection) -> None:
         logger.info("Column 'difficulty_min' already exists in users table")
 
     logger.info("Migration v6 complete")
+
+
+async def migrate_to_v7(db: aiosqlite.Connection) -> None:
+    """
+    Migration to schema version 7.
+
+    Adds subscriber pruning metadata:
+    - New column: users.unsubscribed_reason (why the bot unsubscribed the user)
+    - New column: users.unsubscribed_at (when the user was pruned)
+    """
+    logger.info("Running migration v7: Adding subscriber pruning columns to users table")
+
+    async with db.execute("PRAGMA table_info(users)") as cursor:
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+
+    if "unsubscribed_reason" not in column_names:
+        await db.execute("ALTER TABLE users ADD COLUMN unsubscribed_reason TEXT")
+        logger.info("Added 'unsubscribed_reason' column to users table")
+
+    if "unsubscribed_at" not in column_names:
+        await db.execute("ALTER TABLE users ADD COLUMN unsubscribed_at TIMESTAMP")
+        logger.info("Added 'unsubscribed_at' column to users table")
+
+    logger.info("Migration v7 complete")
+
+
+async def migrate_to_v8(db: aiosqlite.Connection) -> None:
+    """
+    Migration to schema version 8.
+
+    Adds analytics rollups maintained by the rollup compactor:
+    - New tables: api_usage_hourly, answers_daily, active_users_daily,
+      notification_events_hourly, rollup_state
+    - New index: users(created_at) for new-user counts
+    """
+    logger.info("Running migration v8: Adding rollup tables")
+
+    for table_sql in ROLLUP_TABLES:
+        await db.execute(table_sql)
+    logger.info("Created rollup tables")
+
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)"
+    )
+    logger.info("Created index on users.created_at")
+
+    logger.info("Migration v8 complete")
+
+
+async def migrate_to_v9(db: aiosqlite.Connection) -> None:
+    """
+    Migration to schema version 9.
+
+    Adds FTS5 full-text indexes with sync triggers:
+    - questions_fts over questions (content, explanation, options, source_citation)
+    - notification_log_fts over notification_log (title, message, metadata)
+
+    Existing rows are indexed with an FTS5 'rebuild'. If this SQLite build
+    lacks FTS5 the indexes are skipped and searches fall back to LIKE.
+    """
+    logger.info("Running migration v9: Adding full-text search indexes")
+
+    for table, (fts_table, _) in FTS_INDEXES.items():
+        try:
+            for sql in fts_index_sql(table):
+                await db.execute(sql)
+        except aiosqlite.OperationalError as e:
+            logger.warning(f"Skipping {fts_table}, FTS5 unavailable: {e}")
+            continue
+
+        await db.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        logger.info(f"Created and populated {fts_table}")
+
+    logger.info("Migration v9 complete")
+
+
+async def migrate_to_v10(db: aiosqlite.Connection) -> None:
+    """
+    Migration to schema version 10.
+
+    Adds a per-table write version to table_row_counts so cached admin
+    pages are revalidated only when the tables they read change. Drops the
+    row count triggers and table_row_counts; install_row_count_triggers
+    then recreates them with version bumps and reseeds the counts.
+    """
+    logger.info("Running migration v10: Adding per-table write versions")
+
+    async with db.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE '%_row_count_a_'"
+    ) as cursor:
+        triggers = [row[0] for row in await cursor.fetchall()]
+    for trigger in triggers:
+        await db.execute(f"DROP TRIGGER IF EXISTS [{trigger}]")
+    await db.execute("DROP TABLE IF EXISTS table_row_counts")
+    logger.info(f"Dropped {len(triggers)} row count triggers")
+
+    logger.info("Migration v10 complete")
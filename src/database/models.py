@@ -256,6 +256,152 @@ CREATE TABLE IF NOT EXISTS generation_progress (
 )
 """
 
+# Rollups - maintained incrementally from raw event tables by the compactor
+CREATE_API_USAGE_HOURLY_TABLE = """
+CREATE TABLE IF NOT EXISTS api_usage_hourly (
+    hour TEXT NOT NULL,  -- 'YYYY-MM-DD HH:00:00'
+    model TEXT NOT NULL,
+    content_area TEXT NOT NULL DEFAULT '',
+    calls INTEGER DEFAULT 0,
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    cache_write_tokens INTEGER DEFAULT 0,
+    cache_read_tokens INTEGER DEFAULT 0,
+    estimated_cost REAL DEFAULT 0,
+    PRIMARY KEY (hour, model, content_area)
+)
+"""
+
+CREATE_ANSWERS_DAILY_TABLE = """
+CREATE TABLE IF NOT EXISTS answers_daily (
+    day TEXT NOT NULL,  -- 'YYYY-MM-DD'
+    content_area TEXT NOT NULL DEFAULT '',
+    answers INTEGER DEFAULT 0,
+    correct INTEGER DEFAULT 0,
+    PRIMARY KEY (day, content_area)
+)
+"""
+
+# Exact per-day active user sets (one row per user per active day)
+CREATE_ACTIVE_USERS_DAILY_TABLE = """
+CREATE TABLE IF NOT EXISTS active_users_daily (
+    day TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    answers INTEGER DEFAULT 0,
+    PRIMARY KEY (day, user_id)
+)
+"""
+
+CREATE_NOTIFICATION_EVENTS_HOURLY_TABLE = """
+CREATE TABLE IF NOT EXISTS notification_events_hourly (
+    hour TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    count INTEGER DEFAULT 0,
+    PRIMARY KEY (hour, event_type)
+)
+"""
+
+# Compactor watermarks: highest raw row id already folded into rollups
+CREATE_ROLLUP_STATE_TABLE = """
+CREATE TABLE IF NOT EXISTS rollup_state (
+    source TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+ROLLUP_TABLES = [
+    CREATE_API_USAGE_HOURLY_TABLE,
+    CREATE_ANSWERS_DAILY_TABLE,
+    CREATE_ACTIVE_USERS_DAILY_TABLE,
+    CREATE_NOTIFICATION_EVENTS_HOURLY_TABLE,
+    CREATE_ROLLUP_STATE_TABLE,
+]
+
+# Row counts per table, kept exact by per-table triggers (admin dashboard).
+# version is bumped by every insert, update and delete (admin response cache).
+CREATE_TABLE_ROW_COUNTS_TABLE = """
+CREATE TABLE IF NOT EXISTS table_row_counts (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+# Full-text search - external-content FTS5 indexes kept in sync by triggers.
+# Maps source table -> (FTS table, indexed columns).
+FTS_INDEXES: dict[str, tuple[str, list[str]]] = {
+    "questions": (
+        "questions_fts",
+        ["content", "explanation", "options", "source_citation"],
+    ),
+    "notification_log": (
+        "notification_log_fts",
+        ["title", "message", "metadata"],
+    ),
+}
+
+
+def fts_index_sql(table: str) -> list[str]:
+    """
+    Get statements creating a table's FTS5 index and its sync triggers.
+
+    Args:
+        table: Source table name (key of FTS_INDEXES)
+
+    Returns:
+        CREATE VIRTUAL TABLE and CREATE TRIGGER statements
+    """
+    fts_table, columns = FTS_INDEXES[table]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {column_list},
+            content='{table}',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """,
+    ]
+
+
+def is_internal_table(name: str) -> bool:
+    """
+    Check whether a table is SQLite/FTS bookkeeping rather than app data.
+
+    Internal tables are hidden from the admin table browser and get no
+    row count triggers.
+    """
+    if name.startswith("sqlite_") or name == "table_row_counts":
+        return True
+    return any(
+        name == fts_table or name.startswith(f"{fts_table}_")
+        for fts_table, _ in FTS_INDEXES.values()
+    )
+
+
 # Indexes for performance
 CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_users_telegram_id ON users(telegram_id)",
@@ -263,6 +409,7 @@ CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_user_answers_question_id ON user_answers(question_id)",
     "CREATE INDEX IF NOT EXISTS idx_user_answers_answered_at ON user_answers(answered_at)",
     "CREATE INDEX IF NOT EXISTS idx_questions_content_area ON questions(content_area)",
+    "CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions(created_at)",
     "CREATE INDEX IF NOT EXISTS idx_achievements_user_id ON achievements(user_id)",
     "CREATE INDEX IF NOT EXISTS idx_banned_users_telegram_id ON banned_users(telegram_id)",
     "CREATE INDEX IF NOT EXISTS idx_api_usage_timestamp ON api_usage(timestamp)",
@@ -277,6 +424,7 @@ CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_notification_log_event_type ON notification_log(event_type)",
     "CREATE INDEX IF NOT EXISTS idx_notification_log_created_at ON notification_log(created_at)",
     "CREATE INDEX IF NOT EXISTS idx_notification_log_summary ON notification_log(included_in_summary_at)",
+    "CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)",
 ]
 
 # All table creation statements in order
@@ -299,4 +447,6 @@ ALL_TABLES = [
     CREATE_BROADCAST_QUEUE_TABLE,
     CREATE_GENERATION_QUEUE_TABLE,
     CREATE_GENERATION_PROGRESS_TABLE,
+    *ROLLUP_TABLES,
+    CREATE_TABLE_ROW_COUNTS_TABLE,
 ]
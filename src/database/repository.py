@@ -4,17 +4,196 @@ Database repository for AbaQuiz.
 All database operations are centralized here.
 """
 
+import base64
 import json
-from datetime import date, datetime, timedelta
-from typing import Any, Optional
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Optional
 
 import aiosqlite
 
 from src.config.constants import AchievementType, ContentArea
 from src.config.logging import get_logger
+from src.database.models import FTS_INDEXES, is_internal_table
 
 logger = get_logger(__name__)
 
+# Callbacks invoked with a question ID whenever that question is modified
+_question_change_listeners: list[Callable[[int], None]] = []
+
+
+def add_question_change_listener(callback: Callable[[int], None]) -> None:
+    """Register a callback to run when a question is edited or reviewed."""
+    if callback not in _question_change_listeners:
+        _question_change_listeners.append(callback)
+
+# Callbacks invoked with an admin's Telegram ID whenever their settings change
+_admin_settings_listeners: list[Callable[[int], None]] = []
+
+
+def add_admin_settings_listener(callback: Callable[[int], None]) -> None:
+    """Register a callback to run when admin notification settings are written."""
+    if callback not in _admin_settings_listeners:
+        _admin_settings_listeners.append(callback)
+
+
+# Raw event tables folded into rollups: source table -> timestamp column.
+# Doubles as the whitelist for table names interpolated into rollup SQL.
+ROLLUP_SOURCES: dict[str, str] = {
+    "api_usage": "timestamp",
+    "user_answers": "answered_at",
+    "notification_log": "created_at",
+}
+
+# Statements that fold raw rows with lo < id <= hi into each source's rollups
+_ROLLUP_STATEMENTS: dict[str, list[str]] = {
+    "api_usage": [
+        """
+        INSERT INTO api_usage_hourly
+            (hour, model, content_area, calls, input_tokens, output_tokens,
+             cache_write_tokens, cache_read_tokens, estimated_cost)
+        SELECT
+            strftime('%Y-%m-%d %H:00:00', timestamp), model, COALESCE(content_area, ''),
+            COUNT(*), SUM(input_tokens), SUM(output_tokens),
+            SUM(cache_write_tokens), SUM(cache_read_tokens), SUM(estimated_cost)
+        FROM api_usage
+        WHERE id > ? AND id <= ?
+        GROUP BY 1, 2, 3
+        ON CONFLICT(hour, model, content_area) DO UPDATE SET
+            calls = calls + excluded.calls,
+            input_tokens = input_tokens + excluded.input_tokens,
+            output_tokens = output_tokens + excluded.output_tokens,
+            cache_write_tokens = cache_write_tokens + excluded.cache_write_tokens,
+            cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens,
+            estimated_cost = estimated_cost + excluded.estimated_cost
+        """,
+    ],
+    "user_answers": [
+        """
+        INSERT INTO answers_daily (day, content_area, answers, correct)
+        SELECT
+            DATE(ua.answered_at), COALESCE(q.content_area, ''),
+            COUNT(*), SUM(CASE WHEN ua.is_correct THEN 1 ELSE 0 END)
+        FROM user_answers ua
+        LEFT JOIN questions q ON q.id = ua.question_id
+        WHERE ua.id > ? AND ua.id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT(day, content_area) DO UPDATE SET
+            answers = answers + excluded.answers,
+            correct = correct + excluded.correct
+        """,
+        """
+        INSERT INTO active_users_daily (day, user_id, answers)
+        SELECT DATE(answered_at), user_id, COUNT(*)
+        FROM user_answers
+        WHERE id > ? AND id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT(day, user_id) DO UPDATE SET
+            answers = answers + excluded.answers
+        """,
+    ],
+    "notification_log": [
+        """
+        INSERT INTO notification_events_hourly (hour, event_type, count)
+        SELECT strftime('%Y-%m-%d %H:00:00', created_at), event_type, COUNT(*)
+        FROM notification_log
+        WHERE id > ? AND id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT(hour, event_type) DO UPDATE SET
+            count = count + excluded.count
+        """,
+    ],
+}
+
+
+# Admin browse: counts above this are estimated instead of scanned
+BROWSE_EXACT_COUNT_LIMIT = 10000
+
+# Rows per UPDATE ... FROM (VALUES ...) statement (2 bound parameters each)
+BULK_UPDATE_ROWS = 500
+
+
+def _encode_cursor(values: list[Any]) -> str:
+    """Encode a keyset position (sort value, row id) for a query string."""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[list[Any]]:
+    """Decode a cursor from _encode_cursor, or None if missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != 2:
+        return None
+    return values
+
+
+def _fts_query(search: str) -> Optional[str]:
+    """
+    Turn free-text admin input into a safe FTS5 prefix query.
+
+    Each word is quoted (so FTS operators in the input are literal) and
+    prefix-matched, and all words must match.
+    """
+    terms = re.findall(r"\w+", search)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _keyset_condition(
+    sort_expr: Optional[str],
+    id_expr: str,
+    descending: bool,
+    position: list[Any],
+) -> tuple[str, list[Any]]:
+    """
+    Build a WHERE condition selecting rows after a keyset position.
+
+    Rows are ordered by (sort_expr, id_expr) in one direction, with SQLite's
+    NULL placement (first ascending, last descending).
+
+    Args:
+        sort_expr: Sort column expression, or None to order by id only
+        id_expr: Unique tiebreaker expression (rowid or id)
+        descending: Whether the order is descending
+        position: [sort value, id] of the last row already shown
+
+    Returns:
+        Tuple of (condition SQL, params)
+    """
+    value, row_id = position
+    op = "<" if descending else ">"
+
+    if sort_expr is None:
+        return f"{id_expr} {op} ?", [row_id]
+
+    if value is None:
+        same_null = f"({sort_expr} IS NULL AND {id_expr} {op} ?)"
+        if descending:
+            return same_null, [row_id]
+        return f"({same_null} OR {sort_expr} IS NOT NULL)", [row_id]
+
+    condition = f"({sort_expr}, {id_expr}) {op} (?, ?)"
+    if descending:
+        condition = f"({condition} OR {sort_expr} IS NULL)"
+    return condition, [value, row_id]
+
+
+def _sql_timestamp(value: datetime) -> str:
+    """Format a datetime like SQLite's CURRENT_TIMESTAMP for comparisons."""
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _next_hour(value: datetime) -> datetime:
+    """Start of the hour after the one containing value."""
+    return value.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
 
 class Repository:
     """Async database repository for all data operations."""
@@ -22,6 +201,10 @@ class Repository:
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
+        self._fts_tables: Optional[set[str]] = None
+        # Admin table metadata: table name -> columns, valid for one schema version
+        self._table_schemas: dict[str, list[dict[str, Any]]] = {}
+        self._table_schemas_version: Optional[int] = None
 
     async def connect(self) -> None:
         """Open database connection."""
@@ -42,6 +225,22 @@ class Repository:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._connection
 
+    def _question_changed(self, question_id: int) -> None:
+        """Notify listeners that a question was modified."""
+        for callback in _question_change_listeners:
+            try:
+                callback(question_id)
+            except Exception as e:
+                logger.warning(f"Question change listener failed for {question_id}: {e}")
+
+    def _admin_settings_changed(self, admin_id: int) -> None:
+        """Notify listeners that an admin's notification settings were written."""
+        for callback in _admin_settings_listeners:
+            try:
+                callback(admin_id)
+            except Exception as e:
+                logger.warning(f"Admin settings listener failed for {admin_id}: {e}")
+
     # =========================================================================
     # User Operations
     # =========================================================================
@@ -126,6 +325,70 @@ class Repository:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+    async def prune_unreachable_user(self, telegram_id: int, reason: str) -> bool:
+        """
+        Unsubscribe a user the bot can no longer reach (blocked, deactivated).
+
+        Args:
+            telegram_id: User's Telegram ID
+            reason: Why the user was pruned (e.g. 'blocked', 'chat_not_found')
+
+        Returns:
+            True if the user was subscribed and is now pruned
+        """
+        cursor = await self.db.execute(
+            """
+            UPDATE users
+            SET is_subscribed = 0,
+                unsubscribed_reason = ?,
+                unsubscribed_at = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE telegram_id = ? AND is_subscribed = 1
+            """,
+            (reason, datetime.now(), telegram_id),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def restore_pruned_user(self, telegram_id: int) -> bool:
+        """
+        Resubscribe a user that was automatically pruned.
+
+        Users who unsubscribed themselves are left alone.
+
+        Returns:
+            True if the user was restored
+        """
+        cursor = await self.db.execute(
+            """
+            UPDATE users
+            SET is_subscribed = 1,
+                unsubscribed_reason = NULL,
+                unsubscribed_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE telegram_id = ? AND is_subscribed = 0
+                AND unsubscribed_reason IS NOT NULL
+            """,
+            (telegram_id,),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def get_pruned_user_count(self, hours: int = 24) -> int:
+        """Get count of users automatically pruned in last N hours."""
+        cutoff = datetime.now() - timedelta(hours=hours)
+        async with self.db.execute(
+            """
+            SELECT COUNT(*) as count FROM users
+            WHERE is_subscribed = 0
+                AND unsubscribed_reason IS NOT NULL
+                AND unsubscribed_at > ?
+            """,
+            (cutoff,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row["count"] if row else 0
+
     async def get_all_users(self) -> list[dict[str, Any]]:
         """Get all users."""
         async with self.db.execute("SELECT * FROM users") as cursor:
@@ -362,6 +625,55 @@ class Repository:
             row = await cursor.fetchone()
             return row["count"] if row else 0
 
+    @staticmethod
+    def _question_filters(
+        content_area: Optional[str],
+        difficulty_min: Optional[int],
+        difficulty_max: Optional[int],
+    ) -> tuple[list[str], list[Any]]:
+        """Build WHERE conditions for the admin question filters."""
+        where: list[str] = []
+        params: list[Any] = []
+
+        if content_area:
+            where.append("content_area = ?")
+            params.append(content_area)
+
+        if difficulty_min is not None:
+            where.append("difficulty >= ?")
+            params.append(difficulty_min)
+
+        if difficulty_max is not None:
+            where.append("difficulty <= ?")
+            params.append(difficulty_max)
+
+        return where, params
+
+    async def iter_questions(
+        self,
+        content_area: Optional[str] = None,
+        difficulty_min: Optional[int] = None,
+        difficulty_max: Optional[int] = None,
+        search: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream questions matching the admin filters in ID order.
+
+        Same filters as browse_questions, but yields every match with
+        options decoded, reading batch_size rows at a time.
+        """
+        where, params = self._question_filters(content_area, difficulty_min, difficulty_max)
+        if search:
+            schema = await self.get_table_schema("questions")
+            search_where, search_params = await self._search_condition("questions", schema, search)
+            where += search_where
+            params += search_params
+
+        async for q in self._iter_where("questions", where, params, batch_size):
+            q["options"] = json.loads(q["options"])
+            yield q
+
     async def browse_questions(
         self,
         page: int = 1,
@@ -370,64 +682,84 @@ class Repository:
         difficulty_min: Optional[int] = None,
         difficulty_max: Optional[int] = None,
         search: Optional[str] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Browse questions with filters for the admin UI.
 
+        Newest first, paginated by seeking on (created_at, id). With a
+        search term and the FTS5 index available, matches are ranked by
+        relevance instead and each row gets a highlighted "snippet".
+
         Args:
-            page: Page number (1-indexed)
+            page: Page number for display only; position comes from the cursor
             per_page: Items per page
             content_area: Filter by content area
             difficulty_min: Minimum difficulty (1-5)
             difficulty_max: Maximum difficulty (1-5)
-            search: Search term for question content
+            search: Search term (prefix-matched words in content, explanation,
+                options and citation)
+            after: Cursor of the last question on the previous page
+            before: Cursor of the first question on the next page
 
         Returns:
-            Dict with rows, total, page, per_page, pages, and content_areas
+            Dict with rows, total, total_approximate, page, per_page, pages,
+            has_next, has_prev, next_cursor, prev_cursor, content_areas and
+            search_ranked
         """
-        # Build query with filters
-        query = "SELECT * FROM questions WHERE 1=1"
-        count_query = "SELECT COUNT(*) as count FROM questions WHERE 1=1"
-        params: list[Any] = []
-
-        if content_area:
-            query += " AND content_area = ?"
-            count_query += " AND content_area = ?"
-            params.append(content_area)
-
-        if difficulty_min is not None:
-            query += " AND difficulty >= ?"
-            count_query += " AND difficulty >= ?"
-            params.append(difficulty_min)
-
-        if difficulty_max is not None:
-            query += " AND difficulty <= ?"
-            count_query += " AND difficulty <= ?"
-            params.append(difficulty_max)
-
-        if search:
-            query += " AND (content LIKE ? OR explanation LIKE ?)"
-            count_query += " AND (content LIKE ? OR explanation LIKE ?)"
-            params.extend([f"%{search}%", f"%{search}%"])
-
-        # Get total count
-        async with self.db.execute(count_query, params) as cursor:
-            count_row = await cursor.fetchone()
-            total = count_row["count"] if count_row else 0
-
-        # Add ordering and pagination
-        query += " ORDER BY created_at DESC"
-        offset = (page - 1) * per_page
-        query += f" LIMIT {per_page} OFFSET {offset}"
+        where, params = self._question_filters(content_area, difficulty_min, difficulty_max)
+
+        fts_table = await self._get_fts_table("questions") if search else None
+        fts_query = _fts_query(search) if fts_table else None
+
+        if fts_query:
+            # Ranked full-text search: best matches first, with a snippet
+            # whose matches are wrapped in \x02...\x03 for the UI to highlight
+            total, approximate = await self._bounded_count(
+                "questions",
+                [*where, f"id IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)"],
+                [*params, fts_query],
+            )
+            from_sql = f"""(
+                SELECT q.*,
+                       bm25({fts_table}, 10.0, 5.0, 2.0, 1.0) AS search_rank,
+                       snippet({fts_table}, -1, char(2), char(3), '…', 16) AS snippet
+                FROM {fts_table}
+                JOIN questions q ON q.id = {fts_table}.rowid
+                WHERE {fts_table} MATCH ?
+            )"""
+            data = await self._keyset_page(
+                from_sql,
+                where,
+                [fts_query, *params],
+                "search_rank",
+                "id",
+                False,
+                per_page,
+                after=after,
+                before=before,
+            )
+        else:
+            if search:
+                where.append("(content LIKE ? OR explanation LIKE ?)")
+                params.extend([f"%{search}%", f"%{search}%"])
+
+            total, approximate = await self._bounded_count("questions", where, params)
+            data = await self._keyset_page(
+                "questions",
+                where,
+                params,
+                "created_at",
+                "id",
+                True,
+                per_page,
+                after=after,
+                before=before,
+            )
 
-        # Fetch rows
-        async with self.db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            questions = []
-            for row in rows:
-                q = dict(row)
-                q["options"] = json.loads(q["options"])
-                questions.append(q)
+        for q in data["rows"]:
+            q["options"] = json.loads(q["options"])
 
         # Get distinct content areas for filter dropdown
         async with self.db.execute(
@@ -436,13 +768,16 @@ class Repository:
             area_rows = await cursor.fetchall()
             content_areas = [r["content_area"] for r in area_rows]
 
+        page = max(page, 1)
         return {
-            "rows": questions,
+            **data,
             "total": total,
+            "total_approximate": approximate,
             "page": page,
             "per_page": per_page,
             "pages": (total + per_page - 1) // per_page if total > 0 else 1,
             "content_areas": content_areas,
+            "search_ranked": fts_query is not None,
         }
 
     # =========================================================================
@@ -1011,6 +1346,21 @@ class Repository:
             )
 
         await self.db.commit()
+        self._admin_settings_changed(telegram_id)
+
+    async def get_admin_settings_for_admins(
+        self, admin_ids: list[int]
+    ) -> list[dict[str, Any]]:
+        """Get admin settings rows for several admins in one query."""
+        if not admin_ids:
+            return []
+        placeholders = ", ".join("?" for _ in admin_ids)
+        async with self.db.execute(
+            f"SELECT * FROM admin_settings WHERE telegram_id IN ({placeholders})",
+            admin_ids,
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
 
     # =========================================================================
     # API Usage Operations
@@ -1050,22 +1400,43 @@ class Repository:
     async def get_api_usage_stats(
         self, hours: int = 24
     ) -> dict[str, Any]:
-        """Get API usage stats for the last N hours."""
+        """
+        Get API usage stats for the last N hours.
+
+        Whole hours come from api_usage_hourly; raw rows are only read for
+        the partial first hour and for rows not yet compacted.
+        """
         cutoff = datetime.now() - timedelta(hours=hours)
+        boundary = _next_hour(cutoff)
+        watermark = await self.get_rollup_watermark("api_usage")
 
         async with self.db.execute(
             """
             SELECT
-                COUNT(*) as total_calls,
+                COALESCE(SUM(calls), 0) as total_calls,
                 SUM(input_tokens) as total_input_tokens,
                 SUM(output_tokens) as total_output_tokens,
                 SUM(cache_write_tokens) as total_cache_write_tokens,
                 SUM(cache_read_tokens) as total_cache_read_tokens,
                 SUM(estimated_cost) as total_cost
-            FROM api_usage
-            WHERE timestamp > ?
+            FROM (
+                SELECT calls, input_tokens, output_tokens, cache_write_tokens,
+                       cache_read_tokens, estimated_cost
+                FROM api_usage_hourly
+                WHERE hour >= ?
+                UNION ALL
+                SELECT 1, input_tokens, output_tokens, cache_write_tokens,
+                       cache_read_tokens, estimated_cost
+                FROM api_usage
+                WHERE timestamp > ? AND (timestamp < ? OR id > ?)
+            )
             """,
-            (cutoff,),
+            (
+                _sql_timestamp(boundary),
+                _sql_timestamp(cutoff),
+                _sql_timestamp(boundary),
+                watermark,
+            ),
         ) as cursor:
             row = await cursor.fetchone()
             return dict(row) if row else {}
@@ -1075,19 +1446,30 @@ class Repository:
     # =========================================================================
 
     async def get_daily_stats(self, date_obj: date) -> dict[str, Any]:
-        """Get stats for a specific date."""
+        """Get stats for a specific date from daily rollups plus uncompacted answers."""
         date_str = date_obj.isoformat()
+        watermark = await self.get_rollup_watermark("user_answers")
 
         async with self.db.execute(
             """
             SELECT
-                COUNT(DISTINCT ua.user_id) as active_users,
-                COUNT(*) as answers_count,
-                SUM(CASE WHEN ua.is_correct THEN 1 ELSE 0 END) as correct_count
-            FROM user_answers ua
-            WHERE DATE(ua.answered_at) = ?
+                (SELECT COUNT(*) FROM (
+                    SELECT user_id FROM active_users_daily WHERE day = ?
+                    UNION
+                    SELECT user_id FROM user_answers
+                    WHERE id > ? AND DATE(answered_at) = ?
+                )) as active_users,
+                COALESCE(SUM(answers), 0) as answers_count,
+                COALESCE(SUM(correct), 0) as correct_count
+            FROM (
+                SELECT answers, correct FROM answers_daily WHERE day = ?
+                UNION ALL
+                SELECT 1, CASE WHEN is_correct THEN 1 ELSE 0 END
+                FROM user_answers
+                WHERE id > ? AND DATE(answered_at) = ?
+            )
             """,
-            (date_str,),
+            (date_str, watermark, date_str, date_str, watermark, date_str),
         ) as cursor:
             row = await cursor.fetchone()
             return dict(row) if row else {}
@@ -1107,15 +1489,33 @@ class Repository:
     # =========================================================================
 
     async def get_active_user_count(self, days: int = 7) -> int:
-        """Get count of users who answered a question in the last N days."""
+        """
+        Get count of users who answered a question in the last N days.
+
+        Whole days come from the exact per-day sets in active_users_daily;
+        raw answers are only read for the partial first day and for rows
+        not yet compacted.
+        """
         cutoff = datetime.now() - timedelta(days=days)
+        boundary = datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time())
+        watermark = await self.get_rollup_watermark("user_answers")
+
         async with self.db.execute(
             """
-            SELECT COUNT(DISTINCT user_id) as count
-            FROM user_answers
-            WHERE answered_at > ?
+            SELECT COUNT(*) as count FROM (
+                SELECT user_id FROM active_users_daily
+                WHERE day >= ?
+                UNION
+                SELECT user_id FROM user_answers
+                WHERE answered_at > ? AND (answered_at < ? OR id > ?)
+            )
             """,
-            (cutoff,),
+            (
+                boundary.date().isoformat(),
+                _sql_timestamp(cutoff),
+                _sql_timestamp(boundary),
+                watermark,
+            ),
         ) as cursor:
             row = await cursor.fetchone()
             return row["count"] if row else 0
@@ -1180,14 +1580,27 @@ class Repository:
             row = await cursor.fetchone()
             return row["count"] if row else 0
 
+    async def count_questions_with_null_difficulty(self, after_id: int = 0) -> int:
+        """Count questions where difficulty IS NULL and id > after_id."""
+        async with self.db.execute(
+            "SELECT COUNT(*) as count FROM questions WHERE difficulty IS NULL AND id > ?",
+            (after_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row["count"] if row else 0
+
     async def get_questions_with_null_difficulty(
-        self, limit: Optional[int] = None
+        self, limit: Optional[int] = None, after_id: int = 0
     ) -> list[dict[str, Any]]:
         """
-        Fetch questions where difficulty IS NULL.
+        Fetch questions where difficulty IS NULL, in id order.
+
+        Pass the last id of the previous page as after_id to page through
+        them (keyset pagination) without loading them all.
 
         Args:
             limit: Maximum number of questions to return (None = all)
+            after_id: Only return questions with id greater than this
 
         Returns:
             List of question dicts with id, content, content_area, options, correct_answer
@@ -1195,13 +1608,15 @@ class Repository:
         query = """
             SELECT id, content, content_area, options, correct_answer
             FROM questions
-            WHERE difficulty IS NULL
+            WHERE difficulty IS NULL AND id > ?
             ORDER BY id
         """
+        params: list[Any] = [after_id]
         if limit is not None:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
 
-        async with self.db.execute(query) as cursor:
+        async with self.db.execute(query, params) as cursor:
             rows = await cursor.fetchall()
             questions = []
             for row in rows:
@@ -1216,6 +1631,9 @@ class Repository:
         """
         Bulk update difficulty ratings for questions.
 
+        Writes each chunk of updates with one UPDATE ... FROM (VALUES ...)
+        statement and commits once.
+
         Args:
             updates: List of (question_id, difficulty) tuples
 
@@ -1226,14 +1644,23 @@ class Repository:
             return 0
 
         updated_count = 0
-        for question_id, difficulty in updates:
-            await self.db.execute(
-                "UPDATE questions SET difficulty = ? WHERE id = ?",
-                (difficulty, question_id),
+        for i in range(0, len(updates), BULK_UPDATE_ROWS):
+            chunk = updates[i : i + BULK_UPDATE_ROWS]
+            values = ", ".join(["(?, ?)"] * len(chunk))
+            cursor = await self.db.execute(
+                f"""
+                UPDATE questions SET difficulty = v.column2
+                FROM (VALUES {values}) AS v
+                WHERE questions.id = v.column1
+                """,
+                [value for row in chunk for value in row],
             )
-            updated_count += 1
+            updated_count += cursor.rowcount
+            await cursor.close()
 
         await self.db.commit()
+        for question_id, _ in updates:
+            self._question_changed(question_id)
         return updated_count
 
     # =========================================================================
@@ -1450,6 +1877,7 @@ class Repository:
             params,
         )
         await self.db.commit()
+        self._question_changed(question_id)
 
         return review_id
 
@@ -1571,47 +1999,352 @@ class Repository:
             params,
         )
         await self.db.commit()
+        self._question_changed(question_id)
         return True
 
     # =========================================================================
     # Admin Web GUI - Generic Table Operations
     # =========================================================================
 
-    async def get_all_tables(self) -> list[dict[str, Any]]:
-        """Get all table names with row counts."""
+    async def get_data_version(self) -> str:
+        """
+        Get a token that changes whenever the database is written.
+
+        Combines total_changes() (writes on this connection, which the bot and
+        web admin share in-process) with PRAGMA data_version (commits from any
+        other connection or process). Both are read without touching tables.
+
+        Returns:
+            Opaque version string
+        """
         async with self.db.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            "SELECT total_changes(), (SELECT data_version FROM pragma_data_version())"
         ) as cursor:
-            table_rows = await cursor.fetchall()
+            changes, data_version = await cursor.fetchone()
+        return f"{data_version}.{changes}"
+
+    async def get_table_versions(self, tables: tuple[str, ...]) -> str:
+        """
+        Get a token that changes whenever one of the given tables is written.
+
+        Built from the per-table write versions kept by the row count
+        triggers, so writes to other tables leave it unchanged. Falls back
+        to get_data_version() if a table has no triggers yet.
+
+        Args:
+            tables: Table names
+
+        Returns:
+            Opaque version string
+        """
+        placeholders = ", ".join("?" * len(tables))
+        async with self.db.execute(
+            f"SELECT table_name, version FROM table_row_counts "
+            f"WHERE table_name IN ({placeholders})",
+            tables,
+        ) as cursor:
+            versions = {row["table_name"]: row["version"] for row in await cursor.fetchall()}
+        if len(versions) < len(set(tables)):
+            return await self.get_data_version()
+        return ".".join(str(versions[table]) for table in tables)
+
+    async def _keyset_page(
+        self,
+        from_sql: str,
+        where: list[str],
+        params: list[Any],
+        sort_col: Optional[str],
+        id_col: str,
+        descending: bool,
+        per_page: int,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch one page by seeking on (sort column, id) instead of OFFSET.
+
+        Cost depends on page size, not depth. Going back ("before") runs the
+        same seek in the reverse order and flips the rows.
+
+        Returns:
+            Dict with rows, has_next, has_prev, next_cursor and prev_cursor
+        """
+        sort_expr = f"[{sort_col}]" if sort_col else None
+        position = _decode_cursor(before) or _decode_cursor(after)
+        backwards = position is not None and _decode_cursor(before) is not None
+        scan_descending = descending != backwards
+
+        conditions = list(where)
+        query_params = list(params)
+        if position is not None:
+            condition, seek_params = _keyset_condition(
+                sort_expr, id_col, scan_descending, position
+            )
+            conditions.append(condition)
+            query_params.extend(seek_params)
+
+        direction = "DESC" if scan_descending else "ASC"
+        order = f"{id_col} {direction}"
+        if sort_expr:
+            order = f"{sort_expr} {direction}, {order}"
+
+        query = f"SELECT *, {id_col} AS __cursor_id FROM {from_sql}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order} LIMIT ?"
+        query_params.append(per_page + 1)
+
+        async with self.db.execute(query, query_params) as cursor:
+            rows = [dict(row) for row in await cursor.fetchall()]
+
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, position is not None
+
+        def cursor_for(row: dict[str, Any]) -> str:
+            return _encode_cursor([row.get(sort_col) if sort_col else None, row["__cursor_id"]])
+
+        next_cursor = cursor_for(rows[-1]) if rows and has_next else None
+        prev_cursor = cursor_for(rows[0]) if rows and has_prev else None
+        for row in rows:
+            del row["__cursor_id"]
+
+        return {
+            "rows": rows,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        }
+
+    async def _bounded_count(
+        self,
+        table_name: str,
+        where: list[str],
+        params: list[Any],
+    ) -> tuple[int, bool]:
+        """
+        Count matching rows, stopping at BROWSE_EXACT_COUNT_LIMIT.
+
+        Unfiltered counts come from table_row_counts when available. Past
+        the limit, other unfiltered counts are estimated from the rowid
+        span (two index lookups) and filtered counts are reported as the
+        limit.
+
+        Returns:
+            Tuple of (count, is_approximate)
+        """
+        if not where:
+            count = (await self._get_row_counts()).get(table_name)
+            if count is not None:
+                return count, False
+
+        query = f"SELECT 1 FROM [{table_name}]"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        async with self.db.execute(
+            f"SELECT COUNT(*) as count FROM ({query} LIMIT ?)",
+            [*params, BROWSE_EXACT_COUNT_LIMIT + 1],
+        ) as cursor:
+            row = await cursor.fetchone()
+            count = row["count"] if row else 0
+
+        if count <= BROWSE_EXACT_COUNT_LIMIT:
+            return count, False
+        if where:
+            return BROWSE_EXACT_COUNT_LIMIT, True
+
+        async with self.db.execute(
+            f"SELECT MAX(rowid) - MIN(rowid) + 1 as span FROM [{table_name}]"
+        ) as cursor:
+            row = await cursor.fetchone()
+            span = row["span"] if row and row["span"] else count
+        return max(span, count), True
+
+    async def _get_fts_table(self, table_name: str) -> Optional[str]:
+        """Get the FTS5 index for a table, or None if it has none (or no FTS5)."""
+        if self._fts_tables is None:
+            names = [fts_table for fts_table, _ in FTS_INDEXES.values()]
+            placeholders = ",".join("?" * len(names))
+            async with self.db.execute(
+                f"SELECT name FROM sqlite_master WHERE type='table' AND name IN ({placeholders})",
+                names,
+            ) as cursor:
+                self._fts_tables = {row["name"] for row in await cursor.fetchall()}
+
+        fts_table = FTS_INDEXES.get(table_name, (None, []))[0]
+        return fts_table if fts_table in self._fts_tables else None
+
+    async def _get_table_schemas(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get column info for every app table, cached per schema version.
+
+        PRAGMA schema_version changes whenever any connection alters the
+        schema (e.g. a migration run by the bot process), so checking it
+        is enough to keep the cache fresh without re-reading the catalog.
+        """
+        async with self.db.execute("PRAGMA schema_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        if version == self._table_schemas_version:
+            return self._table_schemas
+
+        async with self.db.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+        ) as cursor:
+            names = [row["name"] for row in await cursor.fetchall()]
+
+        schemas = {}
+        for name in names:
+            if is_internal_table(name):
+                continue
+            async with self.db.execute(f"PRAGMA table_info([{name}])") as cursor:
+                schemas[name] = [
+                    {
+                        "name": row[1],
+                        "type": row[2],
+                        "nullable": not row[3],
+                        "pk": bool(row[5]),
+                    }
+                    for row in await cursor.fetchall()
+                ]
+
+        self._table_schemas = schemas
+        self._table_schemas_version = version
+        self._fts_tables = None
+        return schemas
+
+    async def _get_row_counts(self) -> dict[str, int]:
+        """Get trigger-maintained row counts without scanning any table."""
+        async with self.db.execute(
+            "SELECT table_name, row_count FROM table_row_counts"
+        ) as cursor:
+            return {row["table_name"]: row["row_count"] for row in await cursor.fetchall()}
+
+    async def get_all_tables(self) -> list[dict[str, Any]]:
+        """Get all table names with row counts."""
+        schemas = await self._get_table_schemas()
+        counts = await self._get_row_counts()
 
         tables = []
-        for row in table_rows:
-            name = row["name"]
-            async with self.db.execute(f"SELECT COUNT(*) as count FROM [{name}]") as count_cursor:
-                count_row = await count_cursor.fetchone()
-                count = count_row["count"] if count_row else 0
+        for name in schemas:
+            count = counts.get(name)
+            if count is None:
+                # Triggers not installed yet (migrations not run)
+                async with self.db.execute(f"SELECT COUNT(*) as count FROM [{name}]") as cursor:
+                    row = await cursor.fetchone()
+                    count = row["count"] if row else 0
             tables.append({"name": name, "count": count})
 
-        return sorted(tables, key=lambda t: t["name"])
+        return tables
 
     async def get_table_schema(self, table_name: str) -> list[dict[str, Any]]:
         """Get column info for a table."""
-        # Validate table name first
-        tables = await self.get_all_tables()
-        if table_name not in [t["name"] for t in tables]:
+        schemas = await self._get_table_schemas()
+        if table_name not in schemas:
             raise ValueError(f"Invalid table: {table_name}")
+        return [dict(column) for column in schemas[table_name]]
 
-        async with self.db.execute(f"PRAGMA table_info([{table_name}])") as cursor:
-            rows = await cursor.fetchall()
-            return [
-                {
-                    "name": row[1],
-                    "type": row[2],
-                    "nullable": not row[3],
-                    "pk": bool(row[5]),
-                }
-                for row in rows
-            ]
+    async def _search_condition(
+        self,
+        table_name: str,
+        schema: list[dict[str, Any]],
+        search: Optional[str],
+    ) -> tuple[list[str], list[Any]]:
+        """Build the admin search filter: full-text index if the table has one, else LIKE."""
+        if not search:
+            return [], []
+
+        fts_table = await self._get_fts_table(table_name)
+        fts_query = _fts_query(search) if fts_table else None
+        if fts_query:
+            return (
+                [f"rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)"],
+                [fts_query],
+            )
+
+        text_cols = [c["name"] for c in schema if "TEXT" in (c["type"] or "").upper()]
+        if not text_cols:
+            return [], []
+        conditions = " OR ".join(f"[{col}] LIKE ?" for col in text_cols)
+        return [f"({conditions})"], [f"%{search}%"] * len(text_cols)
+
+    async def _iter_where(
+        self,
+        table_name: str,
+        where: list[str],
+        params: list[Any],
+        batch_size: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield matching rows in rowid order, one short query per batch.
+
+        Each batch seeks past the last rowid instead of holding one cursor
+        open, so a long export never keeps a read transaction (and its
+        lock) open while the consumer is slow.
+        """
+        last_rowid = None
+        while True:
+            conditions = list(where)
+            batch_params = list(params)
+            if last_rowid is not None:
+                conditions.append("rowid > ?")
+                batch_params.append(last_rowid)
+
+            query = f"SELECT rowid AS __rowid, * FROM [{table_name}]"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY rowid LIMIT ?"
+            batch_params.append(batch_size)
+
+            async with self.db.execute(query, batch_params) as cursor:
+                rows = await cursor.fetchall()
+
+            for row in rows:
+                row_dict = dict(row)
+                last_rowid = row_dict.pop("__rowid")
+                yield row_dict
+
+            if len(rows) < batch_size:
+                return
+
+    async def iter_rows(
+        self,
+        table_name: str,
+        search: Optional[str] = None,
+        filters: Optional[dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream every row of a table in rowid order with constant memory.
+
+        Args:
+            table_name: Table to read
+            search: Same search as browse_table
+            filters: Column -> value equality filters
+            batch_size: Rows read per query
+
+        Yields:
+            Row dicts with the table's columns
+
+        Raises:
+            ValueError: If the table or a filter column does not exist
+        """
+        schema = await self.get_table_schema(table_name)
+        columns = {c["name"] for c in schema}
+
+        where, params = await self._search_condition(table_name, schema, search)
+        for column, value in (filters or {}).items():
+            if column not in columns:
+                raise ValueError(f"Invalid column for {table_name}: {column}")
+            where.append(f"[{column}] = ?")
+            params.append(value)
+
+        async for row in self._iter_where(table_name, where, params, batch_size):
+            yield row
 
     async def browse_table(
         self,
@@ -1621,53 +2354,54 @@ class Repository:
         search: Optional[str] = None,
         sort_col: Optional[str] = None,
         sort_dir: str = "asc",
+        after: Optional[str] = None,
+        before: Optional[str] = None,
     ) -> dict[str, Any]:
-        """Browse table with pagination, search, sorting."""
-        # Validate table
-        tables = await self.get_all_tables()
-        if table_name not in [t["name"] for t in tables]:
-            raise ValueError(f"Invalid table: {table_name}")
+        """
+        Browse table with keyset pagination, search, sorting.
+
+        Args:
+            table_name: Table to browse
+            page: Page number for display only; position comes from the cursor
+            per_page: Rows per page
+            search: Search term matched against text columns
+            sort_col: Column to sort by (rowid order if not a column)
+            sort_dir: "asc" or "desc"
+            after: Cursor of the last row on the previous page
+            before: Cursor of the first row on the next page
 
+        Returns:
+            Dict with rows, columns, total, total_approximate, page, per_page,
+            pages, has_next, has_prev, next_cursor and prev_cursor
+        """
         schema = await self.get_table_schema(table_name)
         columns = [c["name"] for c in schema]
 
-        # Base query
-        query = f"SELECT * FROM [{table_name}]"
-        count_query = f"SELECT COUNT(*) as count FROM [{table_name}]"
-        params: list[Any] = []
+        where, params = await self._search_condition(table_name, schema, search)
 
-        # Search (across text columns)
-        if search:
-            text_cols = [c["name"] for c in schema if "TEXT" in (c["type"] or "").upper()]
-            if text_cols:
-                conditions = " OR ".join(f"[{col}] LIKE ?" for col in text_cols)
-                query += f" WHERE ({conditions})"
-                count_query += f" WHERE ({conditions})"
-                params.extend([f"%{search}%"] * len(text_cols))
-
-        # Count total
-        async with self.db.execute(count_query, params) as cursor:
-            count_row = await cursor.fetchone()
-            total = count_row["count"] if count_row else 0
-
-        # Sort
-        if sort_col and sort_col in columns:
-            direction = "DESC" if sort_dir.lower() == "desc" else "ASC"
-            query += f" ORDER BY [{sort_col}] {direction}"
-
-        # Paginate
-        offset = (page - 1) * per_page
-        query += f" LIMIT {per_page} OFFSET {offset}"
+        total, approximate = await self._bounded_count(table_name, where, params)
 
-        async with self.db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            row_dicts = [dict(zip(columns, row)) for row in rows]
+        if sort_col not in columns:
+            sort_col = None
+        data = await self._keyset_page(
+            f"[{table_name}]",
+            where,
+            params,
+            sort_col,
+            "rowid",
+            sort_dir.lower() == "desc",
+            per_page,
+            after=after,
+            before=before,
+        )
+        data["rows"] = [{col: row[col] for col in columns} for row in data["rows"]]
 
         return {
-            "rows": row_dicts,
+            **data,
             "columns": columns,
             "total": total,
-            "page": page,
+            "total_approximate": approximate,
+            "page": max(page, 1),
             "per_page": per_page,
             "pages": (total + per_page - 1) // per_page if total > 0 else 1,
         }
@@ -1723,6 +2457,24 @@ class Repository:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+    async def get_notification_settings_for_admins(
+        self,
+        admin_ids: list[int],
+    ) -> list[dict[str, Any]]:
+        """Get per-event notification settings for several admins in one query."""
+        if not admin_ids:
+            return []
+        placeholders = ", ".join("?" for _ in admin_ids)
+        async with self.db.execute(
+            f"""
+            SELECT * FROM admin_notification_settings
+            WHERE admin_telegram_id IN ({placeholders})
+            """,
+            admin_ids,
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
     async def update_admin_notification_setting(
         self,
         admin_id: int,
@@ -1772,6 +2524,7 @@ class Repository:
             )
 
         await self.db.commit()
+        self._admin_settings_changed(admin_id)
 
     async def update_all_admin_notification_settings(
         self,
@@ -1824,6 +2577,60 @@ class Repository:
         )
         await self.db.commit()
 
+    async def log_notification_events(
+        self,
+        events: list[dict[str, Any]],
+    ) -> list[int]:
+        """
+        Log several notification events in a single transaction.
+
+        Args:
+            events: Dicts with event_type, priority, title, message and
+                optional metadata, sent_at, created_at
+
+        Returns:
+            Log IDs in the same order as events
+        """
+        log_ids = []
+        for event in events:
+            metadata = event.get("metadata")
+            async with self.db.execute(
+                """
+                INSERT INTO notification_log
+                (event_type, priority, title, message, metadata, sent_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                """,
+                (
+                    event["event_type"],
+                    event["priority"],
+                    event["title"],
+                    event["message"],
+                    json.dumps(metadata) if metadata else None,
+                    event.get("sent_at"),
+                    event.get("created_at"),
+                ),
+            ) as cursor:
+                log_ids.append(cursor.lastrowid or 0)
+
+        await self.db.commit()
+        return log_ids
+
+    async def mark_notifications_sent(self, log_ids: list[int]) -> None:
+        """Mark several notifications as sent."""
+        if not log_ids:
+            return
+
+        placeholders = ",".join("?" * len(log_ids))
+        await self.db.execute(
+            f"""
+            UPDATE notification_log
+            SET sent_at = CURRENT_TIMESTAMP
+            WHERE id IN ({placeholders})
+            """,
+            log_ids,
+        )
+        await self.db.commit()
+
     async def get_unsummarized_events(
         self,
         hours: int = 24,
@@ -1871,14 +2678,27 @@ class Repository:
         hours: int = 24,
     ) -> dict[str, int]:
         """Get count of events by type for the last N hours."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        boundary = _next_hour(cutoff)
+        watermark = await self.get_rollup_watermark("notification_log")
+
         async with self.db.execute(
             """
-            SELECT event_type, COUNT(*) as count
-            FROM notification_log
-            WHERE created_at > datetime('now', ? || ' hours')
+            SELECT event_type, SUM(count) as count FROM (
+                SELECT event_type, count FROM notification_events_hourly
+                WHERE hour >= ?
+                UNION ALL
+                SELECT event_type, 1 FROM notification_log
+                WHERE created_at > ? AND (created_at < ? OR id > ?)
+            )
             GROUP BY event_type
             """,
-            (f"-{hours}",),
+            (
+                _sql_timestamp(boundary),
+                _sql_timestamp(cutoff),
+                _sql_timestamp(boundary),
+                watermark,
+            ),
         ) as cursor:
             rows = await cursor.fetchall()
             return {row["event_type"]: row["count"] for row in rows}
@@ -1912,6 +2732,121 @@ class Repository:
                 result.append(d)
             return result
 
+    # =========================================================================
+    # Rollup Operations
+    # =========================================================================
+
+    async def get_rollup_watermark(self, source: str) -> int:
+        """Get the highest raw row ID already folded into a source's rollups."""
+        async with self.db.execute(
+            "SELECT last_id FROM rollup_state WHERE source = ?",
+            (source,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row["last_id"] if row else 0
+
+    async def compact_rollups(self) -> dict[str, int]:
+        """
+        Fold raw rows added since the last run into the rollup tables.
+
+        Each source is compacted in one savepoint that also advances its
+        watermark, so a row is counted either in the rollups or in the raw
+        tail read by the stats queries, never both. A failure rolls back only
+        that savepoint, not other coroutines' pending writes on the shared
+        connection.
+
+        Returns:
+            Number of raw rows compacted per source
+        """
+        compacted = {}
+        for source, statements in _ROLLUP_STATEMENTS.items():
+            watermark = await self.get_rollup_watermark(source)
+            async with self.db.execute(
+                f"SELECT MAX(id) as max_id FROM {source}"
+            ) as cursor:
+                row = await cursor.fetchone()
+            high = row["max_id"] if row and row["max_id"] else 0
+            if high <= watermark:
+                compacted[source] = 0
+                continue
+
+            async with self.db.execute(
+                f"SELECT COUNT(*) as count FROM {source} WHERE id > ? AND id <= ?",
+                (watermark, high),
+            ) as cursor:
+                row = await cursor.fetchone()
+                compacted[source] = row["count"] if row else 0
+
+            await self.db.execute("SAVEPOINT compact_rollups")
+            try:
+                for sql in statements:
+                    await self.db.execute(sql, (watermark, high))
+                await self.db.execute(
+                    """
+                    INSERT INTO rollup_state (source, last_id, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(source) DO UPDATE SET
+                        last_id = excluded.last_id,
+                        updated_at = excluded.updated_at
+                    """,
+                    (source, high),
+                )
+                await self.db.execute("RELEASE SAVEPOINT compact_rollups")
+            except Exception:
+                await self.db.execute("ROLLBACK TO SAVEPOINT compact_rollups")
+                await self.db.execute("RELEASE SAVEPOINT compact_rollups")
+                raise
+            await self.db.commit()
+
+        return compacted
+
+    async def get_expired_rows(
+        self,
+        source: str,
+        before: datetime,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """
+        Get compacted raw rows older than a cutoff, oldest first.
+
+        Only rows at or below the source's watermark are returned, so rows
+        that have not been folded into the rollups are never expired.
+        """
+        column = ROLLUP_SOURCES[source]
+        watermark = await self.get_rollup_watermark(source)
+        async with self.db.execute(
+            f"""
+            SELECT * FROM {source}
+            WHERE id <= ? AND {column} < ?
+            ORDER BY id
+            LIMIT ?
+            """,
+            (watermark, _sql_timestamp(before), limit),
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    async def delete_expired_rows(
+        self,
+        source: str,
+        before: datetime,
+        max_id: int,
+    ) -> int:
+        """
+        Delete compacted raw rows older than a cutoff up to a row ID.
+
+        Returns:
+            Number of rows deleted
+        """
+        column = ROLLUP_SOURCES[source]
+        watermark = await self.get_rollup_watermark(source)
+        async with self.db.execute(
+            f"DELETE FROM {source} WHERE id <= ? AND {column} < ?",
+            (min(max_id, watermark), _sql_timestamp(before)),
+        ) as cursor:
+            await self.db.commit()
+            return cursor.rowcount
+
 
 # Global repository instance
 _repository: Optional[Repository] = None
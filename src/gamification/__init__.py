@@ -0,0 +1,11 @@
+"""Gamification module for AbaQuiz - achievements and progress tracking."""
+
+from src.gamification.achievements import (
+    AchievementEngine,
+    get_achievement_engine,
+)
+
+__all__ = [
+    "AchievementEngine",
+    "get_achievement_engine",
+]
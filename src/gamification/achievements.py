@@ -0,0 +1,260 @@
+"""
+Incremental achievement evaluation for AbaQuiz.
+
+Keeps per-user answer counters and a bitset of unlocked achievements in
+memory, so each answer only evaluates the rules its delta can affect and
+the database is touched only when a threshold is crossed for the first time.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.config.constants import ACHIEVEMENTS, AchievementType
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bit position for each achievement in a user's unlocked bitset
+ACHIEVEMENT_BITS: dict[AchievementType, int] = {
+    achievement: 1 << index for index, achievement in enumerate(AchievementType)
+}
+
+# Requirement types evaluated incrementally (others are not yet awarded)
+QUESTIONS_ANSWERED = "questions_answered"
+STREAK = "streak"
+CONTENT_MASTERY = "content_mastery"
+
+
+@dataclass
+class AchievementRule:
+    """A single threshold rule derived from ACHIEVEMENTS."""
+
+    achievement: AchievementType
+    kind: str
+    threshold: int
+    area: Optional[str] = None
+    accuracy: float = 0.0
+
+    @property
+    def bit(self) -> int:
+        return ACHIEVEMENT_BITS[self.achievement]
+
+
+@dataclass
+class UserProgress:
+    """In-memory counters for one user."""
+
+    total_answered: int = 0
+    area_totals: dict[str, int] = field(default_factory=dict)
+    area_correct: dict[str, int] = field(default_factory=dict)
+    unlocked: int = 0  # Bitset of ACHIEVEMENT_BITS
+
+    def has(self, achievement: AchievementType) -> bool:
+        return bool(self.unlocked & ACHIEVEMENT_BITS[achievement])
+
+
+def build_rules() -> list[AchievementRule]:
+    """Build evaluation rules from the ACHIEVEMENTS definitions."""
+    rules = []
+    for achievement, definition in ACHIEVEMENTS.items():
+        requirement = definition.get("requirement", {})
+        kind = requirement.get("type")
+
+        if kind == QUESTIONS_ANSWERED:
+            rules.append(AchievementRule(achievement, kind, requirement["count"]))
+        elif kind == STREAK:
+            rules.append(AchievementRule(achievement, kind, requirement["days"]))
+        elif kind == CONTENT_MASTERY:
+            area = requirement["area"]
+            rules.append(AchievementRule(
+                achievement,
+                kind,
+                requirement.get("min_answers", 20),
+                area=area.value if hasattr(area, "value") else area,
+                accuracy=requirement.get("accuracy", 0.9),
+            ))
+
+    return rules
+
+
+class AchievementEngine:
+    """
+    Rule engine driven by the delta of the answer just recorded.
+
+    User progress is loaded from the database once (on first answer after
+    startup or after eviction) and then updated in place. Memory is bounded
+    by evicting the least recently active users.
+    """
+
+    def __init__(self, max_users: int = 10000) -> None:
+        self.max_users = max_users
+        self._progress: OrderedDict[int, UserProgress] = OrderedDict()
+
+        rules = build_rules()
+        self._count_rules = [r for r in rules if r.kind == QUESTIONS_ANSWERED]
+        self._streak_rules = [r for r in rules if r.kind == STREAK]
+        self._mastery_rules: dict[str, list[AchievementRule]] = {}
+        for rule in rules:
+            if rule.kind == CONTENT_MASTERY and rule.area:
+                self._mastery_rules.setdefault(rule.area, []).append(rule)
+
+    async def _load_progress(self, user_id: int, repo) -> UserProgress:
+        """Load a user's counters and unlocked achievements from the database."""
+        progress = UserProgress()
+        progress.total_answered = await repo.get_total_questions_answered(user_id)
+
+        area_stats = await repo.get_user_accuracy_by_area(user_id)
+        for area, stat in area_stats.items():
+            progress.area_totals[area] = stat.get("total", 0) or 0
+            progress.area_correct[area] = stat.get("correct", 0) or 0
+
+        for row in await repo.get_user_achievements(user_id):
+            try:
+                progress.unlocked |= ACHIEVEMENT_BITS[AchievementType(row["achievement_type"])]
+            except ValueError:
+                continue  # Unknown/retired achievement type
+
+        self._store(user_id, progress)
+        return progress
+
+    def _store(self, user_id: int, progress: UserProgress) -> None:
+        self._progress[user_id] = progress
+        self._progress.move_to_end(user_id)
+        while len(self._progress) > self.max_users:
+            self._progress.popitem(last=False)
+
+    async def record_answer(
+        self,
+        user_id: int,
+        repo,
+        content_area: str,
+        is_correct: bool,
+        current_streak: int,
+    ) -> Optional[AchievementType]:
+        """
+        Apply a newly recorded answer and grant any thresholds it crosses.
+
+        Must be called after the answer has been written to the database.
+
+        Args:
+            user_id: Internal user ID
+            repo: Repository instance
+            content_area: Content area of the answered question
+            is_correct: Whether the answer was correct
+            current_streak: User's streak after this answer
+
+        Returns:
+            The first newly unlocked achievement, if any
+        """
+        progress = self._progress.get(user_id)
+        if progress is None:
+            # Fresh load already includes the answer just recorded
+            progress = await self._load_progress(user_id, repo)
+        else:
+            self._progress.move_to_end(user_id)
+            progress.total_answered += 1
+            progress.area_totals[content_area] = progress.area_totals.get(content_area, 0) + 1
+            if is_correct:
+                progress.area_correct[content_area] = (
+                    progress.area_correct.get(content_area, 0) + 1
+                )
+
+        candidates = [
+            rule for rule in self._count_rules
+            if progress.total_answered >= rule.threshold
+        ]
+        candidates.extend(
+            rule for rule in self._streak_rules
+            if current_streak >= rule.threshold
+        )
+
+        area_total = progress.area_totals.get(content_area, 0)
+        if area_total:
+            area_accuracy = progress.area_correct.get(content_area, 0) / area_total
+            candidates.extend(
+                rule for rule in self._mastery_rules.get(content_area, [])
+                if area_total >= rule.threshold and area_accuracy >= rule.accuracy
+            )
+
+        return await self._grant_new(user_id, repo, progress, candidates)
+
+    async def evaluate_user(
+        self,
+        user_id: int,
+        repo,
+    ) -> Optional[AchievementType]:
+        """
+        Reload a user's progress from the database and evaluate every rule.
+
+        Use when counters may have drifted (e.g. data edited outside the bot).
+
+        Returns:
+            The first newly unlocked achievement, if any
+        """
+        progress = await self._load_progress(user_id, repo)
+        stats = await repo.get_user_stats(user_id)
+        current_streak = stats.get("current_streak", 0) if stats else 0
+
+        candidates = [
+            rule for rule in self._count_rules
+            if progress.total_answered >= rule.threshold
+        ]
+        candidates.extend(
+            rule for rule in self._streak_rules
+            if current_streak >= rule.threshold
+        )
+        for area, rules in self._mastery_rules.items():
+            area_total = progress.area_totals.get(area, 0)
+            if not area_total:
+                continue
+            area_accuracy = progress.area_correct.get(area, 0) / area_total
+            candidates.extend(
+                rule for rule in rules
+                if area_total >= rule.threshold and area_accuracy >= rule.accuracy
+            )
+
+        return await self._grant_new(user_id, repo, progress, candidates)
+
+    async def _grant_new(
+        self,
+        user_id: int,
+        repo,
+        progress: UserProgress,
+        candidates: list[AchievementRule],
+    ) -> Optional[AchievementType]:
+        """Grant candidate achievements whose bit is not yet set."""
+        new_achievement = None
+
+        for rule in candidates:
+            if progress.unlocked & rule.bit:
+                continue
+
+            if await repo.grant_achievement(user_id, rule.achievement):
+                new_achievement = new_achievement or rule.achievement
+            progress.unlocked |= rule.bit
+
+        return new_achievement
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop cached progress for a user (or all users if None)."""
+        if user_id is None:
+            self._progress.clear()
+        else:
+            self._progress.pop(user_id, None)
+
+    def get_progress(self, user_id: int) -> Optional[UserProgress]:
+        """Get cached progress for a user, if loaded."""
+        return self._progress.get(user_id)
+
+
+# Global engine instance
+_achievement_engine: Optional[AchievementEngine] = None
+
+
+def get_achievement_engine() -> AchievementEngine:
+    """Get or create the global achievement engine instance."""
+    global _achievement_engine
+    if _achievement_engine is None:
+        _achievement_engine = AchievementEngine()
+    return _achievement_engine
@@ -111,9 +111,10 @@ async def db_cli(args: argparse.Namespace) -> None:
                     print(f"Question {args.db_show} not found")
 
         elif args.db_validate:
-            result = await repo.browse_questions(page=1, per_page=9999)
             invalid = []
-            for q in result["rows"]:
+            total = 0
+            async for q in repo.iter_questions():
+                total += 1
                 opts = q.get("options", {})
                 qtype = q.get("question_type", "multiple_choice")
 
@@ -129,7 +130,7 @@ async def db_cli(args: argparse.Namespace) -> None:
 
             if use_json:
                 print(json.dumps({
-                    "total": result["total"],
+                    "total": total,
                     "invalid_count": len(invalid),
                     "invalid": invalid,
                 }, indent=2))
@@ -139,7 +140,7 @@ async def db_cli(args: argparse.Namespace) -> None:
                     for item in invalid:
                         print(f"  [{item['id']}] {item['reason']}")
                 else:
-                    print(f"\nAll {result['total']} questions have valid options")
+                    print(f"\nAll {total} questions have valid options")
     finally:
         await repo.close()
 
@@ -327,6 +328,7 @@ async def run_bot() -> None:
     """Initialize and run the bot with optional web server."""
     from telegram.ext import Application
 
+    from src.bot.update_processor import PerUserUpdateProcessor
     from src.services.scheduler import start_scheduler, stop_scheduler
 
     # Load settings (validates required env vars)
@@ -346,9 +348,11 @@ async def run_bot() -> None:
     validate_content_on_startup(strict=False)
 
     # Build application
+    # Updates run concurrently across users but stay ordered per user
     application = (
         Application.builder()
         .token(settings.telegram_bot_token)
+        .concurrent_updates(PerUserUpdateProcessor(settings.max_concurrent_updates))
         .build()
     )
 
@@ -416,6 +420,10 @@ async def run_bot() -> None:
     # Clean up scheduler on shutdown
     stop_scheduler()
 
+    # Write any queued notification log entries before closing the database
+    from src.services.notification_service import close_notification_service
+    await close_notification_service()
+
     # Clean up database connection
     await close_repository()
 
@@ -0,0 +1,169 @@
+"""
+Content-addressed cache of chunk extraction results.
+
+Entries are keyed by SHA-256 of a chunk's PDF bytes, the extraction prompt
+version and the model, so a re-run only pays for chunks that are new or
+changed. A per-document index maps a whole source PDF (plus split settings)
+to its chunk entries and page routing, so unchanged PDFs are rebuilt
+without splitting them.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedChunk:
+    """Extraction result stored for one chunk."""
+
+    markdown: str
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class CachedDocument:
+    """Every cached chunk result for one source PDF."""
+
+    page_count: int
+    chunks: list[tuple[str, CachedChunk]]  # (chunk key, result) in chunk order
+    page_routes: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _file_sha256(path: Path, *prefix: str) -> str:
+    digest = hashlib.sha256()
+    for part in prefix:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    """Write JSON through a temp file and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ChunkCache:
+    """On-disk chunk result cache for one model and prompt version."""
+
+    def __init__(self, cache_dir: Path, model: str, prompt_version: str) -> None:
+        self.cache_dir = cache_dir
+        self.model = model
+        self.prompt_version = prompt_version
+        self.hits = 0
+        self.misses = 0
+
+    def chunk_key(self, chunk_path: Path) -> str:
+        """Key for a chunk file's extraction result."""
+        return _file_sha256(chunk_path, "chunk", self.prompt_version, self.model)
+
+    def document_key(self, pdf_path: Path, *split_settings: object) -> str:
+        """Key for a whole PDF split with the given settings (page limit etc.)."""
+        return _file_sha256(
+            pdf_path,
+            "document",
+            self.prompt_version,
+            self.model,
+            *(str(setting) for setting in split_settings),
+        )
+
+    def text_key(self, markdown: str) -> str:
+        """Key for markdown extracted locally from a PDF's text layer."""
+        digest = hashlib.sha256(b"text\0")
+        digest.update(markdown.encode())
+        return digest.hexdigest()
+
+    def _chunk_path(self, key: str) -> Path:
+        return self.cache_dir / "chunks" / key[:2] / f"{key}.json"
+
+    def _document_path(self, key: str) -> Path:
+        return self.cache_dir / "documents" / f"{key}.json"
+
+    def get(self, key: str) -> CachedChunk | None:
+        """Get a cached chunk result, or None on a miss."""
+        path = self._chunk_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            chunk = CachedChunk(
+                markdown=data["markdown"],
+                input_tokens=data["input_tokens"],
+                output_tokens=data["output_tokens"],
+            )
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring corrupt chunk cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return chunk
+
+    def put(self, key: str, chunk: CachedChunk) -> None:
+        """Store a chunk result."""
+        write_json_atomic(self._chunk_path(key), {
+            **asdict(chunk),
+            "model": self.model,
+            "prompt_version": self.prompt_version,
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def get_document(self, key: str) -> CachedDocument | None:
+        """
+        Get every chunk result for a document.
+
+        Returns:
+            CachedDocument, or None unless the index and all of its chunk
+            entries exist
+        """
+        try:
+            data = json.loads(self._document_path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+        chunks = []
+        for chunk_key in data.get("chunks", []):
+            chunk = self.get(chunk_key)
+            if chunk is None:
+                return None
+            chunks.append((chunk_key, chunk))
+        return CachedDocument(data.get("page_count", 0), chunks, data.get("page_routes", []))
+
+    def put_document(
+        self,
+        key: str,
+        page_count: int,
+        chunk_keys: list[str],
+        page_routes: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Record which chunk entries make up a document, and how its pages were routed."""
+        write_json_atomic(self._document_path(key), {
+            "page_count": page_count,
+            "chunks": chunk_keys,
+            "page_routes": page_routes or [],
+            "created_at": datetime.now().isoformat(),
+        })
@@ -0,0 +1,145 @@
+"""
+Hash-index sidecars for deduplicating documents appended to output files.
+
+Each output markdown file has a hidden JSON sidecar holding the full
+SHA-256 of every document appended to it and the byte length of the file
+those documents cover. Duplicate checks are a dict lookup instead of a
+scan of the whole (ever-growing) markdown file.
+
+The sidecar is the commit record: it is replaced atomically after each
+append, and bytes past its recorded length belong to an append that never
+committed. Such a tail is truncated before the next append, so a crash
+mid-append cannot leave a half-written document that later re-runs skip
+as a duplicate. New files are created whole through a temp-file rename.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from src.config.logging import get_logger
+from src.preprocessing.chunk_cache import write_json_atomic
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# Legacy files carry 12-char MD5 prefixes; current ones full SHA-256
+HASH_MARKER = re.compile(r"<!-- hash:([0-9a-f]{64}|[0-9a-f]{12}) -->")
+
+# Every appended document starts with this (see _append_to_file)
+DOCUMENT_SEPARATOR = "\n\n---\n\n<!-- hash:"
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Create or replace a text file through a temp file and rename."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def content_hash(content: str) -> str:
+    """Full SHA-256 of a document, its identity in the index."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def legacy_content_hash(content: str) -> str:
+    """MD5 prefix used by markers written before the hash index existed."""
+    return hashlib.md5(content.encode()).hexdigest()[:12]
+
+
+class ContentHashIndex:
+    """Hashes of the documents in one output markdown file."""
+
+    def __init__(self, markdown_path: Path) -> None:
+        self.markdown_path = markdown_path
+        self.path = markdown_path.with_name(f".{markdown_path.name}.hashes.json")
+        self.hashes: dict[str, str] = {}  # hash -> source the document came from
+        self.size = 0  # markdown bytes covered by the index
+
+    @classmethod
+    def load(cls, markdown_path: Path) -> "ContentHashIndex":
+        """
+        Load a file's index, reconciling it with the markdown on disk.
+
+        Without a usable sidecar (legacy output, or a file edited by hand)
+        the index is rebuilt from the hash markers in the markdown once.
+        """
+        index = cls(markdown_path)
+        actual_size = markdown_path.stat().st_size if markdown_path.exists() else 0
+
+        try:
+            data = json.loads(index.path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                index.hashes = dict(data["hashes"])
+                index.size = int(data["size"])
+            else:
+                data = None
+        except FileNotFoundError:
+            data = None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rebuilding corrupt hash index {index.path.name}: {e}")
+            data = None
+
+        if data is None or actual_size < index.size:
+            index._rebuild(actual_size)
+        elif actual_size > index.size:
+            index._recover_tail(actual_size)
+        return index
+
+    def _rebuild(self, actual_size: int) -> None:
+        self.hashes = {}
+        self.size = actual_size
+        if actual_size:
+            text = self.markdown_path.read_text(encoding="utf-8", errors="replace")
+            self.hashes = {h: "" for h in HASH_MARKER.findall(text)}
+            logger.info(
+                f"Indexed {len(self.hashes)} document(s) in {self.markdown_path.name}"
+            )
+        if self.markdown_path.exists():
+            self.save()
+
+    def _recover_tail(self, actual_size: int) -> None:
+        with open(self.markdown_path, "rb") as f:
+            f.seek(self.size)
+            tail = f.read(len(DOCUMENT_SEPARATOR.encode()))
+
+        if tail == DOCUMENT_SEPARATOR.encode():
+            # An append that crashed before committing; drop it so it is redone
+            logger.warning(
+                f"Discarding {actual_size - self.size:,} uncommitted byte(s) "
+                f"at the end of {self.markdown_path.name}"
+            )
+            os.truncate(self.markdown_path, self.size)
+        else:
+            self._rebuild(actual_size)  # Edited outside the pipeline
+
+    def contains(self, content: str) -> bool:
+        """Whether a document is already in the file."""
+        return (
+            content_hash(content) in self.hashes
+            or legacy_content_hash(content) in self.hashes
+        )
+
+    def add(self, digest: str, source: str, size: int) -> None:
+        """Record an appended document and the file size after the append."""
+        self.hashes[digest] = source
+        self.size = size
+
+    def save(self) -> None:
+        """Atomically replace the sidecar, committing appends up to self.size."""
+        write_json_atomic(self.path, {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "hashes": self.hashes,
+        })
@@ -0,0 +1,319 @@
+"""
+Split processed content files into retrieval-sized shards for the vector store.
+
+Processed files concatenate every source PDF of a content area and grow
+without limit. Uploading them whole makes file_search return loosely
+related context, and any append re-uploads the entire file. Instead each
+file is split along its heading hierarchy into size-bounded shards:
+
+- Sections are packed together until a shard reaches MIN_SHARD_CHARS, and
+  never past MAX_SHARD_CHARS; stray short sections join the previous
+  shard. Shards never span two source PDFs.
+- Oversized sections are split at paragraph, then sentence boundaries;
+  oversized tables are split by rows with their header repeated.
+- Every shard starts with its source file, source PDF and heading path, so
+  a retrieved shard carries its own context.
+- Shard filenames embed a hash of their content: unchanged shards keep
+  their name (and are skipped by sync), changed ones get a new one.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.config.logging import get_logger
+from src.preprocessing.content_index import write_text_atomic
+
+logger = get_logger(__name__)
+
+# Bump when shard boundaries or rendering change, to re-shard everything
+CHUNKER_VERSION = "1"
+
+# ~1,500 tokens: one shard fits one file_search chunk (see SHARD_CHUNK_TOKENS)
+MAX_SHARD_CHARS = 6000
+
+# Sections are packed together until a shard is at least this long
+MIN_SHARD_CHARS = 1500
+
+# Static chunking for shards in the vector store: large enough that a
+# shard is never cut in two, no overlap since shards are self-contained
+SHARD_CHUNK_TOKENS = 2000
+
+# Files in the content directory that are not study content
+EXCLUDED_FILES = {"00_index.md"}
+
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+SOURCE_HEADING = re.compile(r"^## Source:\s*(.+?)\s*$")
+HASH_MARKER = re.compile(r"^<!-- hash:[0-9a-f]+ -->$")
+GENERATED_LINE = re.compile(r"^\*Generated: .*\*$")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class Section:
+    """Body text under one heading of a processed file."""
+
+    source_pdf: str
+    headings: list[str]
+    text: str
+
+
+@dataclass
+class Shard:
+    """One retrieval unit uploaded to the vector store."""
+
+    source_file: str
+    source_pdf: str
+    headings: list[str]
+    text: str
+
+    def render(self) -> str:
+        """Shard file content: context header followed by the text."""
+        title = " > ".join(self.headings) or Path(self.source_file).stem
+        return (
+            f"# {title}\n\n"
+            f"*Content file: {self.source_file}*  \n"
+            f"*Source: {self.source_pdf or 'unknown'}*\n\n"
+            f"{self.text}\n"
+        )
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(
+            f"{CHUNKER_VERSION}\n{self.render()}".encode()
+        ).hexdigest()
+
+    @property
+    def filename(self) -> str:
+        return f"{Path(self.source_file).stem}--{self.content_hash[:12]}.md"
+
+
+def _is_table(block: str) -> bool:
+    return all(line.lstrip().startswith("|") for line in block.splitlines())
+
+
+def _blocks(text: str) -> list[str]:
+    """Split text into paragraph blocks, keeping code fences whole."""
+    blocks: list[str] = []
+    current: list[str] = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        if not line.strip() and not in_fence:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def _split_block(block: str, max_chars: int) -> list[str]:
+    """Split one block longer than max_chars."""
+    if _is_table(block):
+        lines = block.splitlines()
+        header, rows = lines[:2], lines[2:]
+        budget = max_chars - sum(len(line) + 1 for line in header)
+        pieces: list[str] = []
+        current: list[str] = []
+        size = 0
+        for row in rows:
+            if current and size + len(row) + 1 > budget:
+                pieces.append("\n".join(header + current))
+                current, size = [], 0
+            current.append(row)
+            size += len(row) + 1
+        if current:
+            pieces.append("\n".join(header + current))
+        return pieces
+
+    units = SENTENCE_END.split(block)
+    pieces = []
+    current_text = ""
+    for unit in units:
+        while len(unit) > max_chars:  # No sentence breaks; cut hard
+            if current_text:
+                pieces.append(current_text)
+                current_text = ""
+            pieces.append(unit[:max_chars])
+            unit = unit[max_chars:]
+        if current_text and len(current_text) + 1 + len(unit) > max_chars:
+            pieces.append(current_text)
+            current_text = unit
+        else:
+            current_text = f"{current_text} {unit}" if current_text else unit
+    if current_text:
+        pieces.append(current_text)
+    return pieces
+
+
+def _split_text(text: str, max_chars: int) -> list[str]:
+    """Split section text into pieces of at most max_chars at block boundaries."""
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: list[str] = []
+    current = ""
+    for block in _blocks(text):
+        parts = _split_block(block, max_chars) if len(block) > max_chars else [block]
+        for part in parts:
+            if current and len(current) + 2 + len(part) > max_chars:
+                pieces.append(current)
+                current = part
+            else:
+                current = f"{current}\n\n{part}" if current else part
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def parse_sections(text: str) -> list[Section]:
+    """
+    Split a processed content file into sections by heading.
+
+    The file title, generation timestamp, hash markers and document
+    separators written by _append_to_file are dropped; each "## Source:"
+    header starts a new source PDF with an empty heading path.
+    """
+    sections: list[Section] = []
+    source_pdf = ""
+    headings: list[tuple[int, str]] = []
+    body: list[str] = []
+    in_fence = False
+    seen_source = False
+
+    def flush() -> None:
+        content = "\n".join(body).strip()
+        if content:
+            sections.append(Section(source_pdf, [h for _, h in headings], content))
+        body.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        if in_fence or stripped.startswith("```"):
+            body.append(line)
+            continue
+
+        source = SOURCE_HEADING.match(stripped)
+        if source:
+            flush()
+            source_pdf, headings, seen_source = source.group(1), [], True
+            continue
+        if not seen_source and (stripped.startswith("# ") or GENERATED_LINE.match(stripped)):
+            continue  # File title written by _append_to_file
+        if HASH_MARKER.match(stripped) or stripped == "---":
+            continue
+
+        heading = HEADING.match(stripped)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            headings = [(lvl, h) for lvl, h in headings if lvl < level]
+            headings.append((level, heading.group(2)))
+            continue
+
+        body.append(line)
+
+    flush()
+    return sections
+
+
+def chunk_markdown(
+    text: str,
+    source_file: str,
+    max_chars: int = MAX_SHARD_CHARS,
+    min_chars: int = MIN_SHARD_CHARS,
+) -> list[Shard]:
+    """
+    Split a processed content file into shards.
+
+    Args:
+        text: Markdown content of the file
+        source_file: Name of the file, recorded in each shard
+        max_chars: Upper bound on shard text length
+        min_chars: Small adjacent sections are packed until this length
+
+    Returns:
+        Shards in document order
+    """
+    shards: list[Shard] = []
+    current: Shard | None = None
+
+    for section in parse_sections(text):
+        # A merged section keeps its own heading inline
+        label = section.headings[-1] if section.headings else ""
+        for i, piece in enumerate(_split_text(section.text, max_chars)):
+            inline = f"**{label}**\n\n{piece}" if label and i == 0 else piece
+            if (
+                current is not None
+                and current.source_pdf == section.source_pdf
+                and (len(current.text) < min_chars or len(inline) < min_chars // 4)
+                and len(current.text) + 2 + len(inline) <= max_chars
+            ):
+                current.text += "\n\n" + inline
+                continue
+
+            if current is not None:
+                shards.append(current)
+            current = Shard(
+                source_file=source_file,
+                source_pdf=section.source_pdf,
+                headings=list(section.headings),
+                text=piece,
+            )
+
+    if current is not None:
+        shards.append(current)
+    return shards
+
+
+def write_shards(
+    content_dir: Path,
+    shard_dir: Path,
+    max_chars: int = MAX_SHARD_CHARS,
+    min_chars: int = MIN_SHARD_CHARS,
+) -> dict[str, int]:
+    """
+    Re-shard every content file, writing new shards and deleting stale ones.
+
+    Shards that already exist are left untouched, so their mtime (and the
+    vector store sync state keyed on it) stays valid.
+
+    Returns:
+        Counts of "written", "unchanged" and "removed" shard files
+    """
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    wanted: dict[str, Shard] = {}
+
+    for md_file in sorted(content_dir.glob("*.md")):
+        if md_file.name in EXCLUDED_FILES:
+            continue
+        text = md_file.read_text(encoding="utf-8", errors="replace")
+        for shard in chunk_markdown(text, md_file.name, max_chars, min_chars):
+            wanted.setdefault(shard.filename, shard)  # Identical sections collapse
+
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+    for filename, shard in wanted.items():
+        path = shard_dir / filename
+        if path.exists():
+            stats["unchanged"] += 1
+        else:
+            write_text_atomic(path, shard.render())
+            stats["written"] += 1
+
+    for path in shard_dir.glob("*.md"):
+        if path.name not in wanted:
+            path.unlink()
+            stats["removed"] += 1
+
+    logger.info(
+        f"Shards in {shard_dir}: {stats['written']} written, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed"
+    )
+    return stats
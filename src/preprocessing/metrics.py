@@ -0,0 +1,48 @@
+"""
+JSONL metrics log for preprocessing runs.
+
+One line per chunk (tokens, latency, retries, throughput) and one per run
+(wall time, overall pages/sec and tokens/sec, concurrency settings), so
+max_concurrent and max_pages_per_request can be tuned from real runs.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def rate(amount: float, seconds: float) -> float | None:
+    """Amount per second, rounded for the log (None if no time elapsed)."""
+    if seconds <= 0:
+        return None
+    return round(amount / seconds, 2)
+
+
+class MetricsLog:
+    """Append-only JSONL metrics file shared by every run writing to it."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.run_id = uuid.uuid4().hex[:12]
+
+    def write(self, event: str, **fields: Any) -> None:
+        """Append one metrics record."""
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run_id": self.run_id,
+            "event": event,
+            **fields,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            # Metrics are diagnostics; never fail a paid extraction over them
+            logger.warning(f"Could not write metrics to {self.path}: {e}")
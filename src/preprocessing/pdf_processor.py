@@ -7,18 +7,32 @@ leveraging its 400K context window and native PDF capabilities.
 
 import asyncio
 import base64
+import hashlib
 import io
+import os
 import random
 import sys
+import tempfile
 import time
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable
 
 import openai
-from openai import AsyncOpenAI
 from pypdf import PdfReader, PdfWriter
 
 from src.config.logging import get_logger
+from src.preprocessing.chunk_cache import CachedChunk, CachedDocument, ChunkCache
+from src.preprocessing.metrics import MetricsLog, rate
+from src.preprocessing.text_layer import (
+    NORMALIZER_VERSION,
+    PageRoute,
+    classify_page,
+    normalize_text,
+)
+from src.services.openai_client import create_openai_client
 
 logger = get_logger(__name__)
 
@@ -41,6 +55,11 @@ def _estimate_tokens_from_base64(base64_size: int) -> int:
     return int(base64_size * 0.75 / 4)
 
 
+def _base64_size(byte_count: int) -> int:
+    """Length of the base64 encoding of byte_count bytes (without encoding them)."""
+    return (byte_count + 2) // 3 * 4
+
+
 def _format_elapsed(seconds: float) -> str:
     """Format elapsed time as Xm Ys."""
     mins = int(seconds // 60)
@@ -82,6 +101,9 @@ Your task:
 
 Output clean markdown only. No commentary or explanations."""
 
+# Part of every chunk cache key: editing the prompt invalidates cached extractions
+PROMPT_VERSION = hashlib.sha256(PDF_EXTRACTION_PROMPT.encode()).hexdigest()[:16]
+
 
 @dataclass
 class ProcessedDocument:
@@ -92,6 +114,22 @@ class ProcessedDocument:
     input_tokens: int
     output_tokens: int
     api_calls: int
+    page_routes: list[PageRoute] = field(default_factory=list)
+
+
+@dataclass
+class CallUsage:
+    """Tokens, calls and timing of the API calls made for one chunk or document.
+
+    Each caller owns its own instance, so usage stays correct while chunks of
+    several PDFs are in flight at once.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    api_calls: int = 0
+    retries: int = 0  # content filter retries and extended backoff attempts
+    latency: float = 0.0  # seconds waiting on API responses (excludes backoff sleeps)
 
 
 @dataclass
@@ -101,8 +139,23 @@ class ChunkJob:
     pdf_name: str  # "BCBA-Handbook.pdf"
     chunk_index: int  # 0, 1, 2...
     total_chunks: int  # total chunks for this PDF
-    pdf_data: bytes  # chunk PDF bytes
+    chunk_path: Path | None  # chunk PDF on disk (a spill file, or the source PDF if unsplit)
     estimated_tokens: int  # for progress display
+    total_pages: int = 0  # pages in the whole PDF
+    pages: int = 0  # pages in this chunk
+    is_temporary: bool = False  # chunk_path is a spill file to delete when done
+    document_key: str | None = None  # chunk cache key of the whole source PDF
+    markdown: str | None = None  # text-layer pages extracted locally (no chunk_path)
+    page_routes: list[PageRoute] = field(default_factory=list)  # shared by the PDF's jobs
+
+    def read_bytes(self) -> bytes:
+        """Load the chunk's PDF bytes."""
+        return self.chunk_path.read_bytes()
+
+    def cleanup(self) -> None:
+        """Delete the spill file, if any."""
+        if self.is_temporary and self.chunk_path is not None:
+            self.chunk_path.unlink(missing_ok=True)
 
 
 @dataclass
@@ -115,6 +168,141 @@ class ChunkResult:
     input_tokens: int
     output_tokens: int
     error: str | None = None
+    cached: bool = False  # Served from the chunk cache (no API call this run)
+    cache_key: str | None = None
+    local: bool = False  # Extracted from the text layer (never an API call)
+    api_calls: int = 0  # Calls made this run, including content filter retries
+    retries: int = 0
+    latency: float = 0.0  # Seconds waiting on API responses
+
+
+@dataclass
+class PDFChunkResults:
+    """All chunk results for one PDF, ordered by chunk index."""
+
+    pdf_name: str
+    page_count: int
+    chunks: list[ChunkResult]
+    page_routes: list[PageRoute] = field(default_factory=list)
+
+
+@dataclass
+class SplitChunk:
+    """One chunk of a split PDF: a PDF file for the model, or local markdown."""
+
+    path: Path | None  # chunk PDF (None for pages extracted locally)
+    pages: int
+    markdown: str | None = None
+
+
+@dataclass
+class PDFSplit:
+    """Chunks for one PDF, as returned from a worker process."""
+
+    total_pages: int
+    chunks: list[SplitChunk]  # in page order
+    page_routes: list[PageRoute]  # empty unless the text fast path ran
+
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    """Count a PDF's pages (run in a worker process)."""
+    return len(PdfReader(pdf_path).pages)
+
+
+def split_pdf(
+    pdf_path: Path,
+    spill_dir: Path,
+    max_pages: int,
+    max_bytes: int,
+    text_fast_path: bool = False,
+) -> PDFSplit:
+    """
+    Split a PDF into chunks by extraction path, page count and byte size.
+
+    Runs in a worker process: the PDF is parsed once, and each chunk is
+    written straight to spill_dir. Chunks over max_bytes are halved until
+    they fit (a single oversized page is kept as its own chunk). With
+    text_fast_path, pages with a clean text layer are converted to
+    markdown here and only the remaining runs of pages become PDF chunks.
+
+    Args:
+        pdf_path: Path to the PDF file
+        spill_dir: Directory for chunk files
+        max_pages: Maximum pages per chunk
+        max_bytes: Maximum chunk file size
+        text_fast_path: Extract text-native pages locally
+
+    Returns:
+        PDFSplit describing the chunks
+    """
+    reader = PdfReader(pdf_path)
+    total_pages = len(reader.pages)
+
+    page_routes: list[PageRoute] = []
+    local_text: dict[int, str] = {}
+    if text_fast_path:
+        for index, page in enumerate(reader.pages):
+            route, text = classify_page(page, index + 1)
+            page_routes.append(route)
+            if route.local:
+                local_text[index] = text
+
+    if not local_text and total_pages <= max_pages and pdf_path.stat().st_size <= max_bytes:
+        return PDFSplit(total_pages, [SplitChunk(pdf_path, total_pages)], page_routes)
+
+    # Runs of consecutive pages taking the same path
+    chunks: list[SplitChunk] = []
+    start = 0
+    while start < total_pages:
+        local = start in local_text
+        end = start + 1
+        while end < total_pages and (end in local_text) == local:
+            end += 1
+
+        if local:
+            pages = (normalize_text(local_text[index]) for index in range(start, end))
+            chunks.append(SplitChunk(None, end - start, "\n\n".join(filter(None, pages))))
+        else:
+            _write_chunks(reader, pdf_path, spill_dir, start, end, max_pages, max_bytes, chunks)
+        start = end
+
+    return PDFSplit(total_pages, chunks, page_routes)
+
+
+def _write_chunks(
+    reader: PdfReader,
+    pdf_path: Path,
+    spill_dir: Path,
+    first_page: int,
+    end_page: int,
+    max_pages: int,
+    max_bytes: int,
+    chunks: list[SplitChunk],
+) -> None:
+    """Write pages [first_page, end_page) as chunk files, appending to chunks."""
+    # Page ranges still to write, as a stack (next range on top)
+    ranges = [
+        (start, min(start + max_pages, end_page))
+        for start in range(first_page, end_page, max_pages)
+    ]
+    ranges.reverse()
+
+    while ranges:
+        start, end = ranges.pop()
+        writer = PdfWriter()
+        for page_num in range(start, end):
+            writer.add_page(reader.pages[page_num])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+
+        if buffer.tell() > max_bytes and end - start > 1:
+            middle = (start + end) // 2
+            ranges.extend([(middle, end), (start, middle)])
+            continue
+
+        chunk_path = spill_dir / f"{pdf_path.stem}.{len(chunks) + 1:03d}.pdf"
+        chunk_path.write_bytes(buffer.getvalue())
+        chunks.append(SplitChunk(chunk_path, end - start))
 
 
 class ProgressTracker:
@@ -194,6 +382,10 @@ class PDFProcessor:
         model: str = "gpt-5.2",
         delay_between_calls: float = 1.0,
         max_tokens: int = 65536,
+        cache_dir: Path | None = None,
+        split_workers: int | None = None,
+        text_fast_path: bool = True,
+        metrics_path: Path | None = None,
     ) -> None:
         """
         Initialize the PDF processor.
@@ -203,9 +395,16 @@ class PDFProcessor:
             model: OpenAI model to use (should support PDF input)
             delay_between_calls: Delay in seconds between API calls
             max_tokens: Maximum output tokens (GPT 5.2 supports up to 128K)
+            cache_dir: Chunk result cache directory (None disables caching)
+            split_workers: Processes for PDF parsing, splitting and hashing
+                (default: CPU count)
+            text_fast_path: Extract pages with a clean text layer locally
+                instead of sending them to the model
+            metrics_path: JSONL file for per-chunk and per-run metrics
+                (None disables metrics)
         """
         # Configure OpenAI client (extended backoff handles rate limits)
-        self.client = AsyncOpenAI(
+        self.client = create_openai_client(
             api_key=api_key,
             max_retries=1,
             timeout=1800.0,  # 30 min timeout for large PDFs
@@ -215,36 +414,53 @@ class PDFProcessor:
         self.max_tokens = max_tokens
         self.max_pages_per_request = 40  # Lower threshold to force chunking for faster processing
         self.max_file_size_mb = 32  # GPT 5.2 supports up to 32MB
+        # Largest chunk file whose base64 encoding stays within max_file_size_mb
+        self.max_chunk_bytes = self.max_file_size_mb * 1024 * 1024 * 3 // 4
+
+        # PDF parsing/splitting/hashing is CPU-bound; keep it off the event loop
+        self.split_workers = split_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+        self.text_fast_path = text_fast_path
+        self.metrics = MetricsLog(metrics_path) if metrics_path else None
 
         # Total token tracking (across all PDFs)
         self._total_input_tokens = 0
         self._total_output_tokens = 0
         self._total_api_calls = 0
 
-        # Per-PDF token tracking
-        self._pdf_input_tokens = 0
-        self._pdf_output_tokens = 0
-        self._pdf_api_calls = 0
-
         # Progress tracker for parallel chunk processing
         self._progress_tracker: ProgressTracker | None = None
 
+        # Extracted chunks already paid for, reused across runs
+        self.chunk_cache = (
+            ChunkCache(cache_dir, model, PROMPT_VERSION) if cache_dir else None
+        )
+
         logger.info(f"PDFProcessor initialized with model: {self.model}")
 
-    def reset_pdf_tokens(self) -> None:
-        """Reset per-PDF token counters. Call before processing each PDF."""
-        self._pdf_input_tokens = 0
-        self._pdf_output_tokens = 0
-        self._pdf_api_calls = 0
+    async def _run_in_pool(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a CPU-bound function in the worker process pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.split_workers)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
 
-    @property
-    def pdf_tokens(self) -> dict[str, int]:
-        """Get token usage for current PDF."""
-        return {
-            "input": self._pdf_input_tokens,
-            "output": self._pdf_output_tokens,
-            "calls": self._pdf_api_calls,
-        }
+    def close(self) -> None:
+        """Shut down the worker process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def count_pages(self, pdf_paths: list[Path]) -> dict[str, int]:
+        """
+        Count pages of several PDFs in parallel.
+
+        Returns:
+            Dict mapping PDF filename to page count
+        """
+        counts = await asyncio.gather(
+            *(self._run_in_pool(count_pdf_pages, pdf_path) for pdf_path in pdf_paths)
+        )
+        return {pdf_path.name: count for pdf_path, count in zip(pdf_paths, counts)}
 
     @property
     def total_tokens(self) -> dict[str, int]:
@@ -258,25 +474,38 @@ class PDFProcessor:
     def _log_api_call(
         self,
         call_type: str,
+        usage: CallUsage,
         input_tokens: int,
         output_tokens: int,
     ) -> None:
-        """Log an API call with token stats."""
+        """Record an API call's tokens in the caller's usage and the run totals."""
         self._total_input_tokens += input_tokens
         self._total_output_tokens += output_tokens
         self._total_api_calls += 1
 
-        self._pdf_input_tokens += input_tokens
-        self._pdf_output_tokens += output_tokens
-        self._pdf_api_calls += 1
+        usage.input_tokens += input_tokens
+        usage.output_tokens += output_tokens
+        usage.api_calls += 1
 
         logger.info(
             f"LLM call [{call_type}]: "
             f"{input_tokens:,} in / {output_tokens:,} out | "
-            f"PDF total: {self._pdf_input_tokens:,} in / {self._pdf_output_tokens:,} out "
-            f"({self._pdf_api_calls} calls)"
+            f"Run total: {self._total_input_tokens:,} in / {self._total_output_tokens:,} out "
+            f"({self._total_api_calls} calls)"
         )
 
+    async def _create_completion(self, messages: list, usage: CallUsage) -> Any:
+        """Send one chat completion request, adding its latency to usage."""
+        started = time.monotonic()
+        try:
+            return await self.client.chat.completions.create(
+                model=self.model,
+                max_completion_tokens=self.max_tokens,
+                messages=messages,
+            )
+        finally:
+            usage.latency += time.monotonic() - started
+
     def _identify_rate_limit_type(self, error_message: str) -> str:
         """
         Identify which rate limit was exceeded from the error message.
@@ -307,6 +536,7 @@ class PDFProcessor:
         self,
         pdf_path: Path,
         verbose: bool = False,
+        usage: CallUsage | None = None,
     ) -> ProcessedDocument:
         """
         Process a PDF file using GPT 5.2's native PDF support.
@@ -314,49 +544,55 @@ class PDFProcessor:
         Args:
             pdf_path: Path to the PDF file
             verbose: Whether to log detailed progress
+            usage: Usage to record this PDF's API calls in; pass one to keep
+                the usage of calls made before an error
 
         Returns:
             ProcessedDocument with extracted markdown and metadata
         """
         pdf_name = pdf_path.name
+        usage = usage if usage is not None else CallUsage()
+
+        with tempfile.TemporaryDirectory(prefix="pdf-chunks-") as tmp:
+            # Parse once, in a worker process, for both page count and chunks
+            split = await self._run_in_pool(
+                split_pdf,
+                pdf_path,
+                Path(tmp),
+                self.max_pages_per_request,
+                self.max_chunk_bytes,
+                self.text_fast_path,
+            )
+            page_count = split.total_pages
+            pdf_chunks = split.chunks
 
-        # Get page count
-        reader = PdfReader(pdf_path)
-        page_count = len(reader.pages)
-
-        if verbose:
-            logger.info(f"Processing {pdf_name}: {page_count} pages")
-
-        # Check if PDF needs to be split
-        pdf_chunks = self._split_large_pdf(pdf_path)
-
-        if verbose:
-            logger.info(f"Split into {len(pdf_chunks)} chunk(s)")
-
-        # Process chunks (parallel for multiple chunks)
-        if len(pdf_chunks) == 1:
-            # Single chunk - no parallelization needed
-            markdown_parts = [await self._send_pdf_to_gpt(
-                pdf_data=pdf_chunks[0],
-                system_prompt=PDF_EXTRACTION_PROMPT,
-                user_prompt=f"Extract and structure all content from this PDF document: {pdf_name}",
-            )]
-        else:
             if verbose:
-                logger.info(f"Processing {len(pdf_chunks)} chunks in parallel")
-
-            tasks = [
-                self._send_pdf_to_gpt(
-                    pdf_data=chunk_bytes,
+                logger.info(f"Processing {pdf_name}: {page_count} pages")
+                logger.info(f"Split into {len(pdf_chunks)} chunk(s)")
+
+            async def extract(i: int, chunk: SplitChunk) -> str:
+                if chunk.markdown is not None:
+                    return chunk.markdown  # Text-layer pages, extracted locally
+                if len(pdf_chunks) == 1:
+                    user_prompt = f"Extract and structure all content from this PDF document: {pdf_name}"
+                else:
+                    user_prompt = f"Extract and structure content from this PDF (part {i}/{len(pdf_chunks)}): {pdf_name}"
+                return await self._send_pdf_to_gpt(
+                    pdf_data=chunk.path.read_bytes(),
                     system_prompt=PDF_EXTRACTION_PROMPT,
-                    user_prompt=f"Extract and structure content from this PDF (part {i}/{len(pdf_chunks)}): {pdf_name}",
+                    user_prompt=user_prompt,
+                    usage=usage,
                 )
-                for i, chunk_bytes in enumerate(pdf_chunks, start=1)
-            ]
-            markdown_parts = await asyncio.gather(*tasks)
+
+            # Process chunks (in parallel when there are several)
+            if verbose and len(pdf_chunks) > 1:
+                logger.info(f"Processing {len(pdf_chunks)} chunks in parallel")
+            markdown_parts = await asyncio.gather(
+                *(extract(i, chunk) for i, chunk in enumerate(pdf_chunks, start=1))
+            )
 
         # Combine all parts
-        full_markdown = "\n\n".join(markdown_parts)
+        full_markdown = "\n\n".join(part for part in markdown_parts if part)
 
         # Debug: save response to file for inspection
         if verbose:
@@ -367,9 +603,10 @@ class PDFProcessor:
         return ProcessedDocument(
             markdown=full_markdown,
             page_count=page_count,
-            input_tokens=self._pdf_input_tokens,
-            output_tokens=self._pdf_output_tokens,
-            api_calls=self._pdf_api_calls,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            api_calls=usage.api_calls,
+            page_routes=split.page_routes,
         )
 
     async def _send_pdf_to_gpt(
@@ -377,6 +614,7 @@ class PDFProcessor:
         pdf_data: bytes,
         system_prompt: str,
         user_prompt: str,
+        usage: CallUsage,
     ) -> str:
         """
         Send PDF to GPT 5.2 API using file input type.
@@ -387,6 +625,7 @@ class PDFProcessor:
             pdf_data: PDF file bytes
             system_prompt: System prompt
             user_prompt: User prompt
+            usage: Usage of the caller, updated with every call made
 
         Returns:
             Response text from the API
@@ -424,6 +663,7 @@ class PDFProcessor:
         return await self._call_with_extended_backoff(
             call_type="pdf_extract",
             messages=messages,
+            usage=usage,
             estimated_input_tokens=estimated_tokens,
         )
 
@@ -431,6 +671,7 @@ class PDFProcessor:
         self,
         call_type: str,
         messages: list,
+        usage: CallUsage,
         estimated_input_tokens: int = 0,
     ) -> str:
         """
@@ -442,6 +683,7 @@ class PDFProcessor:
         Args:
             call_type: Type of call for logging
             messages: Messages list for the API call (includes developer message for system prompt)
+            usage: Usage of the caller, updated with every call made
             estimated_input_tokens: Estimated input tokens for progress display
 
         Returns:
@@ -473,11 +715,7 @@ class PDFProcessor:
         progress_task = asyncio.create_task(_show_progress(start_time))
         try:
             logger.info(f"API call [{call_type}]: sending request to {self.model}")
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                max_completion_tokens=self.max_tokens,
-                messages=messages,
-            )
+            response = await self._create_completion(messages, usage)
             progress_task.cancel()
             sys.stderr.write("\r" + " " * 80 + "\r")  # Clear progress line
             sys.stderr.flush()
@@ -490,6 +728,7 @@ class PDFProcessor:
 
             self._log_api_call(
                 call_type,
+                usage,
                 response.usage.prompt_tokens,
                 response.usage.completion_tokens,
             )
@@ -526,14 +765,11 @@ class PDFProcessor:
                 f"waiting ~{delay_mins} minute(s)..."
             )
             await asyncio.sleep(delay)
+            usage.retries += 1
 
             try:
                 logger.info(f"API call [{call_type}]: sending request to {self.model} (extended backoff {i + 1})")
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    max_completion_tokens=self.max_tokens,
-                    messages=messages,
-                )
+                response = await self._create_completion(messages, usage)
 
                 content = response.choices[0].message.content
                 logger.info(
@@ -543,6 +779,7 @@ class PDFProcessor:
 
                 self._log_api_call(
                     call_type,
+                    usage,
                     response.usage.prompt_tokens,
                     response.usage.completion_tokens,
                 )
@@ -583,143 +820,411 @@ class PDFProcessor:
             "Progress has been saved - resume later with same command."
         )
 
-    def _split_large_pdf(self, pdf_path: Path) -> list[bytes]:
+    async def prepare_chunks(self, pdf_path: Path, spill_dir: Path) -> list[ChunkJob]:
         """
-        Split PDF if it exceeds the page limit.
+        Split a PDF into chunk jobs in a worker process.
+
+        Chunk bytes are written to spill_dir, not returned. PDFs within the
+        page and size limits are not copied; their job points at the source.
+        Runs of text-layer pages become jobs carrying their local markdown.
 
         Args:
             pdf_path: Path to the PDF file
+            spill_dir: Directory for chunk files
 
         Returns:
-            List of PDF bytes (one item if no splitting needed)
+            ChunkJob objects in chunk order
         """
-        reader = PdfReader(pdf_path)
-        total_pages = len(reader.pages)
+        split = await self._run_in_pool(
+            split_pdf,
+            pdf_path,
+            spill_dir,
+            self.max_pages_per_request,
+            self.max_chunk_bytes,
+            self.text_fast_path,
+        )
+        if len(split.chunks) > 1:
+            logger.info(
+                f"{pdf_path.name}: {split.total_pages} pages, "
+                f"split into {len(split.chunks)} chunks"
+            )
+        if split.page_routes:
+            local_pages = sum(1 for route in split.page_routes if route.local)
+            logger.info(
+                f"{pdf_path.name}: {local_pages} of {split.total_pages} pages "
+                f"extracted from the text layer"
+            )
 
-        # Check file size
-        file_size_mb = pdf_path.stat().st_size / (1024 * 1024)
-        if file_size_mb > self.max_file_size_mb:
-            logger.warning(
-                f"PDF file size ({file_size_mb:.1f}MB) exceeds limit "
-                f"({self.max_file_size_mb}MB), will split by pages"
+        return [
+            ChunkJob(
+                pdf_name=pdf_path.name,
+                chunk_index=index,
+                total_chunks=len(split.chunks),
+                chunk_path=chunk.path,
+                estimated_tokens=_estimate_tokens_from_base64(
+                    _base64_size(chunk.path.stat().st_size)
+                ) if chunk.path else 0,
+                total_pages=split.total_pages,
+                pages=chunk.pages,
+                is_temporary=chunk.path not in (None, pdf_path),
+                markdown=chunk.markdown,
+                page_routes=split.page_routes,
             )
+            for index, chunk in enumerate(split.chunks)
+        ]
 
-        # If small enough, return as-is
-        if total_pages <= self.max_pages_per_request:
-            return [pdf_path.read_bytes()]
+    async def process_pdfs_streaming(
+        self,
+        pdf_paths: list[Path],
+        max_concurrent: int = 3,
+        spill_dir: Path | None = None,
+    ) -> AsyncIterator[PDFChunkResults]:
+        """
+        Split and process PDFs with memory bounded by concurrency, not corpus size.
 
-        logger.info(
-            f"PDF has {total_pages} pages, splitting into "
-            f"{(total_pages + self.max_pages_per_request - 1) // self.max_pages_per_request} chunks"
-        )
+        A producer splits up to split_workers PDFs at once in worker
+        processes and feeds their chunks into a queue holding at most
+        max_concurrent jobs. Chunk bytes stay in temp files until a worker
+        reads and encodes them right before the API call, and each spill
+        file is deleted once its chunk is done.
 
-        chunks = []
-        for start in range(0, total_pages, self.max_pages_per_request):
-            writer = PdfWriter()
-            end = min(start + self.max_pages_per_request, total_pages)
+        Args:
+            pdf_paths: PDFs to process, in order
+            max_concurrent: Maximum concurrent API calls
+            spill_dir: Parent directory for chunk files (system temp by default)
 
-            for page_num in range(start, end):
-                writer.add_page(reader.pages[page_num])
+        Yields:
+            PDFChunkResults for each PDF as soon as all its chunks finish
+        """
+        jobs: asyncio.Queue[ChunkJob | None] = asyncio.Queue(maxsize=max_concurrent)
+        done: asyncio.Queue[
+            tuple[ChunkJob, ChunkResult] | PDFChunkResults | Exception | None
+        ] = asyncio.Queue()
+        self._progress_tracker = ProgressTracker(max_concurrent)
+        progress_tracker = self._progress_tracker  # Local reference for type checker
+        cache = self.chunk_cache
 
-            buffer = io.BytesIO()
-            writer.write(buffer)
-            chunks.append(buffer.getvalue())
+        with tempfile.TemporaryDirectory(prefix="pdf-chunks-", dir=spill_dir) as tmp:
 
-        return chunks
+            async def produce() -> None:
+                # PDFs being split ahead of the queue, in input order
+                ahead: deque[asyncio.Task[list[ChunkJob] | PDFChunkResults]] = deque()
+                remaining = iter(pdf_paths)
+                try:
+                    while True:
+                        while len(ahead) < self.split_workers and (
+                            pdf_path := next(remaining, None)
+                        ) is not None:
+                            ahead.append(
+                                asyncio.create_task(self._prepare_pdf(pdf_path, Path(tmp)))
+                            )
+                        if not ahead:
+                            break
+
+                        prepared = await ahead.popleft()
+                        if isinstance(prepared, PDFChunkResults):
+                            await done.put(prepared)
+                            continue
+                        for job in prepared:
+                            await jobs.put(job)
+                    # Only reached while workers are running; after a failure
+                    # the consumer cancels everything instead
+                    for _ in range(max_concurrent):
+                        await jobs.put(None)
+                except Exception as e:
+                    done.put_nowait(e)  # e.g. an unreadable PDF; stops the run
+                finally:
+                    for task in ahead:
+                        task.cancel()
+                    await asyncio.gather(*ahead, return_exceptions=True)
 
-    def prepare_chunks(self, pdf_path: Path) -> list[ChunkJob]:
-        """
-        Prepare chunk jobs for a PDF without processing.
+            async def work() -> None:
+                try:
+                    while (job := await jobs.get()) is not None:
+                        try:
+                            result = await self._run_chunk_job(job, progress_tracker)
+                        finally:
+                            job.cleanup()
+                        self._log_chunk_metrics(job, result)
+                        done.put_nowait((job, result))
+                except Exception as e:
+                    done.put_nowait(e)  # e.g. a broken process pool or cache I/O
 
-        Args:
-            pdf_path: Path to the PDF file
+            tasks = [asyncio.create_task(work()) for _ in range(max_concurrent)]
+            producer = asyncio.create_task(produce())
 
-        Returns:
-            List of ChunkJob objects ready for parallel processing
-        """
-        pdf_name = pdf_path.name
-        pdf_chunks = self._split_large_pdf(pdf_path)
+            async def finish() -> None:
+                try:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                finally:
+                    done.put_nowait(None)
 
-        jobs = []
-        for i, chunk_bytes in enumerate(pdf_chunks):
-            # Estimate tokens from base64 size
-            pdf_base64_len = len(base64.standard_b64encode(chunk_bytes))
-            estimated_tokens = _estimate_tokens_from_base64(pdf_base64_len)
+            finisher = asyncio.create_task(finish())
+            pending: dict[str, list[ChunkResult]] = {}
+            completed: list[PDFChunkResults] = []
+            started = time.monotonic()
+            finished = False
 
-            jobs.append(
-                ChunkJob(
-                    pdf_name=pdf_name,
-                    chunk_index=i,
-                    total_chunks=len(pdf_chunks),
-                    pdf_data=chunk_bytes,
-                    estimated_tokens=estimated_tokens,
+            try:
+                while (item := await done.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    if isinstance(item, PDFChunkResults):
+                        completed.append(item)
+                        yield item
+                        continue
+
+                    job, result = item
+                    results = pending.setdefault(job.pdf_name, [])
+                    results.append(result)
+                    if len(results) < job.total_chunks:
+                        continue
+
+                    del pending[job.pdf_name]
+                    results.sort(key=lambda r: r.chunk_index)
+                    if cache and job.document_key and not any(r.error for r in results):
+                        cache.put_document(
+                            job.document_key,
+                            job.total_pages,
+                            [r.cache_key for r in results],
+                            [asdict(route) for route in job.page_routes],
+                        )
+                    pdf_results = PDFChunkResults(
+                        job.pdf_name, job.total_pages, results, job.page_routes
+                    )
+                    completed.append(pdf_results)
+                    yield pdf_results
+                finished = True
+            finally:
+                for task in (producer, finisher, *tasks):
+                    task.cancel()
+                await asyncio.gather(producer, finisher, *tasks, return_exceptions=True)
+                self._progress_tracker = None
+                self._log_run_metrics(
+                    completed, time.monotonic() - started, max_concurrent, finished
                 )
+
+    def _log_run_metrics(
+        self,
+        completed: list[PDFChunkResults],
+        wall_seconds: float,
+        max_concurrent: int,
+        finished: bool,
+    ) -> None:
+        """Write a streaming run's metrics record."""
+        if self.metrics is None:
+            return
+        chunks = [c for pdf in completed for c in pdf.chunks]
+        paid = [c for c in chunks if not c.cached and not c.local]
+        pages = sum(pdf.page_count for pdf in completed)
+        input_tokens = sum(c.input_tokens for c in paid)
+        output_tokens = sum(c.output_tokens for c in paid)
+        self.metrics.write(
+            "run",
+            finished=finished,
+            model=self.model,
+            max_concurrent=max_concurrent,
+            max_pages_per_request=self.max_pages_per_request,
+            split_workers=self.split_workers,
+            text_fast_path=self.text_fast_path,
+            pdfs=len(completed),
+            pages=pages,
+            chunks=len(chunks),
+            cached_chunks=sum(1 for c in chunks if c.cached),
+            local_chunks=sum(1 for c in chunks if c.local),
+            failed_chunks=sum(1 for c in chunks if c.error),
+            api_calls=sum(c.api_calls for c in paid),
+            retries=sum(c.retries for c in paid),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            wall_s=round(wall_seconds, 3),
+            pages_per_s=rate(pages, wall_seconds),
+            input_tokens_per_s=rate(input_tokens, wall_seconds),
+            output_tokens_per_s=rate(output_tokens, wall_seconds),
+            mean_chunk_latency_s=(
+                round(sum(c.latency for c in paid) / len(paid), 3) if paid else None
+            ),
+        )
+
+    async def _prepare_pdf(
+        self, pdf_path: Path, spill_dir: Path
+    ) -> list[ChunkJob] | PDFChunkResults:
+        """
+        Split a PDF into chunk jobs, unless its results are all cached.
+
+        Returns:
+            ChunkJob objects, or the PDF's results rebuilt from the cache
+        """
+        document_key = None
+        if self.chunk_cache:
+            # Unchanged PDFs are rebuilt from the cache without splitting
+            document_key = await self._run_in_pool(
+                self.chunk_cache.document_key,
+                pdf_path,
+                self.max_pages_per_request,
+                self.max_chunk_bytes,
+                NORMALIZER_VERSION if self.text_fast_path else "vision-only",
             )
+            cached = await asyncio.to_thread(self.chunk_cache.get_document, document_key)
+            if cached is not None:
+                return self._cached_document(pdf_path.name, cached)
+
+        chunk_jobs = await self.prepare_chunks(pdf_path, spill_dir)
+        for job in chunk_jobs:
+            job.document_key = document_key
+        return chunk_jobs
+
+    def _cached_document(self, pdf_name: str, document: CachedDocument) -> PDFChunkResults:
+        """Build a PDF's results entirely from cached chunks."""
+        entries = document.chunks
+        logger.info(f"{pdf_name}: all {len(entries)} chunk(s) cached, skipping API calls")
+        return PDFChunkResults(
+            pdf_name=pdf_name,
+            page_count=document.page_count,
+            chunks=[
+                ChunkResult(
+                    pdf_name=pdf_name,
+                    chunk_index=index,
+                    markdown=chunk.markdown,
+                    input_tokens=chunk.input_tokens,
+                    output_tokens=chunk.output_tokens,
+                    cached=True,
+                    cache_key=key,
+                )
+                for index, (key, chunk) in enumerate(entries)
+            ],
+            page_routes=[PageRoute(**route) for route in document.page_routes],
+        )
 
-        return jobs
+    def _local_result(self, job: ChunkJob) -> ChunkResult:
+        """Result for text-layer pages; cached only so the document index is complete."""
+        cache_key = None
+        if self.chunk_cache:
+            cache_key = self.chunk_cache.text_key(job.markdown)
+            self.chunk_cache.put(cache_key, CachedChunk(job.markdown, 0, 0))
+        return ChunkResult(
+            pdf_name=job.pdf_name,
+            chunk_index=job.chunk_index,
+            markdown=job.markdown,
+            input_tokens=0,
+            output_tokens=0,
+            cache_key=cache_key,
+            local=True,
+        )
 
-    async def process_chunks_parallel(
+    async def _run_chunk_job(
         self,
-        jobs: list[ChunkJob],
-        max_concurrent: int = 3,
-    ) -> list[ChunkResult]:
+        job: ChunkJob,
+        progress_tracker: ProgressTracker,
+    ) -> ChunkResult:
         """
-        Process chunk jobs with bounded concurrency.
+        Get a chunk's result from the cache, or extract it and cache it.
 
         Args:
-            jobs: List of ChunkJob objects to process
-            max_concurrent: Maximum concurrent API calls
+            job: ChunkJob to process
+            progress_tracker: Tracker for the display of in-flight calls
 
         Returns:
-            List of ChunkResult objects in same order as input jobs
+            ChunkResult (with error set if extraction failed)
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-        self._progress_tracker = ProgressTracker(max_concurrent)
+        if job.markdown is not None:
+            return self._local_result(job)
+
+        cache_key = None
+        if self.chunk_cache:
+            cache_key = await self._run_in_pool(self.chunk_cache.chunk_key, job.chunk_path)
+            cached = await asyncio.to_thread(self.chunk_cache.get, cache_key)
+            if cached is not None:
+                return ChunkResult(
+                    pdf_name=job.pdf_name,
+                    chunk_index=job.chunk_index,
+                    markdown=cached.markdown,
+                    input_tokens=cached.input_tokens,
+                    output_tokens=cached.output_tokens,
+                    cached=True,
+                    cache_key=cache_key,
+                )
 
-        progress_tracker = self._progress_tracker  # Local reference for type checker
+        usage = CallUsage()
+        job_id = await progress_tracker.register(job)
+        try:
+            markdown = await self._process_chunk_job(job, usage)
+        except Exception as e:
+            logger.error(f"Error processing chunk {job_id}: {e}")
+            # Failed attempts still cost tokens
+            return ChunkResult(
+                pdf_name=job.pdf_name,
+                chunk_index=job.chunk_index,
+                markdown="",
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                error=str(e),
+                api_calls=usage.api_calls,
+                retries=usage.retries,
+                latency=usage.latency,
+            )
+        finally:
+            await progress_tracker.unregister(job_id)
 
-        async def process_one(job: ChunkJob) -> ChunkResult:
-            async with semaphore:
-                job_id = await progress_tracker.register(job)
-                try:
-                    markdown = await self._process_chunk_job(job)
-                    return ChunkResult(
-                        pdf_name=job.pdf_name,
-                        chunk_index=job.chunk_index,
-                        markdown=markdown,
-                        input_tokens=0,  # Updated by _log_api_call
-                        output_tokens=0,  # Updated by _log_api_call
-                        error=None,
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing chunk {job_id}: {e}")
-                    return ChunkResult(
-                        pdf_name=job.pdf_name,
-                        chunk_index=job.chunk_index,
-                        markdown="",
-                        input_tokens=0,
-                        output_tokens=0,
-                        error=str(e),
-                    )
-                finally:
-                    await progress_tracker.unregister(job_id)
+        if self.chunk_cache and cache_key:
+            self.chunk_cache.put(
+                cache_key, CachedChunk(markdown, usage.input_tokens, usage.output_tokens)
+            )
+
+        return ChunkResult(
+            pdf_name=job.pdf_name,
+            chunk_index=job.chunk_index,
+            markdown=markdown,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_key=cache_key,
+            api_calls=usage.api_calls,
+            retries=usage.retries,
+            latency=usage.latency,
+        )
 
-        results = await asyncio.gather(*[process_one(job) for job in jobs])
-        self._progress_tracker = None
-        return list(results)
+    def _log_chunk_metrics(self, job: ChunkJob, result: ChunkResult) -> None:
+        """Write a chunk's metrics record."""
+        if self.metrics is None:
+            return
+        if result.error:
+            status = "error"
+        elif result.local:
+            status = "local"
+        elif result.cached:
+            status = "cached"
+        else:
+            status = "ok"
+        self.metrics.write(
+            "chunk",
+            pdf=job.pdf_name,
+            chunk=job.chunk_index,
+            total_chunks=job.total_chunks,
+            pages=job.pages,
+            status=status,
+            input_tokens=result.input_tokens if status != "cached" else 0,
+            output_tokens=result.output_tokens if status != "cached" else 0,
+            api_calls=result.api_calls,
+            retries=result.retries,
+            latency_s=round(result.latency, 3),
+            pages_per_s=rate(job.pages, result.latency),
+            output_tokens_per_s=rate(result.output_tokens, result.latency),
+            error=result.error,
+        )
 
-    async def _process_chunk_job(self, job: ChunkJob) -> str:
+    async def _process_chunk_job(self, job: ChunkJob, usage: CallUsage) -> str:
         """
         Process a single chunk job with one retry on content filter.
 
         Args:
             job: ChunkJob to process
+            usage: Usage of the chunk; keeps the tokens of failed attempts too
 
         Returns:
-            Extracted markdown content
+            Extracted markdown
         """
-        # Encode PDF as base64 data URL
-        pdf_base64 = base64.standard_b64encode(job.pdf_data).decode("utf-8")
+        # Load and encode the chunk only now, right before sending
+        pdf_base64 = base64.standard_b64encode(job.read_bytes()).decode("utf-8")
 
         # Build message with PDF file for GPT 5.2
         messages = [
@@ -750,20 +1255,24 @@ class PDFProcessor:
             return await self._call_api_no_progress(
                 call_type="pdf_extract",
                 messages=messages,
+                usage=usage,
             )
         except ContentFilterError as e:
             job_id = f"{Path(job.pdf_name).stem}_{job.chunk_index + 1}"
             logger.warning(f"Content filter on {job_id}, retrying once: {e}")
             await asyncio.sleep(2)  # Brief delay before retry
+            usage.retries += 1
             return await self._call_api_no_progress(
                 call_type="pdf_extract_retry",
                 messages=messages,
+                usage=usage,
             )
 
     async def _call_api_no_progress(
         self,
         call_type: str,
         messages: list,
+        usage: CallUsage,
     ) -> str:
         """
         Make an API call without individual progress display.
@@ -773,6 +1282,7 @@ class PDFProcessor:
         Args:
             call_type: Type of call for logging
             messages: Messages list for the API call
+            usage: Usage of the chunk, updated with every call made
 
         Returns:
             Response text from the API
@@ -780,11 +1290,7 @@ class PDFProcessor:
         # First attempt - SDK handles retries automatically
         try:
             logger.info(f"API call [{call_type}]: sending request to {self.model}")
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                max_completion_tokens=self.max_tokens,
-                messages=messages,
-            )
+            response = await self._create_completion(messages, usage)
 
             finish_reason = response.choices[0].finish_reason
             content = response.choices[0].message.content or ""
@@ -795,6 +1301,7 @@ class PDFProcessor:
 
             self._log_api_call(
                 call_type,
+                usage,
                 response.usage.prompt_tokens,
                 response.usage.completion_tokens,
             )
@@ -830,14 +1337,11 @@ class PDFProcessor:
                 f"waiting ~{delay_mins} minute(s)..."
             )
             await asyncio.sleep(delay)
+            usage.retries += 1
 
             try:
                 logger.info(f"API call [{call_type}]: sending request to {self.model} (extended backoff {i + 1})")
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    max_completion_tokens=self.max_tokens,
-                    messages=messages,
-                )
+                response = await self._create_completion(messages, usage)
 
                 finish_reason = response.choices[0].finish_reason
                 content = response.choices[0].message.content or ""
@@ -848,6 +1352,7 @@ class PDFProcessor:
 
                 self._log_api_call(
                     call_type,
+                    usage,
                     response.usage.prompt_tokens,
                     response.usage.completion_tokens,
                 )
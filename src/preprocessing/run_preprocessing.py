@@ -10,7 +10,6 @@ Usage:
 
 import argparse
 import asyncio
-import hashlib
 import json
 import os
 import sys
@@ -19,23 +18,29 @@ from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
-from pypdf import PdfReader
 
 from src.config.logging import get_logger, setup_logging
+from src.preprocessing.content_index import ContentHashIndex, content_hash, write_text_atomic
 from src.preprocessing.pdf_processor import (
-    ChunkJob,
-    ChunkResult,
+    CallUsage,
     ContentFilterError,
     PDFProcessor,
     PersistentRateLimitError,
     get_document_output_path,
 )
+from src.preprocessing.text_layer import summarize_routes
 
 logger = get_logger(__name__)
 
 
 MANIFEST_FILENAME = "preprocessing_manifest.json"
 
+# Chunk extraction results, reused by later runs (see chunk_cache.py)
+CHUNK_CACHE_DIRNAME = ".chunk_cache"
+
+# Per-chunk and per-run throughput metrics, appended to by every run
+METRICS_FILENAME = "preprocessing_metrics.jsonl"
+
 
 def discover_pdfs(input_dir: Path) -> list[Path]:
     """Find all PDF files in input directory and subdirectories."""
@@ -145,6 +150,9 @@ def mark_pdf_processed(
         "input_tokens": result.get("input_tokens", 0),
         "output_tokens": result.get("output_tokens", 0),
         "api_calls": result.get("api_calls", 0),
+        "retries": result.get("retries", 0),
+        "cached_chunks": result.get("cached_chunks", 0),
+        "page_routes": result.get("page_routes"),
         "content_area": result.get("content_area"),
         "output_files": result.get("output_files", []),
         "error": result.get("error"),
@@ -193,8 +201,8 @@ async def process_single_pdf(
 
     logger.info(f"Processing: {pdf_name}")
 
-    # Reset per-PDF token counters
-    processor.reset_pdf_tokens()
+    # This PDF's API usage, kept even if processing fails part-way
+    usage = CallUsage()
 
     result = {
         "pdf": pdf_name,
@@ -218,9 +226,11 @@ async def process_single_pdf(
 
     try:
         # Process PDF using GPT 5.2's native PDF support
-        doc = await processor.process_pdf(pdf_path, verbose=verbose)
+        doc = await processor.process_pdf(pdf_path, verbose=verbose, usage=usage)
 
         result["pages"] = doc.page_count
+        if doc.page_routes:
+            result["page_routes"] = summarize_routes(doc.page_routes)
 
         # Write to explicit output path (with deduplication)
         logger.info(f"  Writing to: {output_path_rel}")
@@ -238,56 +248,57 @@ async def process_single_pdf(
         result["error"] = str(e)
 
     # Capture token stats for this PDF
-    pdf_tokens = processor.pdf_tokens
-    result["input_tokens"] = pdf_tokens["input"]
-    result["output_tokens"] = pdf_tokens["output"]
-    result["api_calls"] = pdf_tokens["calls"]
+    result["input_tokens"] = usage.input_tokens
+    result["output_tokens"] = usage.output_tokens
+    result["api_calls"] = usage.api_calls
+    result["retries"] = usage.retries
 
     # Log PDF summary
-    if pdf_tokens["calls"] > 0:
+    if usage.api_calls > 0:
         logger.info(
             f"PDF complete: {pdf_name} | "
-            f"{pdf_tokens['calls']} API calls | "
-            f"{pdf_tokens['input']:,} input tokens | "
-            f"{pdf_tokens['output']:,} output tokens"
+            f"{usage.api_calls} API calls | "
+            f"{usage.input_tokens:,} input tokens | "
+            f"{usage.output_tokens:,} output tokens"
         )
 
     return result
 
 
-def get_content_hash(content: str) -> str:
-    """Generate hash of content for deduplication."""
-    return hashlib.md5(content.encode()).hexdigest()[:12]
-
-
 def _append_to_file(path: Path, content: str, source: str) -> bool:
     """Append content to a file with source header and deduplication.
 
+    Duplicates are found in the file's hash-index sidecar, which is
+    updated atomically once the append is on disk (see content_index.py).
+
     Returns:
         True if content was added, False if duplicate was skipped.
     """
-    content_hash = get_content_hash(content)
-    hash_marker = f"<!-- hash:{content_hash} -->"
+    index = ContentHashIndex.load(path)
+    digest = content_hash(content)
 
     # Check for duplicate content
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        if hash_marker in existing:
-            logger.info(f"Skipping duplicate content from {source} (hash: {content_hash})")
-            return False
+    if index.contains(content):
+        logger.info(f"Skipping duplicate content from {source} (hash: {digest[:12]})")
+        return False
 
-    header = f"\n\n---\n\n{hash_marker}\n## Source: {source}\n\n"
+    header = f"\n\n---\n\n<!-- hash:{digest} -->\n## Source: {source}\n\n"
 
-    mode = "a" if path.exists() else "w"
-    with open(path, mode, encoding="utf-8") as f:
-        if mode == "a":
-            f.write(header)
-        else:
-            f.write(f"# {path.stem.replace('_', ' ').title()}\n\n")
-            f.write(f"*Generated: {datetime.now().isoformat()}*\n")
-            f.write(header)
-        f.write(content)
+    if path.exists():
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(header + content)
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        write_text_atomic(
+            path,
+            f"# {path.stem.replace('_', ' ').title()}\n\n"
+            f"*Generated: {datetime.now().isoformat()}*\n"
+            f"{header}{content}",
+        )
 
+    index.add(digest, source, path.stat().st_size)
+    index.save()
     return True
 
 
@@ -336,6 +347,22 @@ def print_summary(results: list[dict[str, Any]], processor: PDFProcessor) -> Non
     print(f"\nDocuments processed: {len(results)}")
     print(f"Total pages: {total_pages}")
 
+    routed = [r for r in results if r.get("page_routes")]
+    if routed:
+        local_pages = sum(r["page_routes"]["local_pages"] for r in routed)
+        routed_pages = local_pages + sum(r["page_routes"]["vision_pages"] for r in routed)
+        print(f"\nText-layer fast path: {local_pages} of {routed_pages} pages extracted locally")
+        for r in routed:
+            routes = r["page_routes"]
+            reasons = ", ".join(
+                f"{reason}: {count}" for reason, count in routes["vision_reasons"].items()
+            )
+            print(
+                f"  {r['pdf']}: local pages [{routes['local'] or '-'}], "
+                f"model pages [{routes['vision'] or '-'}]"
+                + (f" ({reasons})" if reasons else "")
+            )
+
     tokens = processor.total_tokens
     print(f"\nAPI Usage:")
     print(f"  Total API calls: {tokens['calls']:,}")
@@ -377,6 +404,8 @@ async def main(
     verbose: bool = False,
     force: bool = False,
     ask: bool = False,
+    use_cache: bool = True,
+    text_fast_path: bool = True,
 ) -> None:
     """Run the preprocessing pipeline."""
     # Load environment variables
@@ -408,6 +437,10 @@ async def main(
         model=config.get("model", "gpt-5.2"),
         delay_between_calls=config.get("delay_between_calls", 1.0),
         max_tokens=config.get("max_tokens", 65536),
+        cache_dir=output_dir / CHUNK_CACHE_DIRNAME if use_cache else None,
+        split_workers=config.get("split_workers"),
+        text_fast_path=text_fast_path and config.get("text_fast_path", True),
+        metrics_path=None if dry_run else output_dir / METRICS_FILENAME,
     )
 
     # Discover PDFs
@@ -492,13 +525,14 @@ async def main(
         print_summary(results, processor)
         return
 
-    # Dry run: just count pages
+    # Dry run: just count pages (in parallel worker processes)
     if dry_run:
+        page_counts = await processor.count_pages(pdfs_to_process)
+        processor.close()
         for pdf in pdfs_to_process:
-            reader = PdfReader(pdf)
             result = {
                 "pdf": pdf.name,
-                "pages": len(reader.pages),
+                "pages": page_counts[pdf.name],
                 "output_files": [],
                 "input_tokens": 0,
                 "output_tokens": 0,
@@ -513,38 +547,20 @@ async def main(
         print_summary(results, processor)
         return
 
-    # Collect all chunk jobs from all PDFs
-    all_jobs: list[ChunkJob] = []
-    pdf_page_counts: dict[str, int] = {}
-
-    print("\nPreparing chunks for parallel processing...")
-    for pdf in pdfs_to_process:
-        reader = PdfReader(pdf)
-        pdf_page_counts[pdf.name] = len(reader.pages)
-
-        jobs = processor.prepare_chunks(pdf)
-        all_jobs.extend(jobs)
-        print(f"  {pdf.name}: {len(jobs)} chunk(s), {pdf_page_counts[pdf.name]} pages")
-
-    print(f"\nTotal: {len(all_jobs)} chunks from {len(pdfs_to_process)} PDFs")
-    print("Processing with 3-way concurrency...\n")
+    pdfs_by_name = {pdf.name: pdf for pdf in pdfs_to_process}
+    print(f"\nProcessing {len(pdfs_to_process)} PDFs with 3-way concurrency...")
+    print("Chunks are split on demand; each PDF is written as soon as it finishes.\n")
 
     try:
-        # Process all chunks with 3-way concurrency
-        chunk_results = await processor.process_chunks_parallel(all_jobs, max_concurrent=3)
-
-        # Group results by PDF and combine markdown
-        pdf_chunks: dict[str, list[ChunkResult]] = {}
-        for result in chunk_results:
-            pdf_chunks.setdefault(result.pdf_name, []).append(result)
-
-        # Process each PDF's results
-        for pdf in pdfs_to_process:
-            pdf_name = pdf.name
-            chunks = pdf_chunks.get(pdf_name, [])
-
-            # Sort by chunk index
-            chunks.sort(key=lambda r: r.chunk_index)
+        # Split and process chunks with 3-way concurrency, one PDF's results at a time
+        async for pdf_result in processor.process_pdfs_streaming(pdfs_to_process, max_concurrent=3):
+            pdf_name = pdf_result.pdf_name
+            chunks = pdf_result.chunks
+            # Token stats count only what this run paid for
+            paid = [c for c in chunks if not c.cached and not c.local]
+            page_routes = None
+            if pdf_result.page_routes:
+                page_routes = summarize_routes(pdf_result.page_routes)
 
             # Check for errors
             errors = [c for c in chunks if c.error]
@@ -555,11 +571,14 @@ async def main(
 
                 results.append({
                     "pdf": pdf_name,
-                    "pages": pdf_page_counts.get(pdf_name, 0),
+                    "pages": pdf_result.page_count,
                     "output_files": [],
-                    "input_tokens": sum(c.input_tokens for c in chunks),
-                    "output_tokens": sum(c.output_tokens for c in chunks),
-                    "api_calls": len(chunks),
+                    "input_tokens": sum(c.input_tokens for c in paid),
+                    "output_tokens": sum(c.output_tokens for c in paid),
+                    "api_calls": sum(c.api_calls for c in paid),
+                    "retries": sum(c.retries for c in paid),
+                    "cached_chunks": sum(1 for c in chunks if c.cached),
+                    "page_routes": page_routes,
                     "error": f"{len(errors)} chunk(s) failed",
                 })
                 continue
@@ -576,11 +595,14 @@ async def main(
 
             result = {
                 "pdf": pdf_name,
-                "pages": pdf_page_counts.get(pdf_name, 0),
+                "pages": pdf_result.page_count,
                 "output_files": [output_path_rel] if was_added else [],
-                "input_tokens": sum(c.input_tokens for c in chunks),
-                "output_tokens": sum(c.output_tokens for c in chunks),
-                "api_calls": len(chunks),
+                "input_tokens": sum(c.input_tokens for c in paid),
+                "output_tokens": sum(c.output_tokens for c in paid),
+                "api_calls": sum(c.api_calls for c in paid),
+                "retries": sum(c.retries for c in paid),
+                "cached_chunks": sum(1 for c in chunks if c.cached),
+                "page_routes": page_routes,
             }
 
             if not was_added:
@@ -590,12 +612,12 @@ async def main(
             results.append(result)
 
             # Update manifest after each PDF (for resume support)
-            mark_pdf_processed(manifest, pdf, result)
+            mark_pdf_processed(manifest, pdfs_by_name[pdf_name], result)
             save_manifest(output_dir, manifest)
 
             logger.info(
                 f"PDF complete: {pdf_name} | "
-                f"{len(chunks)} chunks | "
+                f"{len(chunks)} chunks ({result['cached_chunks']} cached) | "
                 f"{result['input_tokens']:,} input tokens | "
                 f"{result['output_tokens']:,} output tokens"
             )
@@ -614,6 +636,8 @@ async def main(
 
         # Save manifest for any partial progress
         save_manifest(output_dir, manifest)
+    finally:
+        processor.close()
 
     # Generate index
     if not dry_run:
@@ -621,6 +645,7 @@ async def main(
 
     # Print summary
     print_summary(results, processor)
+    print(f"Throughput metrics: {output_dir / METRICS_FILENAME}")
 
     if rate_limit_stopped:
         sys.exit(1)
@@ -645,8 +670,14 @@ Examples:
   # Dry run to see what would be processed
   python -m src.preprocessing.run_preprocessing --dry-run
 
-  # Force reprocess all PDFs (ignore manifest)
+  # Force reprocess all PDFs (ignore manifest; unchanged chunks come from the cache)
   python -m src.preprocessing.run_preprocessing --force -y
+
+  # Force reprocess and re-extract every chunk
+  python -m src.preprocessing.run_preprocessing --force --no-cache -y
+
+  # Send every page to GPT 5.2, even pages with a clean text layer
+  python -m src.preprocessing.run_preprocessing --vision-only -y
         """,
     )
 
@@ -700,6 +731,18 @@ Examples:
         help="Skip prompts and process all PDFs without asking",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-extract every chunk instead of reusing cached results",
+    )
+
+    parser.add_argument(
+        "--vision-only",
+        action="store_true",
+        help="Send every page to GPT 5.2 instead of extracting text-native pages locally",
+    )
+
     args = parser.parse_args()
 
     # Setup logging
@@ -726,6 +769,8 @@ Examples:
             verbose=args.verbose,
             force=args.force,
             ask=not args.yes,
+            use_cache=not args.no_cache,
+            text_fast_path=not args.vision_only,
         )
     )
 
@@ -0,0 +1,296 @@
+"""
+Local text-layer extraction for text-native PDF pages.
+
+Born-digital pages with a clean text layer are converted to markdown
+locally instead of being sent to GPT. A page goes to the model when it
+needs vision or layout understanding: it has images (including scans),
+no text layer but drawing operators (outlined text, vector diagrams),
+too little text, a table, or a font encoding that extracts as garbage.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from pypdf import PageObject
+from pypdf.generic import DictionaryObject
+
+# Part of the document cache key: changing the classifier or normalizer
+# invalidates cached local extractions
+NORMALIZER_VERSION = "2"
+
+# Pages with less extracted text than this are probably figures or scans
+MIN_TEXT_CHARS = 200
+
+# Text-less pages whose content stream is at most this long (e.g. a white
+# background fill) are blank; anything longer is drawn with vectors
+MAX_BLANK_CONTENT_BYTES = 64
+
+# Share of replacement, private-use and control characters that marks a
+# font whose encoding pypdf cannot map back to Unicode
+MAX_BAD_CHAR_RATIO = 0.02
+
+# Share of non-space characters that must be letters for readable prose
+MIN_LETTER_RATIO = 0.6
+
+# Lines with at least three columns (separated by runs of spaces in the
+# layout-mode text) needed to treat a page as holding a table
+MIN_TABLE_ROWS = 3
+
+_COLUMN_GAP = re.compile(r"\S {3,}(?=\S)")
+_PAGE_NUMBER = re.compile(r"(?:page\s+)?\d{1,4}(?:\s+of\s+\d{1,4})?", re.IGNORECASE)
+_BULLET = re.compile(r"^[•◦▪‣∙·●○■□–\-*]\s+(.*)")
+_NUMBERED_ITEM = re.compile(r"^(?:\d{1,3}|[a-zA-Z])[.)]\s+\S")
+_NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)+)\.?\s+([A-Z].*)")
+_SENTENCE_END = re.compile(r"""[.!?:;"”’)]$""")
+
+
+@dataclass
+class PageRoute:
+    """How one page was extracted, and why."""
+
+    page_number: int  # 1-based
+    local: bool  # True: local text layer; False: sent to the model
+    # "text", "blank", "images", "no text layer", "sparse text", "font encoding", "table"
+    reason: str
+    text_chars: int
+
+
+def _has_forms(resources: DictionaryObject | None) -> bool:
+    """Check a resource dictionary for form XObjects (reusable drawings)."""
+    if resources is None:
+        return False
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return False
+    return any(
+        ref.get_object().get("/Subtype") == "/Form" for ref in xobjects.get_object().values()
+    )
+
+
+def _draws_content(page: PageObject, resources: DictionaryObject | None) -> bool:
+    """Check whether a text-less page draws anything beyond a trivial stream."""
+    if _has_forms(resources):
+        return True
+    try:
+        contents = page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+    except Exception:
+        return True  # Unreadable stream; let the model look at it
+    return len(data.strip()) > MAX_BLANK_CONTENT_BYTES
+
+
+def _has_images(resources: DictionaryObject | None, depth: int = 0) -> bool:
+    """Check a resource dictionary (and nested form XObjects) for images."""
+    if resources is None or depth > 3:
+        return False
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return False
+    for ref in xobjects.get_object().values():
+        xobject = ref.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            return True
+        if subtype == "/Form" and _has_images(
+            xobject.get("/Resources", DictionaryObject()).get_object(), depth + 1
+        ):
+            return True
+    return False
+
+
+def _bad_char_ratio(text: str) -> float:
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return 0.0
+    bad = sum(
+        1 for c in chars
+        if c == "�" or unicodedata.category(c) in ("Co", "Cc", "Cs")
+    )
+    return bad / len(chars)
+
+
+def _letter_ratio(text: str) -> float:
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return 0.0
+    return sum(1 for c in chars if c.isalpha()) / len(chars)
+
+
+def _table_rows(layout_text: str) -> int:
+    return sum(1 for line in layout_text.splitlines() if len(_COLUMN_GAP.findall(line)) >= 2)
+
+
+def classify_page(page: PageObject, page_number: int) -> tuple[PageRoute, str]:
+    """
+    Decide whether a page can be extracted from its text layer.
+
+    Args:
+        page: pypdf page
+        page_number: 1-based page number, for the report
+
+    Returns:
+        (route, extracted text); the text is only meaningful for local pages
+    """
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    has_images = _has_images(resources)
+
+    try:
+        text = page.extract_text()
+    except Exception:  # pypdf raises a variety of errors on malformed pages
+        return PageRoute(page_number, False, "font encoding", 0), ""
+
+    text_chars = len(text.strip())
+
+    def route(local: bool, reason: str) -> tuple[PageRoute, str]:
+        return PageRoute(page_number, local, reason, text_chars), text
+
+    if has_images:
+        return route(False, "images")
+    if text_chars == 0:
+        if _draws_content(page, resources):
+            return route(False, "no text layer")
+        return route(True, "blank")
+    if "(cid:" in text or _bad_char_ratio(text) > MAX_BAD_CHAR_RATIO:
+        return route(False, "font encoding")
+    if text_chars < MIN_TEXT_CHARS:
+        return route(False, "sparse text")
+    if _letter_ratio(text) < MIN_LETTER_RATIO:
+        return route(False, "font encoding")
+
+    try:
+        layout_text = page.extract_text(extraction_mode="layout")
+    except Exception:
+        return route(False, "table")  # Layout unknown; let the model read it
+    if _table_rows(layout_text) >= MIN_TABLE_ROWS:
+        return route(False, "table")
+
+    return route(True, "text")
+
+
+def _heading(line: str) -> str | None:
+    """Markdown heading for a line that looks like one, else None."""
+    if len(line) > 80 or _SENTENCE_END.search(line) and not line.endswith(":"):
+        return None
+
+    numbered = _NUMBERED_HEADING.match(line)
+    if numbered:
+        level = min(2 + numbered.group(1).count("."), 4)
+        return f"{'#' * level} {line}"
+
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) >= 4 and all(c.isupper() for c in letters):
+        return f"## {line.rstrip(':')}"
+    return None
+
+
+def normalize_text(text: str) -> str:
+    """
+    Convert a page's extracted text to markdown.
+
+    Rejoins wrapped lines into paragraphs (undoing end-of-line hyphenation),
+    turns bullet glyphs into markdown list items, marks ALL-CAPS and
+    numbered section titles as headings, and drops bare page numbers.
+
+    Args:
+        text: Text from pypdf's extract_text()
+
+    Returns:
+        Markdown for the page
+    """
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    widest = max((len(line) for line in lines), default=0)
+
+    blocks: list[str] = []
+    current: list[str] = []  # Lines of the paragraph or list item being built
+
+    def flush() -> None:
+        if current:
+            blocks.append(_join_lines(current))
+            current.clear()
+
+    for line in lines:
+        if not line or _PAGE_NUMBER.fullmatch(line):
+            flush()
+            continue
+
+        heading = _heading(line)
+        if heading:
+            flush()
+            blocks.append(heading)
+            continue
+
+        bullet = _BULLET.match(line)
+        if bullet or _NUMBERED_ITEM.match(line):
+            flush()
+            current.append(f"- {bullet.group(1)}" if bullet else line)
+        else:
+            current.append(line)
+
+        # A short line ending a sentence ends its paragraph
+        if _SENTENCE_END.search(line) and len(line) < widest * 0.7:
+            flush()
+    flush()
+
+    # Consecutive list items form one list; everything else is a paragraph
+    markdown = ""
+    for i, block in enumerate(blocks):
+        if i:
+            is_item = _is_list_item(block)
+            markdown += "\n" if is_item and _is_list_item(blocks[i - 1]) else "\n\n"
+        markdown += block
+    return markdown.strip()
+
+
+def _is_list_item(block: str) -> bool:
+    return block.startswith("- ") or bool(_NUMBERED_ITEM.match(block))
+
+
+def _join_lines(lines: list[str]) -> str:
+    joined = lines[0]
+    for line in lines[1:]:
+        if joined.endswith("-") and line[:1].islower():
+            joined = joined[:-1] + line  # Hyphenated at the line break
+        else:
+            joined += " " + line
+    return joined
+
+
+def format_page_ranges(pages: list[int]) -> str:
+    """Format page numbers compactly, e.g. [1, 2, 3, 7] -> "1-3, 7"."""
+    ranges: list[str] = []
+    start = prev = None
+    for page in sorted(pages):
+        if start is None:
+            start = prev = page
+        elif page == prev + 1:
+            prev = page
+        else:
+            ranges.append(f"{start}-{prev}" if prev != start else str(start))
+            start = prev = page
+    if start is not None:
+        ranges.append(f"{start}-{prev}" if prev != start else str(start))
+    return ", ".join(ranges)
+
+
+def summarize_routes(routes: list[PageRoute]) -> dict[str, object]:
+    """
+    Summarize page routing for the manifest and summary report.
+
+    Returns:
+        Dict with local/vision page counts and ranges, and a count of the
+        reason each vision page was sent to the model
+    """
+    local = [r.page_number for r in routes if r.local]
+    vision = [r for r in routes if not r.local]
+    reasons: dict[str, int] = {}
+    for r in vision:
+        reasons[r.reason] = reasons.get(r.reason, 0) + 1
+    return {
+        "local_pages": len(local),
+        "vision_pages": len(vision),
+        "local": format_page_ranges(local),
+        "vision": format_page_ranges([r.page_number for r in vision]),
+        "vision_reasons": reasons,
+    }
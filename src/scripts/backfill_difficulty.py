@@ -4,19 +4,28 @@ Backfill difficulty ratings for legacy questions using GPT 5.2.
 
 Rates questions with difficulty = NULL on a 1-5 scale using minimal thinking budget.
 
+Questions are paged by id (keyset pagination) and rated with up to
+--concurrency batches in flight. Each batch is written with one bulk
+UPDATE, and the highest id below which every batch has finished is
+checkpointed, so an interrupted run resumes where it stopped.
+
 Usage:
     python -m src.scripts.backfill_difficulty --dry-run
     python -m src.scripts.backfill_difficulty
-    python -m src.scripts.backfill_difficulty --batch-size 10 --verbose
+    python -m src.scripts.backfill_difficulty --batch-size 10 --concurrency 8 --verbose
+    python -m src.scripts.backfill_difficulty --restart
 """
 
 import argparse
 import asyncio
 import json
+import os
 import sys
+import tempfile
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from openai import AsyncOpenAI
 
@@ -28,9 +37,15 @@ from src.config.logging import get_logger, setup_logging
 from src.config.settings import get_settings
 from src.database.migrations import initialize_database, run_migrations
 from src.database.repository import get_repository
+from src.services.openai_client import create_openai_client
 
 logger = get_logger(__name__)
 
+# Checkpoint of the last question id whose batch (and all before it) finished
+CHECKPOINT_FILE = Path("data/.backfill_difficulty_progress.json")
+
+DEFAULT_CONCURRENCY = 4
+
 # System prompt for difficulty rating (~150 tokens)
 RATING_SYSTEM_PROMPT = """You are an expert BCBA exam analyst. Rate question difficulty from 1-5:
 1: Basic recall of a single concept
@@ -69,6 +84,35 @@ Return a JSON array with exactly {len(questions)} integer ratings.
 Return ONLY a JSON array like [{", ".join(["N"] * len(questions))}] where N is 1-5."""
 
 
+# Checkpoint persistence for resume
+def save_checkpoint(state: dict[str, Any]) -> None:
+    """Atomically save backfill progress to the checkpoint file."""
+    CHECKPOINT_FILE.parent.mkdir(exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CHECKPOINT_FILE.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp, CHECKPOINT_FILE)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def load_checkpoint() -> Optional[dict[str, Any]]:
+    """Load backfill progress from the checkpoint file."""
+    if CHECKPOINT_FILE.exists():
+        try:
+            return json.loads(CHECKPOINT_FILE.read_text())
+        except json.JSONDecodeError:
+            return None
+    return None
+
+
+def clear_checkpoint() -> None:
+    """Clear the checkpoint file."""
+    CHECKPOINT_FILE.unlink(missing_ok=True)
+
+
 def estimate_cost(question_count: int, batch_size: int) -> dict[str, float]:
     """Estimate API cost for rating questions."""
     settings = get_settings()
@@ -218,6 +262,9 @@ async def backfill_difficulty(
     dry_run: bool = False,
     batch_size: int = 20,
     verbose: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    restart: bool = False,
+    confirm: bool = True,
 ) -> dict[str, Any]:
     """
     Backfill difficulty ratings for questions with NULL difficulty.
@@ -226,6 +273,10 @@ async def backfill_difficulty(
         dry_run: If True, show plan without making changes
         batch_size: Number of questions per API call
         verbose: If True, print detailed progress
+        concurrency: Maximum rating batches in flight
+        restart: Ignore the checkpoint and start from the first question
+            (also retries questions whose rating failed earlier)
+        confirm: Ask for confirmation before rating
 
     Returns:
         Dict with results
@@ -239,11 +290,14 @@ async def backfill_difficulty(
     repo = await get_repository(settings.database_path)
 
     try:
-        # Get questions with NULL difficulty
-        questions = await repo.get_questions_with_null_difficulty()
-        total_questions = len(questions)
+        checkpoint = None if restart else load_checkpoint()
+        start_after = checkpoint["last_id"] if checkpoint else 0
+
+        # Count remaining questions with NULL difficulty (pages are loaded lazily)
+        total_questions = await repo.count_questions_with_null_difficulty(after_id=start_after)
 
         if total_questions == 0:
+            clear_checkpoint()
             print("\nNo questions with NULL difficulty found.")
             return {"status": "already_complete", "total": 0, "updated": 0}
 
@@ -254,8 +308,12 @@ async def backfill_difficulty(
         print("\n" + "=" * 60)
         print("DIFFICULTY BACKFILL PLAN")
         print("=" * 60)
+        if checkpoint:
+            print(f"\nResuming after question id {start_after} "
+                  f"({checkpoint.get('updated', 0)} rated so far)")
         print(f"\nQuestions to rate: {total_questions}")
         print(f"Batch size: {batch_size}")
+        print(f"Concurrency: {concurrency}")
         print(f"API calls: {cost['num_batches']}")
         print(f"\nEstimated tokens:")
         print(f"  Input:  ~{cost['total_input_tokens']:,}")
@@ -272,85 +330,142 @@ async def backfill_difficulty(
             }
 
         # Confirm before proceeding
-        print("\nProceed with rating? [y/N]: ", end="", flush=True)
-        try:
-            response = input().strip().lower()
-        except EOFError:
-            response = "y"
+        if confirm:
+            print("\nProceed with rating? [y/N]: ", end="", flush=True)
+            try:
+                response = input().strip().lower()
+            except EOFError:
+                response = "y"
 
-        if response not in ("y", "yes"):
-            print("Aborted.")
-            return {"status": "aborted", "total": total_questions}
+            if response not in ("y", "yes"):
+                print("Aborted.")
+                return {"status": "aborted", "total": total_questions}
 
         # Initialize OpenAI client
-        client = AsyncOpenAI(
+        client = create_openai_client(
             api_key=settings.openai_api_key,
             max_retries=3,
         )
 
-        # Process in batches
-        print(f"\nRating {total_questions} questions in batches of {batch_size}...")
+        print(
+            f"\nRating {total_questions} questions in batches of {batch_size}, "
+            f"{concurrency} at a time..."
+        )
         start_time = datetime.now()
 
-        all_updates: list[tuple[int, int]] = []
-        failed_count = 0
+        state = {
+            "last_id": start_after,
+            "updated": checkpoint.get("updated", 0) if checkpoint else 0,
+            "failed": checkpoint.get("failed", 0) if checkpoint else 0,
+            "started_at": checkpoint.get("started_at") if checkpoint else start_time,
+        }
+        distribution = {i: 0 for i in range(1, 6)}
+        run_updated = 0
+        run_failed = 0
+
+        # Batches in the order they were read; the checkpoint only advances
+        # past a batch once it and every batch before it have succeeded
+        tasks: list[asyncio.Task] = []
+        in_order: deque[tuple[int, asyncio.Task]] = deque()
+        slots = asyncio.Semaphore(concurrency)
         batch_num = 0
+        stalled = False
+
+        def advance_checkpoint() -> None:
+            nonlocal stalled
+            moved = False
+            while not stalled and in_order and in_order[0][1].done():
+                last_id, task = in_order.popleft()
+                if task.cancelled() or task.exception():
+                    stalled = True
+                    break
+                state["last_id"] = last_id
+                moved = True
+            if moved:
+                save_checkpoint(state)
+
+        async def process_batch(num: int, batch: list[dict[str, Any]]) -> None:
+            nonlocal run_updated, run_failed
+            try:
+                results = await rate_batch(client, batch, verbose=verbose)
+
+                # Collect successful ratings
+                batch_updates = [(qid, r) for qid, r in results if r is not None]
+                failed = len(results) - len(batch_updates)
 
-        for i in range(0, total_questions, batch_size):
-            batch = questions[i : i + batch_size]
-            batch_num += 1
-
-            print(f"\nBatch {batch_num}/{cost['num_batches']}: questions {i + 1}-{i + len(batch)}")
-
-            results = await rate_batch(client, batch, verbose=verbose)
-
-            # Collect successful ratings
-            batch_updates = []
-            for question_id, rating in results:
-                if rating is not None:
-                    batch_updates.append((question_id, rating))
-                else:
-                    failed_count += 1
-
-            if batch_updates:
-                # Update database
                 updated = await repo.bulk_update_difficulty(batch_updates)
-                all_updates.extend(batch_updates)
-                print(f"  Updated {updated} questions")
-
-                if verbose:
-                    ratings_summary = [r for _, r in batch_updates]
-                    print(f"  Ratings: {ratings_summary}")
+                for _, rating in batch_updates:
+                    distribution[rating] += 1
+                run_updated += updated
+                run_failed += failed
+                state["updated"] += updated
+                state["failed"] += failed
+
+                print(
+                    f"Batch {num}: ids {batch[0]['id']}-{batch[-1]['id']}, "
+                    f"updated {updated}, failed {failed}"
+                )
+                if verbose and batch_updates:
+                    print(f"  Ratings: {[r for _, r in batch_updates]}")
+            finally:
+                slots.release()
+
+        # Keyset iteration: read the next page only when a slot is free
+        cursor = start_after
+        try:
+            while not stalled:
+                await slots.acquire()
+                batch = await repo.get_questions_with_null_difficulty(
+                    limit=batch_size, after_id=cursor
+                )
+                if not batch:
+                    slots.release()
+                    break
+                cursor = batch[-1]["id"]
+                batch_num += 1
+                task = asyncio.create_task(process_batch(batch_num, batch))
+                task.add_done_callback(lambda _: advance_checkpoint())
+                tasks.append(task)
+                in_order.append((cursor, task))
+        finally:
+            # Let in-flight batches write their (paid for) ratings before the
+            # connection is closed, even if one of them or the producer failed
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Surface the first batch failure (the checkpoint stays before it)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        # Every batch finished: the next run starts over (retrying failures)
+        clear_checkpoint()
 
         # Summary
         elapsed = datetime.now() - start_time
-        total_updated = len(all_updates)
 
         print("\n" + "=" * 60)
         print("BACKFILL COMPLETE")
         print("=" * 60)
         print(f"\nTotal questions: {total_questions}")
-        print(f"Successfully rated: {total_updated}")
-        print(f"Failed: {failed_count}")
+        print(f"Successfully rated: {run_updated}")
+        print(f"Failed: {run_failed}")
         print(f"Time elapsed: {elapsed}")
+        if elapsed.total_seconds() > 0:
+            print(f"Throughput: {run_updated / elapsed.total_seconds() * 60:.1f} questions/min")
 
         # Show distribution
-        if all_updates:
-            distribution = {i: 0 for i in range(1, 6)}
-            for _, rating in all_updates:
-                distribution[rating] += 1
-
+        if run_updated:
             print(f"\nDifficulty distribution:")
             for level, count in sorted(distribution.items()):
-                pct = count / total_updated * 100 if total_updated > 0 else 0
+                pct = count / run_updated * 100
                 bar = "#" * int(pct / 2)
                 print(f"  {level}: {count:3d} ({pct:5.1f}%) {bar}")
 
         return {
             "status": "complete",
             "total": total_questions,
-            "updated": total_updated,
-            "failed": failed_count,
+            "updated": run_updated,
+            "failed": run_failed,
             "elapsed_seconds": elapsed.total_seconds(),
         }
 
@@ -372,6 +487,12 @@ Examples:
 
   python -m src.scripts.backfill_difficulty --batch-size 10 --verbose
       Use smaller batches with detailed output
+
+  python -m src.scripts.backfill_difficulty --concurrency 8
+      Rate up to 8 batches at a time
+
+  python -m src.scripts.backfill_difficulty --restart
+      Ignore the checkpoint of an interrupted run and start from the beginning
         """,
     )
 
@@ -390,6 +511,27 @@ Examples:
         help="Questions per API call (default: 20)",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Rating batches in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and start from the first question",
+    )
+
+    parser.add_argument(
+        "--yes",
+        "-y",
+        action="store_true",
+        help="Skip the confirmation prompt",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -409,6 +551,9 @@ Examples:
                 dry_run=args.dry_run,
                 batch_size=args.batch_size,
                 verbose=args.verbose,
+                concurrency=args.concurrency,
+                restart=args.restart,
+                confirm=not args.yes,
             )
         )
 
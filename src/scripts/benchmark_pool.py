@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for question pool replenishment.
+
+Runs PoolManager.check_and_replenish_pool against an empty temporary
+database with the OpenAI stand-in (src/services/openai_standin.py) in place
+of the real API, once per concurrency setting, and reports:
+
+- questions/minute accepted into the pool
+- API calls (generation and embedding) per accepted question
+- dedup overhead: time spent in duplicate checks, per accepted question and
+  as a share of per-area generation time (areas run concurrently, so both
+  are summed across areas rather than compared with wall time)
+- injected 429s, SDK-style retries and token usage
+
+No API key is needed and nothing is spent. Latency is simulated; use
+--time-scale to compress it (throughput then scales by the same factor).
+
+Usage:
+    python -m src.scripts.benchmark_pool --concurrency 5,10,20
+    python -m src.scripts.benchmark_pool --latency lognormal:20:0.4 --time-scale 0.05
+    python -m src.scripts.benchmark_pool --cassette data/cassette.jsonl --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Only the stand-in is called; the settings still require keys to be present
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+
+import src.services.dedup_service as dedup_service
+import src.services.question_generator as question_generator
+from src.config.logging import get_logger, setup_logging
+from src.config.settings import get_settings
+from src.database.migrations import initialize_database, run_migrations
+from src.database.repository import close_repository
+from src.services.openai_client import set_client_factory
+from src.services.openai_standin import (
+    EMBEDDINGS,
+    RESPONSES,
+    LatencyModel,
+    StandInOpenAI,
+)
+from src.services.pool_manager import PoolManager
+
+logger = get_logger(__name__)
+
+
+async def run_once(
+    concurrency: int,
+    batch_size: int,
+    standin: StandInOpenAI,
+    db_path: Path,
+) -> dict[str, Any]:
+    """Replenish an empty pool once and measure it.
+
+    Args:
+        concurrency: pool_max_concurrent_generation for this run
+        batch_size: Questions to add to the pool
+        standin: Stand-in serving every OpenAI call of the run
+        db_path: Fresh database file for the run
+
+    Returns:
+        Dict of metrics for the run
+    """
+    settings = get_settings()
+    settings.database_path = str(db_path)
+    settings.pool_max_concurrent_generation = concurrency
+    settings.pool_batch_size = batch_size
+
+    await initialize_database(settings.database_path)
+    await run_migrations(settings.database_path)
+
+    # Services built now get stand-in clients
+    set_client_factory(standin.client)
+    question_generator._generator = None
+    dedup_service._dedup_service = None
+    generator = question_generator.get_question_generator()
+    generator._vector_store_id = "vs_benchmark"
+
+    pool = PoolManager()
+    dedup_seconds = 0.0
+    dedup_checks = 0
+    area_seconds = 0.0
+    check_duplicate = pool.check_duplicate
+    generate_with_dedup = pool.generate_with_dedup
+
+    async def timed_check_duplicate(*args: Any, **kwargs: Any) -> bool:
+        nonlocal dedup_seconds, dedup_checks
+        started = time.perf_counter()
+        try:
+            return await check_duplicate(*args, **kwargs)
+        finally:
+            dedup_seconds += time.perf_counter() - started
+            dedup_checks += 1
+
+    async def timed_generate_with_dedup(*args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        nonlocal area_seconds
+        started = time.perf_counter()
+        try:
+            return await generate_with_dedup(*args, **kwargs)
+        finally:
+            area_seconds += time.perf_counter() - started
+
+    pool.check_duplicate = timed_check_duplicate
+    pool.generate_with_dedup = timed_generate_with_dedup
+
+    started = time.perf_counter()
+    try:
+        result = await pool.check_and_replenish_pool()
+    finally:
+        elapsed = time.perf_counter() - started
+        set_client_factory(None)
+        question_generator._generator = None
+        dedup_service._dedup_service = None
+        await close_repository()
+
+    accepted = result["generated"]
+    stats = standin.stats
+    generation_calls = stats.calls[RESPONSES]
+    embedding_calls = stats.calls[EMBEDDINGS]
+
+    def per_question(value: float) -> Optional[float]:
+        return round(value / accepted, 2) if accepted else None
+
+    return {
+        "concurrency": concurrency,
+        "accepted": accepted,
+        "seconds": round(elapsed, 3),
+        "questions_per_minute": round(accepted / elapsed * 60, 1) if elapsed > 0 else None,
+        "generation_calls": generation_calls,
+        "embedding_calls": embedding_calls,
+        "api_calls_per_question": per_question(generation_calls + embedding_calls),
+        "generation_calls_per_question": per_question(generation_calls),
+        "dedup_checks": dedup_checks,
+        "dedup_seconds": round(dedup_seconds, 3),
+        "dedup_ms_per_question": per_question(dedup_seconds * 1000),
+        "dedup_share": round(dedup_seconds / area_seconds, 3) if area_seconds > 0 else None,
+        "rate_limited": stats.rate_limited,
+        "retries": stats.retries,
+        "rate_limit_errors": stats.raised,
+        "input_tokens": stats.input_tokens,
+        "output_tokens": stats.output_tokens,
+        "replayed": stats.replayed,
+    }
+
+
+async def run_benchmark(
+    concurrency_levels: list[int],
+    batch_size: int = 50,
+    latency: str = "lognormal:20:0.4",
+    embedding_latency: str = "lognormal:0.3:0.3",
+    rate_limit_rate: float = 0.0,
+    duplicate_rate: float = 0.1,
+    time_scale: float = 0.05,
+    cassette: Optional[Path] = None,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Run the benchmark at each concurrency level.
+
+    Every level gets a fresh database and a fresh stand-in with the same
+    seed, so runs differ only in concurrency.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="abaquiz-bench-") as tmp:
+        for concurrency in concurrency_levels:
+            standin = StandInOpenAI(
+                cassette=cassette,
+                latency=LatencyModel.parse(latency),
+                embedding_latency=LatencyModel.parse(embedding_latency),
+                rate_limit_rate=rate_limit_rate,
+                duplicate_rate=duplicate_rate,
+                time_scale=time_scale,
+                seed=seed,
+            )
+            db_path = Path(tmp) / f"pool_c{concurrency}.db"
+            logger.info(f"Benchmarking concurrency={concurrency}")
+            results.append(await run_once(concurrency, batch_size, standin, db_path))
+    return results
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """Print benchmark results as a table."""
+    header = (
+        f"{'conc':>5} {'accepted':>8} {'seconds':>8} {'q/min':>8} "
+        f"{'calls/q':>8} {'gen/q':>6} {'dedup ms/q':>10} {'dedup %':>8} {'429s':>5} "
+        f"{'retries':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        dedup_pct = f"{r['dedup_share'] * 100:.1f}" if r["dedup_share"] is not None else "-"
+        print(
+            f"{r['concurrency']:>5} {r['accepted']:>8} {r['seconds']:>8.2f} "
+            f"{r['questions_per_minute'] or 0:>8.1f} {r['api_calls_per_question'] or 0:>8.2f} "
+            f"{r['generation_calls_per_question'] or 0:>6.2f} "
+            f"{r['dedup_ms_per_question'] or 0:>10.1f} "
+            f"{dedup_pct:>8} {r['rate_limited']:>5} {r['retries']:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark pool replenishment offline against the OpenAI stand-in.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Latency specs: fixed:SECONDS, uniform:LOW:HIGH, lognormal:MEDIAN:SIGMA
+
+Examples:
+  python -m src.scripts.benchmark_pool --concurrency 5,10,20
+      Compare generation concurrency settings
+
+  python -m src.scripts.benchmark_pool --rate-limit-rate 0.1
+      Inject a 429 on 10% of attempts
+
+  python -m src.scripts.benchmark_pool --cassette data/cassette.jsonl
+      Replay responses recorded with OPENAI_RECORD_CASSETTE
+        """,
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=str,
+        default="5,10,20",
+        help="Comma-separated generation concurrency levels (default: 5,10,20)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        "-b",
+        type=int,
+        default=50,
+        help="Questions to add to the pool per run (default: 50)",
+    )
+
+    parser.add_argument(
+        "--latency",
+        type=str,
+        default="lognormal:20:0.4",
+        help="Generation request latency (default: lognormal:20:0.4)",
+    )
+
+    parser.add_argument(
+        "--embedding-latency",
+        type=str,
+        default="lognormal:0.3:0.3",
+        help="Embedding request latency (default: lognormal:0.3:0.3)",
+    )
+
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Probability of a 429 per attempt (default: 0)",
+    )
+
+    parser.add_argument(
+        "--duplicate-rate",
+        type=float,
+        default=0.1,
+        help="Probability a synthetic question repeats an earlier one (default: 0.1)",
+    )
+
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.05,
+        help="Multiplier for simulated delays (default: 0.05)",
+    )
+
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        default=None,
+        help="Replay recorded responses from this JSONL cassette",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed (default: 0)",
+    )
+
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help="Write results as JSON to this file",
+    )
+
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+
+    args = parser.parse_args()
+    setup_logging("DEBUG" if args.verbose else "WARNING")
+
+    try:
+        levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+        LatencyModel.parse(args.latency)
+        LatencyModel.parse(args.embedding_latency)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = asyncio.run(
+        run_benchmark(
+            concurrency_levels=levels,
+            batch_size=args.batch_size,
+            latency=args.latency,
+            embedding_latency=args.embedding_latency,
+            rate_limit_rate=args.rate_limit_rate,
+            duplicate_rate=args.duplicate_rate,
+            time_scale=args.time_scale,
+            cassette=args.cassette,
+            seed=args.seed,
+        )
+    )
+
+    print_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
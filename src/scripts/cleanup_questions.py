@@ -98,10 +98,9 @@ def format_question_detail(q: dict) -> str:
 
 async def find_invalid_questions(repo) -> list[tuple[dict, str]]:
     """Find all questions with invalid options."""
-    result = await repo.browse_questions(page=1, per_page=9999)
     invalid = []
 
-    for q in result["rows"]:
+    async for q in repo.iter_questions():
         is_valid, reason = validate_question(q)
         if not is_valid:
             invalid.append((q, reason))
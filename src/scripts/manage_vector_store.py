@@ -11,7 +11,7 @@ Usage:
     # Link to an existing vector store
     python -m src.scripts.manage_vector_store link <store_id>
 
-    # Sync files (upload new, remove deleted)
+    # Sync files (re-shard content, upload new shards, remove stale ones)
     python -m src.scripts.manage_vector_store sync
 
     # List files in vector store
@@ -100,14 +100,12 @@ async def cmd_link(args: argparse.Namespace) -> int:
     print()
     print(f"Tracked locally: {result['tracked_files']} files")
 
-    # Check for mismatches with local files
-    local_files = list((manager.content_dir).glob("*.md"))
-    local_files = [f for f in local_files if f.name != "00_index.md"]
-    local_count = len(local_files)
+    # Check for mismatches with local shards
+    local_count = len(list(manager.shard_dir.glob("*.md")))
 
     if local_count != result['tracked_files']:
         print()
-        print(f"Warning: Local files ({local_count}) != tracked files ({result['tracked_files']})")
+        print(f"Warning: Local shards ({local_count}) != tracked files ({result['tracked_files']})")
         print("  Consider running: python -m src.scripts.manage_vector_store sync")
 
     return 0
@@ -195,6 +193,7 @@ async def cmd_status(_args: argparse.Namespace) -> int:
 
     print("File Counts:")
     print(f"  Local files:   {status['local_file_count']}")
+    print(f"  Local shards:  {status['local_shard_count']}")
     print(f"  Tracked files: {status['tracked_file_count']}")
 
     if "store_file_counts" in status:
@@ -134,10 +134,10 @@ async def step_preprocess(
 
     try:
         processor = PDFProcessor(api_key=api_key)
-        processor.reset_pdf_tokens()
 
         print("  Processing... (this may take a minute)")
         result = await processor.process_pdf(pdf_path, verbose=verbose)
+        processor.close()
 
         # Write output
         output_dir.mkdir(parents=True, exist_ok=True)
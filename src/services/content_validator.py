@@ -34,6 +34,7 @@ async def validate_vector_store() -> dict[str, Any]:
         - configured: Whether vector store is set up
         - file_count: Number of files in the store
         - local_file_count: Number of local markdown files
+        - local_shard_count: Number of shards built from them for upload
         - synced: Whether counts match
         - status: "healthy", "degraded", or "error"
     """
@@ -44,6 +45,7 @@ async def validate_vector_store() -> dict[str, Any]:
         "configured": status["configured"],
         "vector_store_id": status.get("vector_store_id"),
         "local_file_count": status.get("local_file_count", 0),
+        "local_shard_count": status.get("local_shard_count", 0),
         "tracked_file_count": status.get("tracked_file_count", 0),
     }
 
@@ -66,9 +68,11 @@ async def validate_vector_store() -> dict[str, Any]:
         result["message"] = "No files uploaded to vector store. Run: python -m src.scripts.manage_vector_store sync"
         return result
 
-    if local_count != tracked_count:
+    # The store holds shards of the content files, not the files themselves
+    shard_count = status.get("local_shard_count", 0)
+    if shard_count != tracked_count:
         result["status"] = "degraded"
-        result["message"] = f"File count mismatch: {local_count} local, {tracked_count} in store. Run sync."
+        result["message"] = f"File count mismatch: {shard_count} local shards, {tracked_count} in store. Run sync."
         result["synced"] = False
     else:
         result["status"] = "healthy"
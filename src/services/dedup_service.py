@@ -10,10 +10,10 @@ import math
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from openai import AsyncOpenAI
 
 from src.config.logging import get_logger
 from src.config.settings import get_settings
+from src.services.openai_client import create_openai_client
 
 logger = get_logger(__name__)
 
@@ -36,7 +36,7 @@ class EmbeddingDedupService:
 
     def __init__(self, threshold: Optional[float] = None) -> None:
         self.settings = get_settings()
-        self.client = AsyncOpenAI(
+        self.client = create_openai_client(
             api_key=self.settings.openai_api_key,
             max_retries=3,
         )
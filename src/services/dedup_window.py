@@ -0,0 +1,102 @@
+"""
+TTL-bounded deduplication window for AbaQuiz notifications.
+
+Tracks which notification keys were sent recently so repeats can be
+suppressed, while keeping memory bounded and counting what was suppressed
+so it can be reported when each window closes.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class DedupEntry:
+    """An open dedup window for one key."""
+
+    opened_at: float
+    last_seen: float
+    suppressed: int = 0
+    context: Any = None  # Caller data needed to report suppressed occurrences
+
+
+class DedupWindow:
+    """
+    Fixed-TTL dedup window with coalescing counters.
+
+    Every key's window has the same length and starts when it is inserted,
+    so insertion order is expiry order: an OrderedDict doubles as the
+    expiry queue, and expiring is amortized O(1) per key. Memory is capped
+    by closing the oldest windows early once max_keys is reached.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._entries: OrderedDict[str, DedupEntry] = OrderedDict()
+        self._closed: list[tuple[str, DedupEntry]] = []
+        self.unreported = 0  # Closed windows dropped because _closed was full
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def allow(self, key: str, context: Any = None) -> bool:
+        """
+        Check whether an occurrence of key should be sent.
+
+        Args:
+            key: Dedup key
+            context: Data kept with a newly opened window (returned by pop_closed)
+
+        Returns:
+            True if this opens a new window (send it), False if suppressed
+        """
+        now = self._clock()
+        self._expire(now)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.suppressed += 1
+            entry.last_seen = now
+            return False
+
+        self._entries[key] = DedupEntry(opened_at=now, last_seen=now, context=context)
+        while len(self._entries) > self.max_keys:
+            self._close(*self._entries.popitem(last=False))
+        return True
+
+    def pop_closed(self) -> list[tuple[str, DedupEntry]]:
+        """
+        Get windows that closed with suppressed occurrences since the last call.
+
+        Returns:
+            List of (key, entry) with entry.suppressed > 0
+        """
+        self._expire(self._clock())
+        closed, self._closed = self._closed, []
+        return closed
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.opened_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+            self._close(key, entry)
+
+    def _close(self, key: str, entry: DedupEntry) -> None:
+        if not entry.suppressed:
+            return
+        if len(self._closed) >= self.max_keys:
+            self.unreported += 1
+            return
+        self._closed.append((key, entry))
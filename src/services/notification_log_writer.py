@@ -0,0 +1,264 @@
+"""
+Asynchronous notification log writer for AbaQuiz.
+
+NotificationService records every event in notification_log. Instead of
+an INSERT + commit per event on the notify path, events are queued in
+memory and a background task writes them in multi-row transactions.
+Sent markers are applied in bulk the same way.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Overflow drops the lowest rank first; critical events are never dropped
+PRIORITY_RANK: dict[str, int] = {
+    "low": 0,
+    "medium": 1,
+    "high": 2,
+    "critical": 3,
+}
+CRITICAL_RANK = PRIORITY_RANK["critical"]
+
+
+def _utc_timestamp() -> str:
+    """Current time in SQLite CURRENT_TIMESTAMP format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@dataclass
+class NotificationLogEntry:
+    """A notification event waiting to be (or already) written to the log."""
+
+    event_type: str
+    priority: str
+    title: str
+    message: str
+    metadata: Optional[dict[str, Any]] = None
+    created_at: str = field(default_factory=_utc_timestamp)
+    log_id: Optional[int] = None
+    sent: bool = False
+    dropped: bool = False
+    sent_written: bool = False  # sent_at was included in the INSERT
+
+    @property
+    def rank(self) -> int:
+        return PRIORITY_RANK.get(self.priority, 0)
+
+
+class NotificationLogWriter:
+    """
+    Bounded queue of notification log entries flushed by a background task.
+
+    Overflow policy: when the queue is full, the oldest entry with the lowest
+    priority is dropped (LOW before MEDIUM before HIGH). If the incoming
+    event ranks below everything queued, it is dropped instead. Critical
+    events are never dropped; the queue may grow past its limit for them.
+    """
+
+    def __init__(
+        self,
+        get_repo: Callable[[], Awaitable[Any]],
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self._get_repo = get_repo
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending: list[NotificationLogEntry] = []
+        self._sent_pending: list[NotificationLogEntry] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.written = 0
+        self.dropped: dict[str, int] = {}
+
+    # =========================================================================
+    # Producer API
+    # =========================================================================
+
+    def log(
+        self,
+        event_type: str,
+        priority: str,
+        title: str,
+        message: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> NotificationLogEntry:
+        """
+        Queue an event for logging without touching the database.
+
+        Returns:
+            The queued entry (pass it to mark_sent once delivered)
+        """
+        entry = NotificationLogEntry(
+            event_type=event_type,
+            priority=priority,
+            title=title,
+            message=message,
+            metadata=metadata,
+        )
+
+        if len(self._pending) >= self.max_queue_size and not self._make_room(entry):
+            self._drop(entry)
+            return entry
+
+        self._pending.append(entry)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        self._ensure_started()
+        return entry
+
+    def mark_sent(self, *entries: NotificationLogEntry) -> None:
+        """Record that entries were delivered (written in bulk on next flush)."""
+        for entry in entries:
+            if entry.dropped or entry.sent:
+                continue
+            entry.sent = True
+            self._sent_pending.append(entry)
+        self._ensure_started()
+
+    def _make_room(self, entry: NotificationLogEntry) -> bool:
+        """
+        Drop one queued entry to fit a new one.
+
+        Returns:
+            False if the incoming entry should be dropped instead
+        """
+        victim_index = min(
+            range(len(self._pending)),
+            key=lambda i: (self._pending[i].rank, i),
+        )
+        victim = self._pending[victim_index]
+
+        if victim.rank >= CRITICAL_RANK and entry.rank >= CRITICAL_RANK:
+            return True  # Never drop critical events
+        if entry.rank < victim.rank:
+            return False
+
+        del self._pending[victim_index]
+        self._drop(victim)
+        return True
+
+    def _drop(self, entry: NotificationLogEntry) -> None:
+        entry.dropped = True
+        self.dropped[entry.priority] = self.dropped.get(entry.priority, 0) + 1
+        logger.warning(
+            f"Notification log queue full, dropped {entry.priority} event: {entry.title}"
+        )
+
+    # =========================================================================
+    # Writer
+    # =========================================================================
+
+    def _ensure_started(self) -> None:
+        if self._closed or (self._task and not self._task.done()):
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            pass  # No running loop; entries are written on the next flush()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Notification log flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Write all queued entries and sent markers."""
+        async with self._flush_lock:
+            repo = None
+
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+
+                rows = []
+                for entry in batch:
+                    entry.sent_written = entry.sent
+                    rows.append({
+                        "event_type": entry.event_type,
+                        "priority": entry.priority,
+                        "title": entry.title,
+                        "message": entry.message,
+                        "metadata": entry.metadata,
+                        "created_at": entry.created_at,
+                        "sent_at": _utc_timestamp() if entry.sent else None,
+                    })
+
+                repo = repo or await self._get_repo()
+                try:
+                    log_ids = await repo.log_notification_events(rows)
+                except Exception:
+                    # Put the batch back and retry on the next flush
+                    self._pending[:0] = batch
+                    raise
+
+                for entry, log_id in zip(batch, log_ids):
+                    entry.log_id = log_id
+                self.written += len(batch)
+
+            ready = [entry for entry in self._sent_pending if entry.log_id is not None]
+            if not ready:
+                return
+
+            log_ids = [entry.log_id for entry in ready if not entry.sent_written]
+            if log_ids:
+                repo = repo or await self._get_repo()
+                # On failure the markers stay queued for the next flush
+                await repo.mark_notifications_sent(log_ids)
+
+            # Only drop markers known to be written; mark_sent may have
+            # queued more while the update ran
+            written = {id(entry) for entry in ready}
+            self._sent_pending = [
+                entry for entry in self._sent_pending
+                if id(entry) not in written and not entry.dropped
+            ]
+
+    async def close(self) -> None:
+        """Stop the background task and write everything still queued."""
+        self._closed = True
+        if self._task:
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception:
+                pass
+            self._task = None
+        await self.flush()
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            "queue_depth": len(self._pending),
+            "sent_pending": len(self._sent_pending),
+            "written": self.written,
+            "dropped": dict(self.dropped),
+        }
@@ -13,7 +13,10 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from src.config.logging import get_logger
 from src.config.settings import get_settings
-from src.database.repository import get_repository
+from src.database.repository import add_admin_settings_listener, get_repository
+from src.services.dedup_window import DedupWindow
+from src.services.notification_log_writer import NotificationLogEntry, NotificationLogWriter
+from src.services.telegram_sender import TelegramSender, get_telegram_sender
 
 if TYPE_CHECKING:
     from telegram.ext import Application
@@ -54,6 +57,11 @@ class NotificationEventType(Enum):
     ADMIN_ACTION = "admin_action"
 
 
+# Log type for "N more suppressed" reports, kept apart from real events so
+# event counts and rollups don't count a closed dedup window as one more
+# occurrence (the original type is in the report's metadata)
+SUPPRESSED_EVENT_TYPE = "dedup_suppressed"
+
 # Priority mapping for each event type
 EVENT_PRIORITIES: dict[NotificationEventType, NotificationPriority] = {
     NotificationEventType.SYSTEM_ERROR: NotificationPriority.CRITICAL,
@@ -107,13 +115,98 @@ class NotificationService:
         self._batch_queue: list[dict[str, Any]] = []
         self._batch_lock = asyncio.Lock()
 
-        # Deduplication tracking (event_type:key -> timestamp)
-        self._recent_events: dict[str, datetime] = {}
+        # Deduplication tracking (event_type:key -> open window + suppressed count)
         self._dedup_window_seconds = self.settings.notification_dedup_window_seconds
+        self._dedup = DedupWindow(
+            self._dedup_window_seconds,
+            max_keys=self.settings.notification_dedup_max_keys,
+        )
 
         # Batch flush interval (minutes)
         self._batch_interval_minutes = self.settings.notification_batch_interval_minutes
 
+        # Admin settings matrix (admin_id -> event_type -> realtime enabled),
+        # loaded once and invalidated whenever the repository writes settings
+        self._realtime_matrix: Optional[dict[int, dict[str, bool]]] = None
+        self._summary_enabled: dict[int, bool] = {}
+        self._settings_generation = 0
+        add_admin_settings_listener(self.invalidate_settings_cache)
+
+        # Event log writes are queued and flushed in batches off the notify path
+        self._log_writer = NotificationLogWriter(
+            lambda: get_repository(self.settings.database_path),
+            max_queue_size=self.settings.notification_log_queue_size,
+            flush_interval=self.settings.notification_log_flush_seconds,
+        )
+
+    # =========================================================================
+    # Admin Settings Cache
+    # =========================================================================
+
+    def invalidate_settings_cache(self, admin_id: Optional[int] = None) -> None:
+        """Drop the cached admin settings matrix (reloaded on next use)."""
+        self._settings_generation += 1
+        self._realtime_matrix = None
+
+    async def _load_settings_matrix(self) -> dict[int, dict[str, bool]]:
+        """Get the admin x event type realtime matrix, loading it if needed."""
+        if self._realtime_matrix is not None:
+            return self._realtime_matrix
+
+        generation = self._settings_generation
+        admin_ids = list(self.settings.admin_users)
+        repo = await get_repository(self.settings.database_path)
+        event_rows = await repo.get_notification_settings_for_admins(admin_ids)
+        admin_rows = await repo.get_admin_settings_for_admins(admin_ids)
+
+        overrides = {
+            (row["admin_telegram_id"], row["event_type"]): bool(row["realtime_enabled"])
+            for row in event_rows
+            if row.get("realtime_enabled") is not None
+        }
+        matrix = {
+            admin_id: {
+                event_type.value: overrides.get(
+                    (admin_id, event_type.value),
+                    DEFAULT_BEHAVIORS.get(event_type, {}).get("realtime", True),
+                )
+                for event_type in NotificationEventType
+            }
+            for admin_id in admin_ids
+        }
+        summary_enabled = {
+            row["telegram_id"]: bool(row.get("summary_enabled", True))
+            for row in admin_rows
+        }
+
+        # Don't cache a snapshot that was invalidated while loading
+        if generation == self._settings_generation:
+            self._realtime_matrix = matrix
+            self._summary_enabled = summary_enabled
+
+        return matrix
+
+    async def _realtime_admins(self, event_type: NotificationEventType) -> list[int]:
+        """Get admins with realtime alerts enabled for an event type."""
+        matrix = await self._load_settings_matrix()
+        return [
+            admin_id for admin_id, enabled in matrix.items()
+            if enabled.get(event_type.value, True)
+        ]
+
+    async def _summary_admins(self) -> list[int]:
+        """Get admins with the daily summary enabled."""
+        await self._load_settings_matrix()
+        return [
+            admin_id for admin_id in self.settings.admin_users
+            if self._summary_enabled.get(admin_id, True)
+        ]
+
+    @property
+    def _sender(self) -> TelegramSender:
+        """Shared paced sender for outgoing admin messages."""
+        return get_telegram_sender(self.application.bot)
+
     async def notify(
         self,
         event_type: NotificationEventType,
@@ -137,17 +230,12 @@ class NotificationService:
         # Check deduplication
         if dedup_key:
             cache_key = f"{event_type.value}:{dedup_key}"
-            now = datetime.now()
-            if cache_key in self._recent_events:
-                last_sent = self._recent_events[cache_key]
-                if (now - last_sent).total_seconds() < self._dedup_window_seconds:
-                    logger.debug(f"Skipping duplicate notification: {cache_key}")
-                    return
-            self._recent_events[cache_key] = now
-
-        # Log the event
-        repo = await get_repository(self.settings.database_path)
-        log_id = await repo.log_notification_event(
+            if not self._dedup.allow(cache_key, context=(event_type, title, dedup_key)):
+                logger.debug(f"Skipping duplicate notification: {cache_key}")
+                return
+
+        # Log the event (queued; written in the background)
+        log_entry = self._log_writer.log(
             event_type=event_type.value,
             priority=priority.value,
             title=title,
@@ -158,10 +246,10 @@ class NotificationService:
         # Determine handling based on priority
         if priority == NotificationPriority.CRITICAL:
             # Critical events always sent immediately to all admins
-            await self._send_to_all_admins(event_type, title, message, log_id)
+            await self._send_to_all_admins(event_type, title, message, log_entry)
         elif priority == NotificationPriority.HIGH:
             # High priority events sent immediately if realtime is enabled
-            await self._send_realtime(event_type, title, message, log_id)
+            await self._send_realtime(event_type, title, message, log_entry)
         elif priority == NotificationPriority.MEDIUM:
             # Medium priority events are batched
             async with self._batch_lock:
@@ -169,7 +257,7 @@ class NotificationService:
                     "event_type": event_type,
                     "title": title,
                     "message": message,
-                    "log_id": log_id,
+                    "log_entry": log_entry,
                     "timestamp": datetime.now(),
                 })
         # Low priority events are only logged for summaries
@@ -179,66 +267,84 @@ class NotificationService:
         event_type: NotificationEventType,
         title: str,
         message: str,
-        log_id: int,
+        log_entry: NotificationLogEntry,
     ) -> None:
         """Send notification to all admins (for critical events)."""
-        repo = await get_repository(self.settings.database_path)
-
         for admin_id in self.settings.admin_users:
-            try:
-                formatted_message = self._format_notification(
-                    event_type, title, message
-                )
-                await self.application.bot.send_message(
-                    chat_id=admin_id,
-                    text=formatted_message,
-                )
+            formatted_message = self._format_notification(
+                event_type, title, message
+            )
+            result = await self._sender.send_message(
+                chat_id=admin_id,
+                text=formatted_message,
+            )
+            if result.ok:
                 logger.info(f"Sent critical notification to admin {admin_id}")
-            except Exception as e:
-                logger.error(f"Failed to send notification to admin {admin_id}: {e}")
+            else:
+                logger.error(f"Failed to send notification to admin {admin_id}: {result.error}")
 
-        await repo.mark_notification_sent(log_id)
+        self._log_writer.mark_sent(log_entry)
 
     async def _send_realtime(
         self,
         event_type: NotificationEventType,
         title: str,
         message: str,
-        log_id: int,
+        log_entry: NotificationLogEntry,
     ) -> None:
         """Send real-time notification to admins with realtime enabled."""
-        repo = await get_repository(self.settings.database_path)
-        default_behavior = DEFAULT_BEHAVIORS.get(event_type, {})
-
-        for admin_id in self.settings.admin_users:
-            # Check admin's settings for this event type
-            settings = await repo.get_admin_notification_setting(
-                admin_id, event_type.value
+        for admin_id in await self._realtime_admins(event_type):
+            formatted_message = self._format_notification(
+                event_type, title, message
+            )
+            result = await self._sender.send_message(
+                chat_id=admin_id,
+                text=formatted_message,
             )
+            if not result.ok:
+                logger.error(f"Failed to send notification to admin {admin_id}: {result.error}")
 
-            if settings:
-                realtime_enabled = settings.get("realtime_enabled", True)
-            else:
-                realtime_enabled = default_behavior.get("realtime", True)
+        self._log_writer.mark_sent(log_entry)
 
-            if not realtime_enabled:
-                continue
+    async def _queue_suppressed_reports(self) -> None:
+        """Queue a batch item for each closed dedup window that suppressed repeats."""
+        closed = self._dedup.pop_closed()
+        if not closed:
+            return
 
-            try:
-                formatted_message = self._format_notification(
-                    event_type, title, message
+        async with self._batch_lock:
+            for _, entry in closed:
+                event_type, title, dedup_key = entry.context
+                priority = EVENT_PRIORITIES.get(event_type, NotificationPriority.LOW)
+                report_title = f"{title}: {entry.suppressed} more suppressed"
+                report_message = (
+                    f"Key: {dedup_key}\n"
+                    f"{entry.suppressed} more occurrence(s) within "
+                    f"{self._dedup_window_seconds}s were suppressed"
                 )
-                await self.application.bot.send_message(
-                    chat_id=admin_id,
-                    text=formatted_message,
+                log_entry = self._log_writer.log(
+                    event_type=SUPPRESSED_EVENT_TYPE,
+                    priority=priority.value,
+                    title=report_title,
+                    message=report_message,
+                    metadata={
+                        "event_type": event_type.value,
+                        "dedup_key": dedup_key,
+                        "suppressed_count": entry.suppressed,
+                    },
                 )
-            except Exception as e:
-                logger.error(f"Failed to send notification to admin {admin_id}: {e}")
-
-        await repo.mark_notification_sent(log_id)
+                self._batch_queue.append({
+                    "event_type": event_type,
+                    "title": report_title,
+                    "message": report_message,
+                    "log_entry": log_entry,
+                    "timestamp": datetime.now(),
+                })
 
     async def flush_batch(self) -> None:
         """Flush batched notifications to admins."""
+        await self._queue_suppressed_reports()
+
         async with self._batch_lock:
             if not self._batch_queue:
                 return
@@ -256,24 +362,15 @@ class NotificationService:
         for item in batch:
             by_type[item["event_type"]].append(item)
 
-        repo = await get_repository(self.settings.database_path)
+        matrix = await self._load_settings_matrix()
 
         for admin_id in self.settings.admin_users:
             messages_to_send = []
+            admin_matrix = matrix.get(admin_id, {})
 
             for event_type, items in by_type.items():
                 # Check admin's settings
-                settings = await repo.get_admin_notification_setting(
-                    admin_id, event_type.value
-                )
-                default_behavior = DEFAULT_BEHAVIORS.get(event_type, {})
-
-                if settings:
-                    realtime_enabled = settings.get("realtime_enabled", True)
-                else:
-                    realtime_enabled = default_behavior.get("realtime", True)
-
-                if not realtime_enabled:
+                if not admin_matrix.get(event_type.value, True):
                     continue
 
                 # Create batch summary message
@@ -290,23 +387,24 @@ class NotificationService:
                     messages_to_send.append(summary)
 
             if messages_to_send:
-                try:
-                    combined = "\n---\n".join(messages_to_send)
-                    await self.application.bot.send_message(
-                        chat_id=admin_id,
-                        text=combined,
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send batch to admin {admin_id}: {e}")
-
-        # Mark all as sent
-        for item in batch:
-            await repo.mark_notification_sent(item["log_id"])
+                combined = "\n---\n".join(messages_to_send)
+                result = await self._sender.send_message(
+                    chat_id=admin_id,
+                    text=combined,
+                )
+                if not result.ok:
+                    logger.error(f"Failed to send batch to admin {admin_id}: {result.error}")
+
+        # Mark all as sent (one bulk update on the next log flush)
+        self._log_writer.mark_sent(*(item["log_entry"] for item in batch))
 
     async def send_daily_summary(self) -> None:
         """Send daily summary to admins."""
         repo = await get_repository(self.settings.database_path)
 
+        # Make sure queued events are included
+        await self._log_writer.flush()
+
         # Get unsummarized events
         events = await repo.get_unsummarized_events(hours=24)
         event_counts = await repo.get_event_counts_by_type(hours=24)
@@ -314,6 +412,7 @@ class NotificationService:
         # Get system stats
         total_users = await repo.get_user_count()
         new_users = await repo.get_new_users_count(hours=24)
+        pruned_users = await repo.get_pruned_user_count(hours=24)
         active_users_count = await repo.get_active_user_count(days=1)
         total_questions = await repo.get_total_question_count()
         api_usage = await repo.get_api_usage_stats(hours=24)
@@ -324,7 +423,7 @@ class NotificationService:
             f"*Daily Admin Summary*",
             f"{now.strftime('%Y-%m-%d')}\n",
             "*System Stats:*",
-            f"  Users: {total_users} total, {new_users} new",
+            f"  Users: {total_users} total, {new_users} new, {pruned_users} pruned",
             f"  Active (24h): {active_users_count}",
             f"  Pool: {total_questions} questions\n",
         ]
@@ -348,26 +447,29 @@ class NotificationService:
         summary_text = "\n".join(summary_lines)
 
         # Send to admins with summary enabled
-        for admin_id in self.settings.admin_users:
-            # Check admin's general summary setting
-            admin_settings = await repo.get_admin_settings(admin_id)
-            if admin_settings and not admin_settings.get("summary_enabled", True):
-                continue
-
-            try:
-                await self.application.bot.send_message(
-                    chat_id=admin_id,
-                    text=summary_text,
-                )
+        for admin_id in await self._summary_admins():
+            result = await self._sender.send_message(
+                chat_id=admin_id,
+                text=summary_text,
+            )
+            if result.ok:
                 logger.info(f"Sent daily summary to admin {admin_id}")
-            except Exception as e:
-                logger.error(f"Failed to send summary to admin {admin_id}: {e}")
+            else:
+                logger.error(f"Failed to send summary to admin {admin_id}: {result.error}")
 
         # Mark events as summarized
         if events:
             event_ids = [e["id"] for e in events]
             await repo.mark_events_summarized(event_ids)
 
+    async def close(self) -> None:
+        """Write any queued notification log entries."""
+        await self._log_writer.close()
+
+    def get_log_stats(self) -> dict[str, Any]:
+        """Get notification log writer statistics."""
+        return self._log_writer.get_stats()
+
     def _format_notification(
         self,
         event_type: NotificationEventType,
@@ -405,6 +507,12 @@ def get_notification_service() -> Optional[NotificationService]:
     return _notification_service
 
 
+async def close_notification_service() -> None:
+    """Flush pending notification log writes and stop the writer."""
+    if _notification_service:
+        await _notification_service.close()
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
@@ -0,0 +1,59 @@
+"""
+OpenAI client factory for AbaQuiz.
+
+Every service builds its AsyncOpenAI client through create_openai_client(),
+so a different client (the local stand-in in openai_standin.py, or a
+recorder wrapping the real client) can be injected for benchmarks and
+profiling without live API calls.
+
+Set OPENAI_RECORD_CASSETTE to a JSONL path to record every response from
+the real API for later replay by the stand-in.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from openai import AsyncOpenAI
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Called with the AsyncOpenAI keyword arguments; returns a client-like object
+ClientFactory = Callable[..., Any]
+
+_client_factory: Optional[ClientFactory] = None
+
+
+def create_openai_client(**kwargs: Any) -> AsyncOpenAI:
+    """Create an OpenAI client through the configured factory.
+
+    Args:
+        **kwargs: AsyncOpenAI arguments (api_key, max_retries, timeout, ...)
+
+    Returns:
+        An AsyncOpenAI client, or whatever the injected factory returns.
+    """
+    if _client_factory is not None:
+        return _client_factory(**kwargs)
+
+    client = AsyncOpenAI(**kwargs)
+    cassette = os.getenv("OPENAI_RECORD_CASSETTE")
+    if cassette:
+        from src.services.openai_standin import RecordingOpenAI
+
+        return RecordingOpenAI(client, Path(cassette))
+    return client
+
+
+def set_client_factory(factory: Optional[ClientFactory]) -> None:
+    """Inject a client factory (None restores the real AsyncOpenAI).
+
+    Only clients created afterwards are affected; reset service singletons
+    that already hold a client.
+    """
+    global _client_factory
+    _client_factory = factory
+    if factory is not None:
+        logger.info(f"OpenAI client factory overridden: {factory!r}")
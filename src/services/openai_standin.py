@@ -0,0 +1,402 @@
+"""
+Local stand-in for the OpenAI API, for benchmarks and profiling.
+
+StandInOpenAI answers the endpoints AbaQuiz uses (responses.create,
+embeddings.create and chat.completions.create) without network access or
+spend. Responses come from a cassette recorded against the real API, or
+are synthesized: valid question JSON, difficulty ratings, deterministic
+embeddings and extraction markdown, with token usage attached.
+
+Latency is drawn from a configurable distribution per endpoint, and 429s
+can be injected at a given rate. Like the SDK, each client retries an
+injected 429 up to its max_retries (with backoff) before raising
+openai.RateLimitError, so services see the same failures they would live.
+
+Usage:
+    standin = StandInOpenAI(latency=LatencyModel.parse("lognormal:20:0.4"))
+    set_client_factory(standin.client)
+
+Recording a cassette from a live run:
+    OPENAI_RECORD_CASSETTE=data/cassette.jsonl python -m src.scripts.seed_questions ...
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import random
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from src.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+RESPONSES = "responses.create"
+EMBEDDINGS = "embeddings.create"
+CHAT_COMPLETIONS = "chat.completions.create"
+ENDPOINTS = (RESPONSES, EMBEDDINGS, CHAT_COMPLETIONS)
+
+# Dimension of text-embedding-3-large, so dedup cost matches production
+DEFAULT_EMBEDDING_DIM = 3072
+
+BATCH_COUNT = re.compile(r"Generate exactly (\d+) BCBA exam questions")
+RATING_COUNT = re.compile(r"Return a JSON array with exactly (\d+) integer ratings")
+
+
+def request_key(endpoint: str, kwargs: dict[str, Any]) -> str:
+    """Stable identity of a request, used to match cassette entries."""
+    canonical = json.dumps(kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(f"{endpoint}\n{canonical}".encode()).hexdigest()[:16]
+
+
+def _to_namespace(data: Any) -> Any:
+    """Turn response JSON into attribute-access objects like the SDK's."""
+    return json.loads(json.dumps(data), object_hook=lambda d: SimpleNamespace(**d))
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/stand-in")
+    response = httpx.Response(429, request=request, headers={"retry-after": "1"})
+    return openai.RateLimitError("Rate limit reached (stand-in)", response=response, body=None)
+
+
+@dataclass
+class LatencyModel:
+    """Latency distribution for one endpoint, in seconds."""
+
+    kind: str = "fixed"  # "fixed", "uniform" or "lognormal"
+    a: float = 0.0  # fixed: value; uniform: low; lognormal: median
+    b: float = 0.0  # uniform: high; lognormal: sigma
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Parse "fixed:S", "uniform:LOW:HIGH" or "lognormal:MEDIAN:SIGMA"."""
+        kind, *values = spec.split(":")
+        if kind not in ("fixed", "uniform", "lognormal") or not 1 <= len(values) <= 2:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        numbers = [float(v) for v in values] + [0.0]
+        return cls(kind, numbers[0], numbers[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal" and self.a > 0:
+            return self.a * math.exp(rng.gauss(0.0, self.b))
+        return self.a
+
+
+@dataclass
+class StandInStats:
+    """What the stand-in served, across every client it created."""
+
+    calls: Counter = field(default_factory=Counter)  # endpoint -> requests
+    rate_limited: int = 0  # injected 429s
+    retries: int = 0  # 429s retried inside a client
+    raised: int = 0  # 429s surfaced as RateLimitError
+    replayed: int = 0
+    synthesized: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": dict(self.calls),
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "raised": self.raised,
+            "replayed": self.replayed,
+            "synthesized": self.synthesized,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+class StandInOpenAI:
+    """Serves recorded or synthetic OpenAI responses to any number of clients."""
+
+    def __init__(
+        self,
+        cassette: Optional[Path] = None,
+        latency: Optional[LatencyModel] = None,
+        embedding_latency: Optional[LatencyModel] = None,
+        rate_limit_rate: float = 0.0,
+        duplicate_rate: float = 0.0,
+        input_tokens: int = 12000,
+        output_tokens_per_question: int = 450,
+        embedding_dim: int = DEFAULT_EMBEDDING_DIM,
+        time_scale: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Args:
+            cassette: JSONL cassette to replay (see RecordingOpenAI); requests
+                not in it fall back to other recordings of the same endpoint,
+                then to synthetic responses
+            latency: Latency of responses and chat completions
+            embedding_latency: Latency of embeddings (default: none)
+            rate_limit_rate: Probability that an attempt gets a 429
+            duplicate_rate: Probability that a synthetic question repeats
+                an earlier one verbatim (and is caught by dedup)
+            input_tokens: Input tokens reported per generation request
+            output_tokens_per_question: Output tokens per generated question
+            embedding_dim: Length of synthetic embedding vectors
+            time_scale: Multiplier for every simulated delay
+            seed: Seed for latency, 429 and content randomness
+        """
+        self.latency = {
+            RESPONSES: latency or LatencyModel(),
+            CHAT_COMPLETIONS: latency or LatencyModel(),
+            EMBEDDINGS: embedding_latency or LatencyModel(),
+        }
+        self.rate_limit_rate = rate_limit_rate
+        self.duplicate_rate = duplicate_rate
+        self.input_tokens = input_tokens
+        self.output_tokens_per_question = output_tokens_per_question
+        self.embedding_dim = embedding_dim
+        self.time_scale = time_scale
+        self.stats = StandInStats()
+
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._questions: list[dict[str, Any]] = []
+        self._by_key: dict[str, list[Any]] = defaultdict(list)
+        self._by_endpoint: dict[str, list[Any]] = defaultdict(list)
+        self._replay_cursor: Counter = Counter()
+        if cassette:
+            self._load_cassette(cassette)
+
+    def _load_cassette(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key[entry["key"]].append(entry["response"])
+                self._by_endpoint[entry["endpoint"]].append(entry["response"])
+        logger.info(
+            f"Loaded cassette {path.name}: "
+            + ", ".join(f"{len(v)} {k}" for k, v in self._by_endpoint.items())
+        )
+
+    def client(self, max_retries: int = 2, **_kwargs: Any) -> "StandInClient":
+        """Client factory for set_client_factory (accepts AsyncOpenAI kwargs)."""
+        return StandInClient(self, max_retries)
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds > 0 and self.time_scale > 0:
+            await asyncio.sleep(seconds * self.time_scale)
+
+    async def handle(self, endpoint: str, kwargs: dict[str, Any], max_retries: int) -> Any:
+        """Serve one request: latency, 429 injection with retries, then a response."""
+        self.stats.calls[endpoint] += 1
+        attempt = 0
+        while True:
+            await self.sleep(self.latency[endpoint].sample(self._rng))
+            if self._rng.random() >= self.rate_limit_rate:
+                break
+            self.stats.rate_limited += 1
+            if attempt >= max_retries:
+                self.stats.raised += 1
+                raise _rate_limit_error()
+            attempt += 1
+            self.stats.retries += 1
+            await self.sleep(min(0.5 * 2 ** (attempt - 1), 8.0))  # SDK backoff
+
+        data = self._replay(endpoint, kwargs)
+        if data is None:
+            self.stats.synthesized += 1
+            data = self._synthesize(endpoint, kwargs)
+        else:
+            self.stats.replayed += 1
+
+        usage = data.get("usage") or {}
+        self.stats.input_tokens += usage.get("input_tokens", usage.get("prompt_tokens", 0))
+        self.stats.output_tokens += usage.get("output_tokens", usage.get("completion_tokens", 0))
+        return _to_namespace(data)
+
+    def _replay(self, endpoint: str, kwargs: dict[str, Any]) -> Optional[dict[str, Any]]:
+        key = request_key(endpoint, kwargs)
+        pool = self._by_key.get(key) or self._by_endpoint.get(endpoint)
+        if not pool:
+            return None
+        cursor_key = key if key in self._by_key else endpoint
+        index = self._replay_cursor[cursor_key] % len(pool)
+        self._replay_cursor[cursor_key] += 1
+        return pool[index]
+
+    # Synthetic responses
+
+    def _synthesize(self, endpoint: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if endpoint == EMBEDDINGS:
+            return self._embeddings(kwargs["input"])
+        if endpoint == CHAT_COMPLETIONS:
+            return self._chat_completion()
+        return self._response(self._prompt_text(kwargs.get("input")))
+
+    @staticmethod
+    def _prompt_text(messages: Any) -> str:
+        if isinstance(messages, str):
+            return messages
+        return "\n".join(
+            m["content"] for m in messages or [] if isinstance(m.get("content"), str)
+        )
+
+    def _response(self, prompt: str) -> dict[str, Any]:
+        if match := RATING_COUNT.search(prompt):
+            count = int(match.group(1))
+            text = json.dumps([self._rng.randint(1, 5) for _ in range(count)])
+            output_tokens = 3 * count
+        elif match := BATCH_COUNT.search(prompt):
+            count = int(match.group(1))
+            text = json.dumps({"questions": [self._question() for _ in range(count)]})
+            output_tokens = self.output_tokens_per_question * count
+        else:
+            text = json.dumps(self._question())
+            output_tokens = self.output_tokens_per_question
+
+        return {
+            "id": f"resp_standin_{next(self._ids)}",
+            "output": [{
+                "type": "message",
+                "content": [{"type": "output_text", "text": text}],
+            }],
+            "usage": {
+                "input_tokens": self.input_tokens,
+                "output_tokens": output_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+            },
+        }
+
+    def _question(self) -> dict[str, Any]:
+        if self._questions and self._rng.random() < self.duplicate_rate:
+            return dict(self._rng.choice(self._questions))
+
+        n = next(self._ids)
+        words = " ".join(self._rng.choice(_VOCABULARY) for _ in range(12))
+        question = {
+            "question": f"Synthetic question {n}: {words}?",
+            "type": "multiple_choice",
+            "options": {k: f"Option {k} for {n}" for k in "ABCD"},
+            "correct_answer": self._rng.choice("ABCD"),
+            "explanation": f"Synthetic explanation {n}.",
+            "category": self._rng.choice(["scenario", "definition", "application"]),
+            "difficulty": self._rng.randint(1, 5),
+            "source_citation": {"section": "Stand-in", "heading": "Stand-in", "quote": words},
+        }
+        self._questions.append(question)
+        return question
+
+    def _embeddings(self, inputs: Any) -> dict[str, Any]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        data = []
+        for i, text in enumerate(texts):
+            # Same text, same vector: verbatim duplicates score 1.0
+            rng = random.Random(hashlib.sha256(text.encode()).digest())
+            vector = [rng.gauss(0.0, 1.0) for _ in range(self.embedding_dim)]
+            data.append({"object": "embedding", "index": i, "embedding": vector})
+        tokens = sum(len(t) // 4 for t in texts)
+        return {"data": data, "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+    def _chat_completion(self) -> dict[str, Any]:
+        n = next(self._ids)
+        content = f"## Stand-in extraction {n}\n\n" + " ".join(
+            self._rng.choice(_VOCABULARY) for _ in range(200)
+        )
+        return {
+            "id": f"chatcmpl_standin_{n}",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": {
+                "prompt_tokens": self.input_tokens,
+                "completion_tokens": len(content) // 4,
+            },
+        }
+
+
+class _Endpoint:
+    """Awaitable endpoint method bound to one client."""
+
+    def __init__(self, handler: Callable[..., Any], endpoint: str, max_retries: int) -> None:
+        self._handler = handler
+        self._endpoint = endpoint
+        self._max_retries = max_retries
+
+    async def __call__(self, **kwargs: Any) -> Any:
+        return await self._handler(self._endpoint, kwargs, self._max_retries)
+
+
+class StandInClient:
+    """The AsyncOpenAI surface AbaQuiz uses, backed by a StandInOpenAI."""
+
+    def __init__(self, standin: StandInOpenAI, max_retries: int) -> None:
+        self.standin = standin
+        self.max_retries = max_retries
+        self.responses = SimpleNamespace(
+            create=_Endpoint(standin.handle, RESPONSES, max_retries)
+        )
+        self.embeddings = SimpleNamespace(
+            create=_Endpoint(standin.handle, EMBEDDINGS, max_retries)
+        )
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            create=_Endpoint(standin.handle, CHAT_COMPLETIONS, max_retries)
+        ))
+
+
+class RecordingOpenAI:
+    """Wraps a real client, appending every served endpoint call to a cassette."""
+
+    def __init__(self, client: AsyncOpenAI, cassette: Path) -> None:
+        self._client = client
+        self.cassette = cassette
+        self.responses = SimpleNamespace(
+            create=self._recorded(RESPONSES, client.responses.create)
+        )
+        self.embeddings = SimpleNamespace(
+            create=self._recorded(EMBEDDINGS, client.embeddings.create)
+        )
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            create=self._recorded(CHAT_COMPLETIONS, client.chat.completions.create)
+        ))
+
+    def __getattr__(self, name: str) -> Any:
+        # files, vector_stores, ... pass straight through
+        return getattr(self._client, name)
+
+    def _recorded(self, endpoint: str, create: Callable[..., Any]) -> Callable[..., Any]:
+        async def call(**kwargs: Any) -> Any:
+            response = await create(**kwargs)
+            entry = {
+                "endpoint": endpoint,
+                "key": request_key(endpoint, kwargs),
+                "model": kwargs.get("model"),
+                "response": response.model_dump(mode="json"),
+            }
+            self.cassette.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            return response
+
+        return call
+
+
+_VOCABULARY = (
+    "reinforcement punishment extinction schedule stimulus response operant "
+    "respondent motivating operation discriminative prompt fading shaping "
+    "chaining generalization maintenance baseline intervention reversal "
+    "multiple-baseline functional analysis antecedent consequence mand tact "
+    "intraverbal echoic verbal behavior supervision ethics client caregiver "
+    "measurement duration latency frequency interval visual analysis trend"
+).split()
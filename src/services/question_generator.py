@@ -12,12 +12,12 @@ from enum import Enum
 from typing import Any, Literal, Optional
 
 import openai
-from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
 from src.config.constants import ContentArea, QuestionType
 from src.config.logging import get_logger
 from src.config.settings import get_settings
+from src.services.openai_client import create_openai_client
 from src.services.usage_tracker import get_usage_tracker
 from src.services.vector_store_manager import get_vector_store_manager
 
@@ -365,8 +365,8 @@ class QuestionGenerator:
 
     def __init__(self) -> None:
         self.settings = get_settings()
-        # Use AsyncOpenAI for non-blocking API calls
-        self.client = AsyncOpenAI(
+        # Async client for non-blocking API calls (injectable, see openai_client.py)
+        self.client = create_openai_client(
             api_key=self.settings.openai_api_key,
             max_retries=3,
         )
@@ -590,6 +590,7 @@ IMPORTANT: You MUST respond with ONLY valid JSON matching this exact structure:
                 tools=[{
                     "type": "file_search",
                     "vector_store_ids": [store_id],
+                    "max_num_results": self.settings.file_search_max_results,
                 }],
                 prompt_cache_key=f"bcba-question-{content_area.value}",
                 prompt_cache_retention=self._cache_retention,
@@ -783,6 +784,7 @@ IMPORTANT: You MUST respond with ONLY valid JSON matching this exact structure:
                 tools=[{
                     "type": "file_search",
                     "vector_store_ids": [store_id],
+                    "max_num_results": self.settings.file_search_max_results,
                 }],
                 prompt_cache_key=f"bcba-batch-{content_area.value}",
                 prompt_cache_retention=self._cache_retention,
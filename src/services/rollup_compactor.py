@@ -0,0 +1,128 @@
+"""
+Rollup compactor for AbaQuiz analytics.
+
+Folds new rows from the raw event tables (api_usage, user_answers,
+notification_log) into hourly/daily rollup tables so the daily summary,
+/usage and dashboard stats stop scanning raw history, and expires raw rows
+past their retention window, optionally archiving them as JSONL first.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from src.config.logging import get_logger
+from src.config.settings import get_settings
+from src.database.repository import ROLLUP_SOURCES, get_repository
+
+logger = get_logger(__name__)
+
+# Raw tables whose rows may be expired. user_answers is rolled up but kept:
+# per-user history (streaks, weak areas, seen questions) reads it directly.
+RETENTION_TABLES = ("api_usage", "notification_log")
+
+
+class RollupCompactor:
+    """Incrementally maintains rollups and applies raw-row retention."""
+
+    def __init__(
+        self,
+        retention_days: Optional[dict[str, int]] = None,
+        archive_dir: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> None:
+        settings = get_settings()
+        self.settings = settings
+        self.retention_days = (
+            settings.rollup_retention_days if retention_days is None else retention_days
+        )
+        self.archive_dir = (
+            settings.rollup_archive_dir if archive_dir is None else archive_dir
+        )
+        self.batch_size = batch_size
+
+    async def compact(self) -> dict[str, int]:
+        """
+        Fold raw rows added since the last run into the rollup tables.
+
+        Returns:
+            Number of raw rows compacted per source table
+        """
+        repo = await get_repository(self.settings.database_path)
+        compacted = await repo.compact_rollups()
+        if any(compacted.values()):
+            logger.info(f"Compacted rollups: {compacted}")
+        return compacted
+
+    async def apply_retention(self) -> dict[str, int]:
+        """
+        Archive and delete raw rows older than their retention window.
+
+        Compaction runs first, and only rows already folded into the rollups
+        are expired, so the stats queries return the same totals afterwards.
+
+        Returns:
+            Number of raw rows removed per table
+        """
+        await self.compact()
+        repo = await get_repository(self.settings.database_path)
+        removed: dict[str, int] = {}
+
+        for table, days in self.retention_days.items():
+            if table not in RETENTION_TABLES:
+                logger.warning(f"Retention not supported for table '{table}', skipping")
+                continue
+            if not days or days <= 0:
+                continue
+
+            # Raw timestamps are SQLite CURRENT_TIMESTAMP values (UTC)
+            before = datetime.now(timezone.utc) - timedelta(days=days)
+            removed[table] = 0
+            while True:
+                rows = await repo.get_expired_rows(table, before, limit=self.batch_size)
+                if not rows:
+                    break
+                if self.archive_dir:
+                    self._archive(table, rows)
+                removed[table] += await repo.delete_expired_rows(
+                    table, before, max_id=rows[-1]["id"]
+                )
+                if len(rows) < self.batch_size:
+                    break
+
+            if removed[table]:
+                logger.info(
+                    f"Expired {removed[table]} {table} rows older than {days} days"
+                )
+
+        return removed
+
+    def _archive(self, table: str, rows: list[dict[str, Any]]) -> None:
+        """Append rows to monthly JSONL files keyed by each row's timestamp."""
+        directory = Path(self.archive_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        column = ROLLUP_SOURCES[table]
+
+        by_month: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            month = str(row.get(column) or "")[:7] or "unknown"
+            by_month.setdefault(month, []).append(row)
+
+        for month, month_rows in by_month.items():
+            path = directory / f"{table}-{month}.jsonl"
+            with path.open("a", encoding="utf-8") as f:
+                for row in month_rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+
+
+# Global compactor instance
+_compactor: Optional[RollupCompactor] = None
+
+
+def get_rollup_compactor() -> RollupCompactor:
+    """Get or create the global rollup compactor instance."""
+    global _compactor
+    if _compactor is None:
+        _compactor = RollupCompactor()
+    return _compactor
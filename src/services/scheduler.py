@@ -10,12 +10,14 @@ from typing import TYPE_CHECKING, Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from telegram.ext import Application
 
 from src.config.logging import get_logger
 from src.config.settings import get_settings
 from src.database.repository import get_repository
 from src.services.pool_manager import get_pool_manager
+from src.services.telegram_sender import SendOutcome
 
 if TYPE_CHECKING:
     pass
@@ -68,56 +70,31 @@ async def deliver_scheduled_questions(
     # Import here to avoid circular imports
     from src.bot.handlers import send_question_to_user
 
-    success_count = 0
-    failure_count = 0
-
-    for user in users:
+    async def deliver_to_user(user: dict) -> bool:
         telegram_id = user["telegram_id"]
-
-        # Retry logic
-        for attempt in range(settings.max_retries):
-            try:
-                success = await send_question_to_user(
-                    user_id=telegram_id,
-                    context=application,
-                    is_scheduled=True,
-                )
-
-                if success:
-                    success_count += 1
-                    break
-                else:
-                    # No questions available or other soft failure
-                    failure_count += 1
-                    break
-
-            except Exception as e:
-                delay = settings.retry_delays[attempt] if attempt < len(settings.retry_delays) else 15
-                logger.warning(
-                    f"Delivery attempt {attempt + 1} failed for user {telegram_id}: {e}"
+        try:
+            # Pacing and transient-error retries are handled by the TelegramSender
+            result = await send_question_to_user(
+                user_id=telegram_id,
+                context=application,
+                is_scheduled=True,
+            )
+            if result is None:
+                return False
+            if result.outcome == SendOutcome.FAILED:
+                # Retries exhausted; unreachable chats are pruned, not alerted
+                await notify_admins_of_failure(
+                    application, telegram_id, result.error or "send failed"
                 )
+            return result.ok
+        except Exception as e:
+            logger.error(f"Delivery failed for user {telegram_id}: {e}")
+            await notify_admins_of_failure(application, telegram_id, str(e))
+            return False
 
-                if attempt < settings.max_retries - 1:
-                    await asyncio.sleep(delay)
-                else:
-                    failure_count += 1
-                    logger.error(
-                        f"All delivery attempts failed for user {telegram_id}"
-                    )
-                    # Notify admins about failure
-                    await notify_admins_of_failure(
-                        application,
-                        telegram_id,
-                        str(e),
-                    )
-
-        # Delay between users to avoid Telegram rate limiting
-        # Telegram allows ~30 messages/second, use 50ms (20/sec) to be safe
-        await asyncio.sleep(0.05)
-
-        # Add extra delay every 25 users to avoid burst limits
-        if (success_count + failure_count) % 25 == 0:
-            await asyncio.sleep(1.0)
+    results = await asyncio.gather(*(deliver_to_user(user) for user in users))
+    success_count = sum(1 for sent in results if sent)
+    failure_count = len(results) - success_count
 
     logger.info(
         f"Completed {period} delivery for {timezone}: "
@@ -190,6 +167,26 @@ async def send_daily_admin_summary() -> None:
         await service.send_daily_summary()
 
 
+async def compact_rollups() -> None:
+    """Fold new raw analytics rows into the rollup tables."""
+    from src.services.rollup_compactor import get_rollup_compactor
+
+    try:
+        await get_rollup_compactor().compact()
+    except Exception as e:
+        logger.error(f"Rollup compaction failed: {e}")
+
+
+async def apply_rollup_retention() -> None:
+    """Archive and delete raw analytics rows past their retention window."""
+    from src.services.rollup_compactor import get_rollup_compactor
+
+    try:
+        await get_rollup_compactor().apply_retention()
+    except Exception as e:
+        logger.error(f"Rollup retention failed: {e}")
+
+
 async def check_question_pool() -> None:
     """
     Check question pool levels and generate questions if needed.
@@ -379,6 +376,28 @@ async def start_scheduler(application: Application) -> AsyncIOScheduler:
         replace_existing=True,
     )
 
+    # Rollup compaction - keeps analytics queries off the raw event tables
+    _scheduler.add_job(
+        compact_rollups,
+        IntervalTrigger(minutes=settings.rollup_compact_interval_minutes),
+        id="rollup_compaction",
+        name="Compact analytics rollups",
+        replace_existing=True,
+    )
+
+    # Raw event retention - run once daily at 4 AM Pacific, after pool maintenance
+    _scheduler.add_job(
+        apply_rollup_retention,
+        CronTrigger(
+            hour=4,
+            minute=0,
+            timezone="America/Los_Angeles",
+        ),
+        id="rollup_retention",
+        name="Expire raw analytics rows",
+        replace_existing=True,
+    )
+
     # Daily admin summary - parse time from settings
     summary_hour, summary_minute = _parse_summary_time(settings.summary_time)
     _scheduler.add_job(
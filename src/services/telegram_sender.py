@@ -0,0 +1,378 @@
+"""
+Flood-control aware Telegram sender for AbaQuiz.
+
+All bulk sends (scheduled delivery, broadcast, bonus push, admin
+notifications) go through a single TelegramSender so they share one
+global messages-per-second budget, keep per-chat spacing, and back off
+together when Telegram answers with RetryAfter.
+"""
+
+import asyncio
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+from telegram.error import BadRequest, ChatMigrated, Forbidden, NetworkError, RetryAfter
+from telegram.warnings import PTBDeprecationWarning
+
+from src.config.logging import get_logger
+from src.config.settings import get_settings
+from src.database.repository import get_repository
+
+if TYPE_CHECKING:
+    from telegram import Bot, Message
+
+logger = get_logger(__name__)
+
+# Window used to compute recent throughput
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+class SendOutcome(Enum):
+    """Result classification for a send attempt."""
+
+    SENT = "sent"
+    PERMANENT_FAILURE = "permanent_failure"  # Blocked, deleted, bad request - don't retry
+    FAILED = "failed"  # Transient failure that exhausted its retries
+
+
+@dataclass
+class SendResult:
+    """Outcome of a single message send."""
+
+    chat_id: int
+    outcome: SendOutcome
+    message: Optional["Message"] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    unreachable_reason: Optional[str] = None  # Set when the chat can never be reached
+
+    @property
+    def ok(self) -> bool:
+        return self.outcome == SendOutcome.SENT
+
+    @property
+    def is_permanent(self) -> bool:
+        return self.outcome == SendOutcome.PERMANENT_FAILURE
+
+
+def classify_unreachable(error: Exception) -> Optional[str]:
+    """
+    Decide whether an error means the chat can never be reached again.
+
+    Returns:
+        Prune reason ('blocked', 'deactivated', 'chat_not_found', 'forbidden'),
+        or None if the error is specific to this message
+    """
+    text = str(error).lower()
+
+    if isinstance(error, Forbidden):
+        if "blocked" in text:
+            return "blocked"
+        if "deactivated" in text:
+            return "deactivated"
+        return "forbidden"
+
+    if isinstance(error, BadRequest) and "chat not found" in text:
+        return "chat_not_found"
+
+    return None
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    """Get the RetryAfter delay in seconds (int or timedelta depending on PTB config)."""
+    with warnings.catch_warnings():
+        # PTB warns that the int form is deprecated; both forms are handled here
+        warnings.simplefilter("ignore", PTBDeprecationWarning)
+        value = error.retry_after
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+class TelegramSender:
+    """
+    Paced message sender shared by all bulk delivery paths.
+
+    - Global budget: at most rate_per_second sends start per second
+    - Per-chat spacing: sends to the same chat are at least
+      per_chat_interval seconds apart
+    - Bulk sends take slots one at a time through a FIFO lane, so a large
+      wave never reserves slots far ahead; interactive sends skip the lane
+      and get the next free slot
+    - RetryAfter pauses the whole pool for the requested time, then retries;
+      it doesn't count against max_retries (only against max_flood_waits)
+    - Forbidden/BadRequest are permanent and never retried; chats that can
+      never be reached (blocked, deactivated) are passed to on_unreachable
+    - Network errors/timeouts are retried with retry_delays
+    """
+
+    def __init__(
+        self,
+        bot: "Bot",
+        rate_per_second: float = 25.0,
+        per_chat_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_delays: Optional[list[float]] = None,
+        on_unreachable: Optional[Callable[[int, str], Awaitable[Any]]] = None,
+        max_flood_waits: int = 20,
+    ) -> None:
+        self.bot = bot
+        self.on_unreachable = on_unreachable
+        self.rate_per_second = rate_per_second
+        self.per_chat_interval = per_chat_interval
+        self.max_retries = max(1, max_retries)
+        self.max_flood_waits = max_flood_waits
+        self.retry_delays = retry_delays if retry_delays is not None else [0, 5, 15]
+
+        self._lock = asyncio.Lock()
+        self._bulk_lane = asyncio.Lock()
+        self._next_slot = 0.0
+        self._chat_next: dict[int, float] = {}
+        self._paused_until = 0.0
+
+        # Stats
+        self._waiting = 0
+        self._in_flight = 0
+        self._sent = 0
+        self._permanent_failures = 0
+        self._unreachable = 0
+        self._failures = 0
+        self._retry_after_count = 0
+        self._recent_sends: deque[float] = deque()
+
+    # =========================================================================
+    # Pacing
+    # =========================================================================
+
+    def pause(self, seconds: float) -> None:
+        """Pause all sends for the given number of seconds."""
+        resume_at = time.monotonic() + seconds
+        if resume_at > self._paused_until:
+            self._paused_until = resume_at
+            logger.warning(f"Telegram flood control: pausing all sends for {seconds:.1f}s")
+
+    async def _acquire(self, chat_id: int, interactive: bool = False) -> None:
+        """Wait until a send to chat_id fits the global and per-chat budgets.
+
+        Bulk sends hold the bulk lane while waiting for their slot, so at most
+        one bulk slot is reserved ahead at any time. Interactive sends reserve
+        directly and go out after at most that one slot.
+        """
+        interval = 1.0 / self.rate_per_second if self.rate_per_second > 0 else 0.0
+
+        while True:
+            # Pauses and per-chat spacing are waited out without holding the lane
+            blocked_until = max(self._paused_until, self._chat_next.get(chat_id, 0.0))
+            if blocked_until > time.monotonic():
+                await asyncio.sleep(blocked_until - time.monotonic())
+                continue
+
+            if interactive:
+                slot = await self._reserve(chat_id, interval)
+            else:
+                async with self._bulk_lane:
+                    slot = await self._reserve(chat_id, interval)
+
+            # Reserved slot is only valid if no pause started while sleeping
+            if slot is not None and self._paused_until <= time.monotonic():
+                return
+
+    async def _reserve(self, chat_id: int, interval: float) -> Optional[float]:
+        """Reserve the next global slot for chat_id and sleep until it.
+
+        Returns:
+            The reserved slot time, or None if the chat or pool became blocked
+        """
+        async with self._lock:
+            now = time.monotonic()
+            if max(self._paused_until, self._chat_next.get(chat_id, 0.0)) > now:
+                return None
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+            self._chat_next[chat_id] = slot + self.per_chat_interval
+            self._prune_chats(now)
+
+        wait = slot - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return slot
+
+    def _prune_chats(self, now: float) -> None:
+        """Drop per-chat timestamps that can no longer delay anyone."""
+        if len(self._chat_next) > 10000:
+            self._chat_next = {
+                chat_id: ts for chat_id, ts in self._chat_next.items() if ts > now
+            }
+
+    # =========================================================================
+    # Sending
+    # =========================================================================
+
+    async def send_message(
+        self,
+        chat_id: int,
+        text: str,
+        interactive: bool = False,
+        **kwargs: Any,
+    ) -> SendResult:
+        """
+        Send a message, respecting flood limits and retrying transient errors.
+
+        Args:
+            chat_id: Telegram chat ID
+            text: Message text
+            interactive: Reply to a user action; skips ahead of queued bulk sends
+            **kwargs: Passed through to Bot.send_message (parse_mode, reply_markup, ...)
+
+        Returns:
+            SendResult describing the outcome (never raises for Telegram errors)
+        """
+        attempt = 0
+        flood_waits = 0
+        last_error: Optional[Exception] = None
+
+        while attempt < self.max_retries:
+            self._waiting += 1
+            try:
+                await self._acquire(chat_id, interactive=interactive)
+            finally:
+                self._waiting -= 1
+
+            self._in_flight += 1
+            try:
+                message = await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+            except RetryAfter as e:
+                # Flood control applies to the bot, not the chat: pause everyone
+                self._retry_after_count += 1
+                self.pause(_retry_after_seconds(e))
+                last_error = e
+                # Pool-wide pacing, not a failure of this send
+                flood_waits += 1
+                if flood_waits > self.max_flood_waits:
+                    break
+                continue
+            except (Forbidden, BadRequest, ChatMigrated) as e:
+                self._permanent_failures += 1
+                logger.info(f"Permanent send failure for {chat_id}: {e}")
+                reason = classify_unreachable(e)
+                if reason:
+                    await self._handle_unreachable(chat_id, reason)
+                return SendResult(
+                    chat_id=chat_id,
+                    outcome=SendOutcome.PERMANENT_FAILURE,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    unreachable_reason=reason,
+                )
+            except NetworkError as e:
+                last_error = e
+                delay = (
+                    self.retry_delays[attempt]
+                    if attempt < len(self.retry_delays)
+                    else self.retry_delays[-1] if self.retry_delays else 0
+                )
+                attempt += 1
+                logger.warning(f"Send attempt {attempt} failed for {chat_id}: {e}")
+                if attempt < self.max_retries and delay > 0:
+                    await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                last_error = e
+                logger.error(f"Unexpected send error for {chat_id}: {e}")
+                break
+            finally:
+                self._in_flight -= 1
+
+            self._sent += 1
+            self._record_send()
+            return SendResult(chat_id=chat_id, outcome=SendOutcome.SENT, message=message)
+
+        self._failures += 1
+        logger.error(f"All send attempts failed for {chat_id}: {last_error}")
+        return SendResult(
+            chat_id=chat_id,
+            outcome=SendOutcome.FAILED,
+            error=str(last_error) if last_error else None,
+            error_type=type(last_error).__name__ if last_error else None,
+        )
+
+    async def _handle_unreachable(self, chat_id: int, reason: str) -> None:
+        """Run the unreachable-chat hook (subscriber pruning)."""
+        self._unreachable += 1
+        if not self.on_unreachable:
+            return
+        try:
+            await self.on_unreachable(chat_id, reason)
+        except Exception as e:
+            logger.error(f"Failed to handle unreachable chat {chat_id}: {e}")
+
+    def _record_send(self) -> None:
+        now = time.monotonic()
+        self._recent_sends.append(now)
+        cutoff = now - THROUGHPUT_WINDOW_SECONDS
+        while self._recent_sends and self._recent_sends[0] < cutoff:
+            self._recent_sends.popleft()
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of sends currently waiting for a slot."""
+        return self._waiting
+
+    def throughput(self) -> float:
+        """Messages per second sent over the recent window."""
+        now = time.monotonic()
+        cutoff = now - THROUGHPUT_WINDOW_SECONDS
+        while self._recent_sends and self._recent_sends[0] < cutoff:
+            self._recent_sends.popleft()
+        return len(self._recent_sends) / THROUGHPUT_WINDOW_SECONDS
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get sender statistics."""
+        return {
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "sent": self._sent,
+            "permanent_failures": self._permanent_failures,
+            "unreachable": self._unreachable,
+            "failures": self._failures,
+            "retry_after_count": self._retry_after_count,
+            "paused_for_seconds": max(0.0, self._paused_until - time.monotonic()),
+            "throughput_per_second": round(self.throughput(), 2),
+        }
+
+
+async def prune_unreachable_subscriber(chat_id: int, reason: str) -> None:
+    """Unsubscribe a user whose chat can no longer be reached."""
+    settings = get_settings()
+    repo = await get_repository(settings.database_path)
+    if await repo.prune_unreachable_user(chat_id, reason):
+        logger.info(f"Pruned unreachable subscriber {chat_id} ({reason})")
+
+
+# Global sender instance
+_telegram_sender: Optional[TelegramSender] = None
+
+
+def get_telegram_sender(bot: "Bot") -> TelegramSender:
+    """Get or create the global Telegram sender for a bot."""
+    global _telegram_sender
+    if _telegram_sender is None or _telegram_sender.bot is not bot:
+        settings = get_settings()
+        _telegram_sender = TelegramSender(
+            bot,
+            rate_per_second=settings.send_rate_per_second,
+            per_chat_interval=settings.send_per_chat_interval_seconds,
+            max_retries=settings.max_retries,
+            retry_delays=settings.retry_delays,
+            on_unreachable=prune_unreachable_subscriber,
+        )
+    return _telegram_sender
@@ -3,19 +3,31 @@ Vector Store Manager for OpenAI File Search API.
 
 Manages the OpenAI vector store containing BCBA study content.
 Handles creation, file uploads, synchronization, and state persistence.
+
+Content files are split into retrieval-sized shards (see
+markdown_chunker.py) and the shards, not the whole files, are uploaded.
+Sync is incremental: files whose size and mtime match the state file are
+skipped without hashing, changed files are uploaded concurrently and then
+attached in one file batch. State is committed after every file, and a
+file uploaded but not yet attached is recorded as such, so an interrupted
+sync resumes by attaching it instead of uploading it again.
 """
 
+import asyncio
 import hashlib
 import json
+import os
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
-from openai import AsyncOpenAI
 
 from src.config.logging import get_logger
 from src.config.settings import get_settings
+from src.services.openai_client import create_openai_client
+from src.preprocessing.markdown_chunker import SHARD_CHUNK_TOKENS, write_shards
 
 logger = get_logger(__name__)
 
@@ -46,14 +58,21 @@ class VectorStoreManager:
 
     STORE_NAME = "abaquiz-bcba-content"
 
+    # Concurrent file uploads/deletes during sync
+    MAX_CONCURRENT_UPLOADS = 8
+
+    # How often to poll a file batch while the store processes it
+    BATCH_POLL_INTERVAL_MS = 1000
+
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.client = AsyncOpenAI(
+        self.client = create_openai_client(
             api_key=self.settings.openai_api_key,
             max_retries=3,
         )
         self.state_file = Path(__file__).parent.parent.parent / "data" / ".vector_store_state.json"
         self.content_dir = Path(__file__).parent.parent.parent / "data" / "processed"
+        self.shard_dir = Path(__file__).parent.parent.parent / "data" / "shards"
 
     def _load_state(self) -> dict[str, Any]:
         """Load state from file."""
@@ -63,10 +82,21 @@ class VectorStoreManager:
         return {}
 
     def _save_state(self, state: dict[str, Any]) -> None:
-        """Save state to file."""
+        """Save state to file (atomically, so an interrupted sync never corrupts it)."""
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, "w") as f:
-            json.dump(state, f, indent=2)
+        fd, tmp = tempfile.mkstemp(dir=self.state_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp, self.state_file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _build_shards(self) -> dict[str, Path]:
+        """Re-shard the content files and return the current shards by filename."""
+        write_shards(self.content_dir, self.shard_dir)
+        return {f.name: f for f in sorted(self.shard_dir.glob("*.md"))}
 
     def _compute_checksum(self, file_path: Path) -> str:
         """Compute SHA-256 checksum of a file."""
@@ -206,7 +236,8 @@ class VectorStoreManager:
         """Upload all .md files from directory to vector store.
 
         Args:
-            directory: Directory containing markdown files. Defaults to content_dir.
+            directory: Directory containing markdown files. Defaults to the shards
+                built from content_dir.
 
         Returns:
             List of uploaded file IDs.
@@ -220,59 +251,47 @@ class VectorStoreManager:
                 "No vector store configured. Run: python -m src.scripts.manage_vector_store create"
             )
 
-        content_dir = directory or self.content_dir
-        md_files = list(content_dir.glob("*.md"))
-
-        # Exclude index file
-        md_files = [f for f in md_files if f.name != "00_index.md"]
+        if directory:
+            md_files = [f for f in directory.glob("*.md") if f.name != "00_index.md"]
+        else:
+            md_files = list((await asyncio.to_thread(self._build_shards)).values())
 
         if not md_files:
-            logger.warning(f"No markdown files found in {content_dir}")
+            logger.warning(f"No markdown files found in {directory or self.content_dir}")
             return []
 
         state = self._load_state()
-        uploaded_ids = []
-
-        for file_path in md_files:
-            try:
-                # Upload file to OpenAI
-                with open(file_path, "rb") as f:
-                    file_obj = await self.client.files.create(
-                        file=f,
-                        purpose="assistants",
-                    )
-
-                # Attach to vector store
-                await self.client.vector_stores.files.create(
-                    vector_store_id=store_id,
-                    file_id=file_obj.id,
-                )
-
-                # Update state
-                checksum = self._compute_checksum(file_path)
-                state["files"][file_path.name] = {
-                    "file_id": file_obj.id,
-                    "uploaded_at": datetime.now(timezone.utc).isoformat(),
-                    "size_bytes": file_path.stat().st_size,
-                    "checksum": checksum,
-                }
-                uploaded_ids.append(file_obj.id)
+        state.setdefault("files", {})
+        result = SyncResult(added=[], removed=[], unchanged=[], errors=[])
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_UPLOADS)
 
-                logger.info(f"Uploaded: {file_path.name} -> {file_obj.id}")
+        checksums = await asyncio.gather(
+            *(asyncio.to_thread(self._compute_checksum, f) for f in md_files)
+        )
+        uploaded = await asyncio.gather(*(
+            self._upload_file(file_path, checksum, state, semaphore, result)
+            for file_path, checksum in zip(md_files, checksums)
+        ))
+        to_attach = {f.name: file_id for f, file_id in zip(md_files, uploaded) if file_id}
+        await self._attach_files(store_id, to_attach, state, semaphore, result)
 
-            except Exception as e:
-                logger.error(f"Failed to upload {file_path.name}: {e}")
+        for error in result.errors:
+            logger.error(f"Failed to upload {error}")
 
         state["last_sync"] = datetime.now(timezone.utc).isoformat()
         self._save_state(state)
 
+        uploaded_ids = [state["files"][name]["file_id"] for name in result.added]
         logger.info(f"Uploaded {len(uploaded_ids)} files to vector store {store_id}")
         return uploaded_ids
 
     async def sync(self) -> SyncResult:
         """Synchronize local files with vector store.
 
-        Detects new/changed files and uploads them. Removes files that no longer exist locally.
+        Re-shards the content files, uploads new/changed shards and removes shards
+        that no longer exist locally (including whole files tracked before sharding).
+        Files are only hashed if their size or mtime changed, uploads and deletes run
+        concurrently, and new uploads are attached to the store in one file batch.
 
         Returns:
             SyncResult with details of what changed.
@@ -284,107 +303,231 @@ class VectorStoreManager:
             )
 
         state = self._load_state()
-        tracked_files = state.get("files", {})
+        tracked_files = state.setdefault("files", {})
 
-        # Get current local files
-        local_files = {
-            f.name: f
-            for f in self.content_dir.glob("*.md")
-            if f.name != "00_index.md"
-        }
+        # Get current local shards
+        local_files = await asyncio.to_thread(self._build_shards)
 
         result = SyncResult(added=[], removed=[], unchanged=[], errors=[])
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_UPLOADS)
 
-        # Check for new or changed files
+        # Skip files whose size and mtime are unchanged without reading them
+        candidates: list[tuple[str, Path, os.stat_result]] = []
         for filename, file_path in local_files.items():
-            current_checksum = self._compute_checksum(file_path)
-
-            if filename not in tracked_files:
-                # New file
-                try:
-                    with open(file_path, "rb") as f:
-                        file_obj = await self.client.files.create(
-                            file=f,
-                            purpose="assistants",
-                        )
-                    await self.client.vector_stores.files.create(
-                        vector_store_id=store_id,
-                        file_id=file_obj.id,
-                    )
-                    tracked_files[filename] = {
-                        "file_id": file_obj.id,
-                        "uploaded_at": datetime.now(timezone.utc).isoformat(),
-                        "size_bytes": file_path.stat().st_size,
-                        "checksum": current_checksum,
-                    }
-                    result.added.append(filename)
-                    logger.info(f"Added: {filename}")
-                except Exception as e:
-                    result.errors.append(f"{filename}: {e}")
-                    logger.error(f"Failed to add {filename}: {e}")
-
-            elif tracked_files[filename]["checksum"] != current_checksum:
-                # File changed - delete old, upload new
-                try:
-                    old_file_id = tracked_files[filename]["file_id"]
-                    # Delete old file from vector store
-                    try:
-                        await self.client.vector_stores.files.delete(
-                            vector_store_id=store_id,
-                            file_id=old_file_id,
-                        )
-                        await self.client.files.delete(old_file_id)
-                    except Exception:
-                        pass  # Old file may already be gone
-
-                    # Upload new version
-                    with open(file_path, "rb") as f:
-                        file_obj = await self.client.files.create(
-                            file=f,
-                            purpose="assistants",
-                        )
-                    await self.client.vector_stores.files.create(
-                        vector_store_id=store_id,
-                        file_id=file_obj.id,
-                    )
-                    tracked_files[filename] = {
-                        "file_id": file_obj.id,
-                        "uploaded_at": datetime.now(timezone.utc).isoformat(),
-                        "size_bytes": file_path.stat().st_size,
-                        "checksum": current_checksum,
-                    }
-                    result.added.append(filename)
-                    logger.info(f"Updated: {filename}")
-                except Exception as e:
-                    result.errors.append(f"{filename}: {e}")
-                    logger.error(f"Failed to update {filename}: {e}")
-            else:
+            stat = file_path.stat()
+            tracked = tracked_files.get(filename)
+            if (
+                tracked
+                and tracked.get("status", "attached") == "attached"
+                and tracked.get("size_bytes") == stat.st_size
+                and tracked.get("mtime_ns") == stat.st_mtime_ns
+            ):
                 result.unchanged.append(filename)
+            else:
+                candidates.append((filename, file_path, stat))
+
+        checksums = await asyncio.gather(
+            *(asyncio.to_thread(self._compute_checksum, path) for _, path, _ in candidates)
+        )
+
+        # Check for new or changed files
+        to_upload: list[tuple[Path, str]] = []
+        to_attach: dict[str, str] = {}
+        for (filename, file_path, stat), checksum in zip(candidates, checksums):
+            tracked = tracked_files.get(filename)
+            if tracked and tracked.get("checksum") == checksum:
+                # Touched but identical; remember the mtime to skip hashing next time
+                tracked["size_bytes"] = stat.st_size
+                tracked["mtime_ns"] = stat.st_mtime_ns
+                if tracked.get("status") == "uploaded":
+                    to_attach[filename] = tracked["file_id"]  # Interrupted before attaching
+                else:
+                    result.unchanged.append(filename)
+            else:
+                to_upload.append((file_path, checksum))
+
+        uploaded = await asyncio.gather(*(
+            self._upload_file(file_path, checksum, state, semaphore, result)
+            for file_path, checksum in to_upload
+        ))
+        for (file_path, _), file_id in zip(to_upload, uploaded):
+            if file_id:
+                to_attach[file_path.name] = file_id
+
+        await self._attach_files(store_id, to_attach, state, semaphore, result)
 
         # Check for deleted files
-        for filename in list(tracked_files.keys()):
-            if filename not in local_files:
-                try:
-                    file_id = tracked_files[filename]["file_id"]
-                    await self.client.vector_stores.files.delete(
-                        vector_store_id=store_id,
-                        file_id=file_id,
-                    )
-                    await self.client.files.delete(file_id)
-                    del tracked_files[filename]
-                    result.removed.append(filename)
-                    logger.info(f"Removed: {filename}")
-                except Exception as e:
-                    result.errors.append(f"{filename}: {e}")
-                    logger.error(f"Failed to remove {filename}: {e}")
+        removed = [name for name in tracked_files if name not in local_files]
+        await asyncio.gather(
+            *(self._remove_file(store_id, name, state, semaphore, result) for name in removed)
+        )
+
+        for filename in result.added:
+            logger.info(f"Added: {filename}")
+        for filename in result.removed:
+            logger.info(f"Removed: {filename}")
+        for error in result.errors:
+            logger.error(f"Sync error: {error}")
 
         # Save updated state
-        state["files"] = tracked_files
         state["last_sync"] = datetime.now(timezone.utc).isoformat()
         self._save_state(state)
 
         return result
 
+    async def _upload_file(
+        self,
+        file_path: Path,
+        checksum: str,
+        state: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        result: SyncResult,
+    ) -> Optional[str]:
+        """Upload one file and commit it to state as uploaded (not yet attached).
+
+        Returns:
+            The new file ID, or None if the upload failed.
+        """
+        async with semaphore:
+            try:
+                stat = file_path.stat()
+                with open(file_path, "rb") as f:
+                    file_obj = await self.client.files.create(
+                        file=f,
+                        purpose="assistants",
+                    )
+            except Exception as e:
+                result.errors.append(f"{file_path.name}: {e}")
+                return None
+
+        # Versions to delete once the new one is attached
+        previous = state["files"].get(file_path.name)
+        replaces = []
+        if previous:
+            replaces = [*previous.get("replaces", []), previous["file_id"]]
+
+        state["files"][file_path.name] = {
+            "file_id": file_obj.id,
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+            "size_bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "checksum": checksum,
+            "status": "uploaded",
+            "replaces": replaces,
+        }
+        self._save_state(state)
+        logger.debug(f"Uploaded: {file_path.name} -> {file_obj.id}")
+        return file_obj.id
+
+    async def _attach_files(
+        self,
+        store_id: str,
+        to_attach: dict[str, str],
+        state: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        result: SyncResult,
+    ) -> None:
+        """Attach uploaded files in one batch, then delete the versions they replace.
+
+        Args:
+            store_id: Vector store ID
+            to_attach: Filename -> uploaded file ID
+            state: Sync state, committed once the batch finishes
+            semaphore: Limits concurrent deletes
+            result: Receives added filenames and errors
+        """
+        if not to_attach:
+            return
+
+        try:
+            batch = await self.client.vector_stores.file_batches.create_and_poll(
+                vector_store_id=store_id,
+                file_ids=list(to_attach.values()),
+                chunking_strategy={
+                    "type": "static",
+                    "static": {
+                        "max_chunk_size_tokens": SHARD_CHUNK_TOKENS,
+                        "chunk_overlap_tokens": 0,
+                    },
+                },
+                poll_interval_ms=self.BATCH_POLL_INTERVAL_MS,
+            )
+        except Exception as e:
+            # Files stay recorded as uploaded; the next sync attaches them
+            result.errors.extend(f"{name}: attach failed: {e}" for name in to_attach)
+            return
+
+        failed: dict[str, str] = {}
+        if batch.status != "completed" or batch.file_counts.completed < len(to_attach):
+            async for vs_file in self.client.vector_stores.file_batches.list_files(
+                batch.id, vector_store_id=store_id
+            ):
+                if vs_file.status != "completed":
+                    error = getattr(vs_file, "last_error", None)
+                    failed[vs_file.id] = error.message if error else vs_file.status
+
+        stale: list[str] = []
+        for filename, file_id in to_attach.items():
+            if file_id in failed:
+                result.errors.append(f"{filename}: attach failed: {failed[file_id]}")
+                continue
+            entry = state["files"][filename]
+            entry["status"] = "attached"
+            stale.extend(entry.pop("replaces", []))
+            result.added.append(filename)
+        self._save_state(state)
+
+        async def delete_stale(file_id: str) -> None:
+            async with semaphore:
+                await self._delete_remote_file(store_id, file_id, missing_ok=True)
+
+        await asyncio.gather(*(delete_stale(file_id) for file_id in stale))
+
+    async def _remove_file(
+        self,
+        store_id: str,
+        filename: str,
+        state: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        result: SyncResult,
+    ) -> None:
+        """Delete a file that no longer exists locally and commit its removal."""
+        entry = state["files"][filename]
+        # Uploaded by an interrupted sync but never attached to the store
+        attached = entry.get("status", "attached") == "attached"
+        async with semaphore:
+            try:
+                await self._delete_remote_file(store_id, entry["file_id"], attached=attached)
+            except Exception as e:
+                result.errors.append(f"{filename}: {e}")
+                return
+            for file_id in entry.get("replaces", []):
+                await self._delete_remote_file(store_id, file_id, missing_ok=True)
+
+        del state["files"][filename]
+        self._save_state(state)
+        result.removed.append(filename)
+
+    async def _delete_remote_file(
+        self,
+        store_id: str,
+        file_id: str,
+        missing_ok: bool = False,
+        attached: bool = True,
+    ) -> None:
+        """Detach a file from the vector store (if attached) and delete it."""
+        try:
+            if attached:
+                await self.client.vector_stores.files.delete(
+                    vector_store_id=store_id,
+                    file_id=file_id,
+                )
+            await self.client.files.delete(file_id)
+        except Exception:
+            if not missing_ok:
+                raise
+            # Old file may already be gone
+
     async def list_files(self) -> list[FileInfo]:
         """List all files tracked in the vector store.
 
@@ -423,6 +566,7 @@ class VectorStoreManager:
             "linked_at": state.get("linked_at"),
             "last_sync": state.get("last_sync"),
             "local_file_count": len(list(self.content_dir.glob("*.md"))) - 1,  # Exclude index
+            "local_shard_count": len(list(self.shard_dir.glob("*.md"))),
             "tracked_file_count": len(state.get("files", {})),
         }
 
@@ -14,6 +14,8 @@ from src.config.logging import get_logger
 from src.config.settings import get_settings
 from src.database.repository import get_repository
 from src.services.pool_manager import get_pool_manager, BCBA_WEIGHTS
+from src.web.progress_events import ProgressBroadcaster, stream_progress
+from src.web.response_cache import cached_response, get_response_cache
 
 logger = get_logger(__name__)
 
@@ -26,6 +28,21 @@ _generation_state: dict[str, Any] = {
     "cancel_requested": False,
 }
 
+# Progress deltas pushed to every open generation page over SSE
+_progress_events = ProgressBroadcaster()
+
+PROGRESS_TOTAL_KEYS = ("generated", "duplicates", "errors", "cost")
+
+
+def _publish_area(area_info: dict[str, Any]) -> None:
+    """Publish one content area's status/done change."""
+    _progress_events.publish("area", dict(area_info))
+
+
+def _publish_totals(progress: dict[str, Any]) -> None:
+    """Publish the overall counters."""
+    _progress_events.publish("totals", {key: progress[key] for key in PROGRESS_TOTAL_KEYS})
+
 
 def _get_admin_users() -> list[int]:
     """Get list of admin user IDs from config."""
@@ -71,6 +88,12 @@ async def api_pool_stats(request: web.Request) -> web.Response:
     if not await _check_admin(request):
         raise web.HTTPForbidden(text="Admin access required")
 
+    return await _pool_stats_response(request)
+
+
+@cached_response("pool_stats", default_ttl=60)
+async def _pool_stats_response(request: web.Request) -> web.Response:
+    """Pool statistics JSON (cached; computing unseen averages is expensive)."""
     settings = get_settings()
     repo = await get_repository(settings.database_path)
     pool_stats = await _get_pool_stats(repo, settings)
@@ -228,6 +251,7 @@ async def api_start_generation(request: web.Request) -> web.Response:
         "skip_dedup": skip_dedup,
         "difficulty_min": difficulty_min,
     }
+    _progress_events.publish("started", _progress_snapshot())
 
     # Start background task
     app = request.app
@@ -306,6 +330,7 @@ async def _run_generation(
         for area_info in progress["areas"]:
             if area_info["name"] == area_name:
                 area_info["status"] = "generating"
+                _publish_area(area_info)
                 break
 
         try:
@@ -350,12 +375,14 @@ async def _run_generation(
                 if area_info["name"] == area_name:
                     area_info["done"] = stored_count
                     area_info["status"] = "complete"
+                    _publish_area(area_info)
                     break
 
             # Update overall progress counters so the progress bar updates in real-time
             progress["generated"] += result["generated"]
             progress["duplicates"] += result["duplicates"]
             progress["cost"] += result["cost"]
+            _publish_totals(progress)
 
         except Exception as e:
             logger.error(f"Generation failed for {area_name}: {e}", exc_info=True)
@@ -364,6 +391,7 @@ async def _run_generation(
                 if area_info["name"] == area_name:
                     area_info["status"] = "error"
                     area_info["error"] = str(e)
+                    _publish_area(area_info)
                     break
 
         return result
@@ -385,6 +413,7 @@ async def _run_generation(
                 progress["errors"] += 1
             elif isinstance(result, dict) and result.get("error"):
                 progress["errors"] += 1
+        _publish_totals(progress)
 
     except asyncio.CancelledError:
         logger.info("Generation task was cancelled")
@@ -395,20 +424,24 @@ async def _run_generation(
         progress["finished_at"] = datetime.now(timezone.utc).isoformat()
         _generation_state["running"] = False
         _generation_state["task"] = None
+        get_response_cache().clear()  # New questions change pool stats and listings
+        _progress_events.publish("complete", {
+            "complete": True,
+            "cancelled": progress.get("cancelled", False),
+            "finished_at": progress["finished_at"],
+        })
 
 
-async def api_get_progress(request: web.Request) -> web.Response:
-    """API endpoint to get current generation progress."""
-    if not await _check_admin(request):
-        raise web.HTTPForbidden(text="Admin access required")
-
+def _progress_snapshot() -> dict[str, Any]:
+    """Build the full progress state, including running flag and elapsed time."""
     if not _generation_state["progress"]:
-        return web.json_response({
+        return {
             "running": False,
             "progress": None,
-        })
+        }
 
     progress = _generation_state["progress"].copy()
+    progress["areas"] = [dict(area_info) for area_info in progress["areas"]]
     progress["running"] = _generation_state["running"]
 
     # Calculate elapsed time
@@ -421,34 +454,29 @@ async def api_get_progress(request: web.Request) -> web.Response:
             elapsed = (datetime.now(timezone.utc) - started).total_seconds()
         progress["elapsed_seconds"] = int(elapsed)
 
-    return web.json_response(progress)
+    return progress
 
 
-@aiohttp_jinja2.template("partials/generation_progress.html")
-async def generation_progress_partial(request: web.Request) -> dict:
-    """HTMX partial for progress updates."""
+async def api_get_progress(request: web.Request) -> web.Response:
+    """API endpoint to get current generation progress."""
     if not await _check_admin(request):
         raise web.HTTPForbidden(text="Admin access required")
 
-    progress = _generation_state["progress"]
-    running = _generation_state["running"]
+    return web.json_response(_progress_snapshot())
 
-    if progress and progress.get("started_at"):
-        started = datetime.fromisoformat(progress["started_at"])
-        if progress.get("finished_at"):
-            finished = datetime.fromisoformat(progress["finished_at"])
-            elapsed = (finished - started).total_seconds()
-        else:
-            elapsed = (datetime.now(timezone.utc) - started).total_seconds()
-        elapsed_seconds = int(elapsed)
-    else:
-        elapsed_seconds = 0
 
-    return {
-        "progress": progress,
-        "running": running,
-        "elapsed_seconds": elapsed_seconds,
-    }
+async def api_progress_stream(request: web.Request) -> web.StreamResponse:
+    """
+    SSE endpoint pushing generation progress deltas.
+
+    Sends a snapshot on connect, then started/area/totals/complete events
+    as generation updates them. Reconnects with Last-Event-ID replay the
+    missed events.
+    """
+    if not await _check_admin(request):
+        raise web.HTTPForbidden(text="Admin access required")
+
+    return await stream_progress(request, _progress_events, _progress_snapshot)
 
 
 async def api_cancel_generation(request: web.Request) -> web.Response:
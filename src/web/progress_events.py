@@ -0,0 +1,149 @@
+"""
+Server-sent event stream for generation progress in AbaQuiz Admin GUI.
+
+Progress changes are published once as small delta events; every open
+admin tab streams them from a shared, bounded history. Nothing is
+rendered or recomputed per tab, and idle streams only send heartbeats.
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+# Seconds between heartbeat comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# Milliseconds the browser waits before reconnecting
+RETRY_MS = 3000
+
+
+@dataclass
+class ProgressEvent:
+    """A published progress event."""
+
+    id: int
+    event: str
+    data: dict[str, Any]
+
+    def encode(self) -> bytes:
+        return (
+            f"id: {self.id}\nevent: {self.event}\ndata: {json.dumps(self.data)}\n\n"
+        ).encode()
+
+
+class ProgressBroadcaster:
+    """
+    Fan-out of progress events to any number of SSE subscribers.
+
+    Publishing appends to a bounded history and wakes all waiting
+    subscribers at once. Subscribers that reconnect with Last-Event-ID
+    are replayed the events they missed, or get a fresh snapshot if
+    those events have aged out of the history.
+    """
+
+    def __init__(self, history: int = 256) -> None:
+        self._events: deque[ProgressEvent] = deque(maxlen=history)
+        self._last_id = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, event: str, data: dict[str, Any]) -> int:
+        """
+        Publish an event to all subscribers.
+
+        Returns:
+            The event ID
+        """
+        self._last_id += 1
+        self._events.append(ProgressEvent(self._last_id, event, data))
+
+        # Wake everyone waiting on the current event; later waiters get a new one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return self._last_id
+
+    def events_since(self, last_id: int) -> Optional[list[ProgressEvent]]:
+        """
+        Get events published after last_id.
+
+        Returns:
+            Missed events, or None if some were dropped from the history
+            (or last_id is from a previous server run) and the caller
+            needs a snapshot instead
+        """
+        if last_id == self._last_id:
+            return []
+        if last_id > self._last_id:
+            return None
+        if not self._events or self._events[0].id > last_id + 1:
+            return None
+        return [event for event in self._events if event.id > last_id]
+
+    async def wait(self, last_id: int, timeout: float) -> Optional[list[ProgressEvent]]:
+        """
+        Wait for events after last_id, up to timeout seconds.
+
+        Returns:
+            As events_since; an empty list on timeout
+        """
+        if last_id == self._last_id:
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self.events_since(last_id)
+
+
+async def stream_progress(
+    request: web.Request,
+    broadcaster: ProgressBroadcaster,
+    snapshot: Callable[[], dict[str, Any]],
+) -> web.StreamResponse:
+    """
+    Serve a broadcaster as a text/event-stream response.
+
+    Args:
+        request: Incoming request (Last-Event-ID honored for reconnects)
+        broadcaster: Event source
+        snapshot: Builds the full current state for new or stale clients
+    """
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+
+    try:
+        last_id = int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        last_id = -1
+
+    try:
+        await response.write(f"retry: {RETRY_MS}\n\n".encode())
+        events = broadcaster.events_since(last_id) if last_id >= 0 else None
+
+        while True:
+            if events is None:
+                last_id = broadcaster.last_id
+                await response.write(ProgressEvent(last_id, "snapshot", snapshot()).encode())
+            elif events:
+                for event in events:
+                    await response.write(event.encode())
+                last_id = events[-1].id
+            else:
+                await response.write(b": ping\n\n")
+
+            events = await broadcaster.wait(last_id, HEARTBEAT_SECONDS)
+    except ConnectionResetError:
+        pass
+
+    return response
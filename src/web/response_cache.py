@@ -0,0 +1,207 @@
+"""
+Response cache for AbaQuiz Admin GUI read endpoints.
+
+Rendered responses are kept per route and query string. Within a route's
+TTL they are served from memory without touching the database. After that,
+routes that declare the tables they read are revalidated against those
+tables' write versions and re-rendered only if one of them was written;
+routes without tables (dashboards that may be slightly stale) are simply
+re-rendered. Cached responses carry an ETag, so browsers revalidating an
+unchanged page get a 304, and a precompressed gzip body.
+"""
+
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Awaitable, Callable, Optional
+
+from aiohttp import web
+
+from src.config.settings import get_settings
+from src.database.repository import get_repository
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+COMPRESSIBLE_TYPES = ("text/html", "application/json")
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response and the data version it was rendered at."""
+
+    body: bytes
+    content_type: str
+    charset: Optional[str]
+    etag: str
+    version: str
+    checked_at: float
+    gzip_body: Optional[bytes] = None
+
+
+class ResponseCache:
+    """LRU map of (route, path and query) to rendered responses."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.renders = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, str]) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[str, str], entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries (after writes made through the web admin)."""
+        self._entries.clear()
+
+
+# Global cache instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def _cache_entry(response: web.Response, version: str, now: float) -> CachedResponse:
+    body = bytes(response.body)
+    gzip_body = None
+    if len(body) >= GZIP_MIN_BYTES and response.content_type in COMPRESSIBLE_TYPES:
+        gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+    return CachedResponse(
+        body=body,
+        content_type=response.content_type,
+        charset=response.charset,
+        etag=f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"',
+        version=version,
+        checked_at=now,
+        gzip_body=gzip_body,
+    )
+
+
+def _respond(request: web.Request, entry: CachedResponse) -> web.Response:
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "no-cache",  # Always revalidate; unchanged pages get a 304
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("If-None-Match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if entry.etag in tags or "*" in tags:
+        return web.Response(status=304, headers=headers)
+
+    body = entry.body
+    if entry.gzip_body is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = entry.gzip_body
+
+    return web.Response(
+        body=body,
+        content_type=entry.content_type,
+        charset=entry.charset,
+        headers=headers,
+    )
+
+
+def cached_response(
+    route: str,
+    default_ttl: float,
+    tables: tuple[str, ...] = (),
+) -> Callable[[Handler], Handler]:
+    """
+    Cache a GET handler's rendered response.
+
+    Args:
+        route: Cache name, also the key for a TTL override in
+            web.cache_ttl_seconds
+        default_ttl: Seconds an entry is served without revalidating;
+            0 disables caching for the route
+        tables: Tables the handler reads. After the TTL the entry is kept
+            if none of them was written; with no tables it is re-rendered.
+    """
+    def decorator(handler: Handler) -> Handler:
+        @wraps(handler)
+        async def wrapper(request: web.Request) -> web.StreamResponse:
+            settings = get_settings()
+            ttl = settings.web_cache_ttl_seconds.get(route, default_ttl)
+            if ttl <= 0 or request.method != "GET":
+                return await handler(request)
+
+            cache = get_response_cache()
+            key = (route, request.path_qs)
+            now = cache.clock()
+            entry = cache.get(key)
+
+            if entry is None or now - entry.checked_at >= ttl:
+                version = ""
+                if tables:
+                    repo = await get_repository(settings.database_path)
+                    version = await repo.get_table_versions(tables)
+
+                if entry is not None and tables and entry.version == version:
+                    entry.checked_at = now
+                else:
+                    response = await handler(request)
+                    if not isinstance(response, web.Response) or response.status != 200:
+                        return response
+                    if not isinstance(response.body, (bytes, bytearray)):
+                        return response
+
+                    entry = _cache_entry(response, version, now)
+                    cache.put(key, entry)
+                    cache.renders += 1
+                    return _respond(request, entry)
+
+            cache.hits += 1
+            return _respond(request, entry)
+
+        return wrapper
+
+    return decorator
+
+
+@web.middleware
+async def compression_middleware(
+    request: web.Request, handler: Handler
+) -> web.StreamResponse:
+    """Gzip uncached HTML/JSON responses for clients that accept it."""
+    response = await handler(request)
+    if (
+        isinstance(response, web.Response)
+        and not response.prepared
+        and "Content-Encoding" not in response.headers
+        and response.content_type in COMPRESSIBLE_TYPES
+        and isinstance(response.body, (bytes, bytearray))
+        and len(response.body) >= GZIP_MIN_BYTES
+    ):
+        response.enable_compression()
+    return response
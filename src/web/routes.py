@@ -2,13 +2,33 @@
 Route handlers for AbaQuiz Admin GUI.
 """
 
+import base64
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator
+
 from aiohttp import web
 import aiohttp_jinja2
+from markupsafe import Markup, escape
 
 from src.config.settings import get_settings
 from src.database.repository import get_repository
+from src.web.response_cache import cached_response, get_response_cache
+
+
+def _highlight_snippets(rows: list[dict[str, Any]]) -> None:
+    """Turn full-text search snippet markers into escaped HTML with <mark> tags."""
+    for row in rows:
+        snippet = row.get("snippet")
+        if snippet:
+            html = str(escape(snippet)).replace("\x02", "<mark>").replace("\x03", "</mark>")
+            row["snippet_html"] = Markup(html)
 
 
+@cached_response("dashboard", default_ttl=30)
 @aiohttp_jinja2.template("index.html")
 async def index(request: web.Request) -> dict:
     """Home page with dashboard overview."""
@@ -44,11 +64,14 @@ async def table_browse(request: web.Request) -> dict:
     search = request.query.get("search", "").strip() or None
     sort_col = request.query.get("sort")
     sort_dir = request.query.get("dir", "asc")
+    after = request.query.get("after") or None
+    before = request.query.get("before") or None
 
     try:
         schema = await repo.get_table_schema(table_name)
         data = await repo.browse_table(
-            table_name, page, 25, search, sort_col, sort_dir
+            table_name, page, 25, search, sort_col, sort_dir,
+            after=after, before=before,
         )
     except ValueError as e:
         raise web.HTTPNotFound(text=str(e))
@@ -74,10 +97,13 @@ async def table_rows(request: web.Request) -> dict:
     search = request.query.get("search", "").strip() or None
     sort_col = request.query.get("sort")
     sort_dir = request.query.get("dir", "asc")
+    after = request.query.get("after") or None
+    before = request.query.get("before") or None
 
     try:
         data = await repo.browse_table(
-            table_name, page, 25, search, sort_col, sort_dir
+            table_name, page, 25, search, sort_col, sort_dir,
+            after=after, before=before,
         )
     except ValueError as e:
         raise web.HTTPNotFound(text=str(e))
@@ -116,6 +142,7 @@ async def record_detail(request: web.Request) -> dict:
     }
 
 
+@cached_response("questions", default_ttl=15, tables=("questions",))
 @aiohttp_jinja2.template("questions.html")
 async def questions_list(request: web.Request) -> dict:
     """Browse questions with card-based UI."""
@@ -127,6 +154,8 @@ async def questions_list(request: web.Request) -> dict:
     content_area = request.query.get("content_area", "").strip() or None
     difficulty = request.query.get("difficulty", "").strip()
     search = request.query.get("search", "").strip() or None
+    after = request.query.get("after") or None
+    before = request.query.get("before") or None
 
     # Parse difficulty filter
     difficulty_min = None
@@ -145,7 +174,10 @@ async def questions_list(request: web.Request) -> dict:
         difficulty_min=difficulty_min,
         difficulty_max=difficulty_max,
         search=search,
+        after=after,
+        before=before,
     )
+    _highlight_snippets(data["rows"])
 
     return {
         "search": search or "",
@@ -155,6 +187,7 @@ async def questions_list(request: web.Request) -> dict:
     }
 
 
+@cached_response("questions", default_ttl=15, tables=("questions",))
 @aiohttp_jinja2.template("partials/question_cards.html")
 async def questions_cards(request: web.Request) -> dict:
     """HTMX partial: just the question cards and pagination."""
@@ -165,6 +198,8 @@ async def questions_cards(request: web.Request) -> dict:
     content_area = request.query.get("content_area", "").strip() or None
     difficulty = request.query.get("difficulty", "").strip()
     search = request.query.get("search", "").strip() or None
+    after = request.query.get("after") or None
+    before = request.query.get("before") or None
 
     # Parse difficulty filter
     difficulty_min = None
@@ -183,7 +218,10 @@ async def questions_cards(request: web.Request) -> dict:
         difficulty_min=difficulty_min,
         difficulty_max=difficulty_max,
         search=search,
+        after=after,
+        before=before,
     )
+    _highlight_snippets(data["rows"])
 
     return {
         "search": search or "",
@@ -198,6 +236,11 @@ async def questions_cards(request: web.Request) -> dict:
 # =============================================================================
 
 
+@cached_response(
+    "review",
+    default_ttl=10,
+    tables=("questions", "question_stats", "question_reports", "question_reviews"),
+)
 @aiohttp_jinja2.template("review.html")
 async def review_page(request: web.Request) -> dict:
     """Expert review page for grading questions."""
@@ -320,6 +363,8 @@ async def submit_review(request: web.Request) -> web.Response:
         notes=notes,
         difficulty=diff,
     )
+    # Cached review/question pages would otherwise show the old queue until their TTL
+    get_response_cache().clear()
 
     # Return HTMX-compatible redirect or partial reload
     if request.headers.get("HX-Request"):
@@ -341,3 +386,147 @@ async def submit_review(request: web.Request) -> web.Response:
     else:
         # Regular redirect
         raise web.HTTPFound("/review")
+
+
+# =============================================================================
+# Export Routes
+# =============================================================================
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+# Bytes of encoded output buffered before each chunk is written
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values json can't: BLOBs as base64, anything else as text."""
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a column value into a single CSV cell."""
+    if isinstance(value, bytes):
+        return _json_default(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+async def _stream_export(
+    request: web.Request,
+    rows: AsyncIterator[dict[str, Any]],
+    name: str,
+    columns: list[str],
+) -> web.StreamResponse:
+    """
+    Stream rows as a CSV or JSONL download with chunked transfer.
+
+    Rows are encoded as they arrive from the repository and flushed every
+    EXPORT_CHUNK_BYTES, so memory stays flat regardless of table size.
+    With ?gzip=1 the body is a .gz file compressed on the fly.
+    """
+    fmt = request.query.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        raise web.HTTPBadRequest(text=f"Unknown export format: {fmt}")
+    use_gzip = request.query.get("gzip", "").lower() in ("1", "true", "yes")
+
+    filename = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    response = web.StreamResponse()
+    if use_gzip:
+        filename += ".gz"
+        response.content_type = "application/gzip"
+    else:
+        response.headers["Content-Type"] = EXPORT_FORMATS[fmt]
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    compressor = zlib.compressobj(wbits=31) if use_gzip else None
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    if fmt == "csv":
+        writer.writeheader()
+
+    async def write(data: str) -> None:
+        encoded = data.encode("utf-8")
+        if compressor:
+            encoded = compressor.compress(encoded)
+        if encoded:
+            await response.write(encoded)
+
+    async for row in rows:
+        if fmt == "csv":
+            writer.writerow({column: _csv_value(row.get(column)) for column in columns})
+        else:
+            values = {column: row.get(column) for column in columns}
+            buffer.write(json.dumps(values, default=_json_default) + "\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            await write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+
+    await write(buffer.getvalue())
+    if compressor:
+        await response.write(compressor.flush())
+    await response.write_eof()
+    return response
+
+
+async def table_export(request: web.Request) -> web.StreamResponse:
+    """Export a table (optionally searched) as CSV or JSONL."""
+    table_name = request.match_info["name"]
+    settings = get_settings()
+    repo = await get_repository(settings.database_path)
+
+    search = request.query.get("search", "").strip() or None
+
+    try:
+        schema = await repo.get_table_schema(table_name)
+    except ValueError as e:
+        raise web.HTTPNotFound(text=str(e))
+
+    return await _stream_export(
+        request,
+        repo.iter_rows(table_name, search=search),
+        table_name,
+        [c["name"] for c in schema],
+    )
+
+
+async def questions_export(request: web.Request) -> web.StreamResponse:
+    """Export the filtered question set as CSV or JSONL."""
+    settings = get_settings()
+    repo = await get_repository(settings.database_path)
+
+    content_area = request.query.get("content_area", "").strip() or None
+    difficulty = request.query.get("difficulty", "").strip()
+    search = request.query.get("search", "").strip() or None
+
+    # Parse difficulty filter
+    difficulty_min = None
+    difficulty_max = None
+    if difficulty == "easy":
+        difficulty_min, difficulty_max = 1, 2
+    elif difficulty == "medium":
+        difficulty_min = difficulty_max = 3
+    elif difficulty == "hard":
+        difficulty_min, difficulty_max = 4, 5
+
+    schema = await repo.get_table_schema("questions")
+    return await _stream_export(
+        request,
+        repo.iter_questions(
+            content_area=content_area,
+            difficulty_min=difficulty_min,
+            difficulty_max=difficulty_max,
+            search=search,
+        ),
+        "questions",
+        [c["name"] for c in schema],
+    )
@@ -21,7 +21,9 @@ async def request_processor(request: web.Request) -> dict:
 
 def create_app() -> web.Application:
     """Create and configure the web application."""
-    app = web.Application()
+    from src.web.response_cache import compression_middleware
+
+    app = web.Application(middlewares=[compression_middleware])
 
     # Setup Jinja2 templating with request context processor
     aiohttp_jinja2.setup(
@@ -52,15 +54,17 @@ def setup_routes(app: web.Application) -> None:
         review_page,
         review_question_partial,
         submit_review,
+        table_export,
+        questions_export,
     )
     from src.web.generation_routes import (
         generation_page,
-        generation_progress_partial,
         api_pool_stats,
         api_get_config,
         api_save_config,
         api_start_generation,
         api_get_progress,
+        api_progress_stream,
         api_cancel_generation,
         api_calculate_distribution,
     )
@@ -69,21 +73,23 @@ def setup_routes(app: web.Application) -> None:
     app.router.add_get("/tables", tables_list)
     app.router.add_get("/tables/{name}", table_browse)
     app.router.add_get("/tables/{name}/rows", table_rows)  # HTMX partial
+    app.router.add_get("/tables/{name}/export", table_export)
     app.router.add_get("/tables/{name}/{id}", record_detail)
     app.router.add_get("/questions", questions_list)
     app.router.add_get("/questions/cards", questions_cards)  # HTMX partial
+    app.router.add_get("/questions/export", questions_export)
     # Review routes
     app.router.add_get("/review", review_page)
     app.router.add_get("/review/question", review_question_partial)  # HTMX partial
     app.router.add_post("/review/submit", submit_review)
     # Generation routes
     app.router.add_get("/generation", generation_page)
-    app.router.add_get("/generation/progress", generation_progress_partial)  # HTMX partial
     # Generation API routes
     app.router.add_get("/api/generation/pool-stats", api_pool_stats)
     app.router.add_get("/api/generation/config", api_get_config)
     app.router.add_post("/api/generation/config", api_save_config)
     app.router.add_post("/api/generation/start", api_start_generation)
     app.router.add_get("/api/generation/progress", api_get_progress)
+    app.router.add_get("/api/generation/progress/stream", api_progress_stream)  # SSE
     app.router.add_post("/api/generation/cancel", api_cancel_generation)
     app.router.add_get("/api/generation/distribution", api_calculate_distribution)
@@ -26,7 +26,10 @@ function generationControls() {
         isRunning: false,
         isStarting: false,
         progress: null,
-        pollingInterval: null,
+        eventSource: null,
+        clockInterval: null,
+        clockSkew: 0,
+        now: Date.now(),
 
         // Configuration
         config: {
@@ -48,16 +51,10 @@ function generationControls() {
             this.loadConfig();
             this.updateDistribution();
 
-            // Check for running generation
-            this.checkProgress();
+            // Subscribe to progress (also picks up runs started in other tabs)
+            this.connectProgress();
 
             // Listen for custom events
-            window.addEventListener('generation-cancelled', () => {
-                this.isRunning = false;
-                this.stopPolling();
-                this.loadPoolStats();
-            });
-
             window.addEventListener('generation-reset', () => {
                 this.progress = null;
                 this.isRunning = false;
@@ -164,8 +161,8 @@ function generationControls() {
                 const data = await response.json();
 
                 if (response.ok) {
+                    // Progress arrives on the event stream as a 'started' event
                     this.isRunning = true;
-                    this.startPolling();
                 } else {
                     alert('Failed to start: ' + (data.error || 'Unknown error'));
                 }
@@ -177,60 +174,95 @@ function generationControls() {
             }
         },
 
-        async checkProgress() {
-            try {
-                const response = await fetch('/api/generation/progress');
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data.running) {
-                        this.isRunning = true;
-                        this.progress = data;
-                        this.startPolling();
-                    } else if (data.progress && data.progress.complete) {
-                        this.progress = data.progress;
-                    }
-                }
-            } catch (error) {
-                console.error('Failed to check progress:', error);
-            }
+        connectProgress() {
+            if (this.eventSource) return;
+
+            // One stream per tab: the server pushes deltas as generation
+            // updates them, and EventSource reconnects on its own, sending
+            // Last-Event-ID so missed events are replayed.
+            const source = new EventSource('/api/generation/progress/stream');
+            const on = (name, handler) => {
+                source.addEventListener(name, (event) => handler(JSON.parse(event.data)));
+            };
+
+            on('snapshot', (data) => this.setProgress(data));
+            on('started', (data) => this.setProgress(data));
+            on('area', (data) => {
+                const area = this.progress && this.progress.areas.find(a => a.name === data.name);
+                if (area) Object.assign(area, data);
+            });
+            on('totals', (data) => {
+                if (this.progress) Object.assign(this.progress, data);
+            });
+            on('complete', (data) => {
+                if (this.progress) Object.assign(this.progress, data, { running: false });
+                this.isRunning = false;
+                this.stopClock();
+                this.loadPoolStats();
+            });
+
+            this.eventSource = source;
         },
 
-        startPolling() {
-            if (this.pollingInterval) return;
+        setProgress(data) {
+            this.isRunning = data.running;
+            this.progress = data.started_at ? data : null;
 
-            this.pollingInterval = setInterval(async () => {
-                try {
-                    const response = await fetch('/api/generation/progress');
-                    if (response.ok) {
-                        const data = await response.json();
-                        this.progress = data;
+            if (this.progress) {
+                // Elapsed time ticks locally; align with the server's clock once
+                const started = Date.parse(data.started_at);
+                this.clockSkew = Date.now() - started - (data.elapsed_seconds || 0) * 1000;
+            }
 
-                        if (!data.running) {
-                            this.isRunning = false;
-                            this.stopPolling();
-                            this.loadPoolStats();
-                        }
-                    }
-                } catch (error) {
-                    console.error('Polling error:', error);
-                }
-            }, 1000);
+            if (this.isRunning) {
+                this.startClock();
+            } else {
+                this.stopClock();
+            }
         },
 
-        stopPolling() {
-            if (this.pollingInterval) {
-                clearInterval(this.pollingInterval);
-                this.pollingInterval = null;
+        startClock() {
+            if (this.clockInterval) return;
+            this.now = Date.now();
+            this.clockInterval = setInterval(() => { this.now = Date.now(); }, 1000);
+        },
+
+        stopClock() {
+            if (this.clockInterval) {
+                clearInterval(this.clockInterval);
+                this.clockInterval = null;
             }
         },
 
+        elapsedSeconds() {
+            if (!this.progress || !this.progress.started_at) return 0;
+            const started = Date.parse(this.progress.started_at);
+            const finished = this.progress.finished_at
+                ? Date.parse(this.progress.finished_at)
+                : this.now - this.clockSkew;
+            return Math.max(0, Math.floor((finished - started) / 1000));
+        },
+
+        percent(done, total) {
+            return total > 0 ? Math.min(100, Math.floor(done / total * 100)) : 0;
+        },
+
+        areaStatusColor(status) {
+            const colors = {
+                complete: 'var(--color-success)',
+                generating: 'var(--color-warning)',
+                error: 'var(--color-error)'
+            };
+            return colors[status] || 'var(--color-text-muted)';
+        },
+
         async cancelGeneration() {
             try {
                 const response = await fetch('/api/generation/cancel', {
                     method: 'POST'
                 });
                 if (response.ok) {
-                    // Will be updated by next poll
+                    // Completion arrives on the progress stream
                 } else {
                     const data = await response.json();
                     alert('Failed to cancel: ' + (data.error || 'Unknown error'));
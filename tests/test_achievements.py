@@ -0,0 +1,137 @@
+"""
+Tests for the incremental achievement engine.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.config.constants import AchievementType, ContentArea
+from src.gamification.achievements import AchievementEngine
+
+
+async def _create_question(repository, sample_question, content_area: str) -> int:
+    return await repository.create_question(
+        content=sample_question["content"],
+        question_type=sample_question["question_type"],
+        options=sample_question["options"],
+        correct_answer=sample_question["correct_answer"],
+        explanation=sample_question["explanation"],
+        content_area=content_area,
+    )
+
+
+async def _answer(repository, engine, user_id, question_id, area, is_correct, streak=1):
+    await repository.record_answer(
+        user_id=user_id,
+        question_id=question_id,
+        user_answer="B" if is_correct else "A",
+        is_correct=is_correct,
+    )
+    return await engine.record_answer(
+        user_id,
+        repository,
+        content_area=area,
+        is_correct=is_correct,
+        current_streak=streak,
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_answer_grants_first_steps(repository, sample_user_data, sample_question):
+    """Test that the first answer unlocks First Steps exactly once."""
+    engine = AchievementEngine()
+    user_id = await repository.create_user(telegram_id=sample_user_data["telegram_id"])
+    area = ContentArea.ETHICS.value
+
+    q1 = await _create_question(repository, sample_question, area)
+    q2 = await _create_question(repository, sample_question, area)
+
+    first = await _answer(repository, engine, user_id, q1, area, True)
+    assert first == AchievementType.FIRST_STEPS
+
+    second = await _answer(repository, engine, user_id, q2, area, True)
+    assert second is None
+    assert await repository.has_achievement(user_id, AchievementType.FIRST_STEPS)
+
+
+@pytest.mark.asyncio
+async def test_unlocked_achievements_skip_database(repository, sample_user_data, sample_question):
+    """Test that already-unlocked thresholds don't call grant_achievement again."""
+    engine = AchievementEngine()
+    user_id = await repository.create_user(telegram_id=sample_user_data["telegram_id"])
+    area = ContentArea.ETHICS.value
+    question_id = await _create_question(repository, sample_question, area)
+
+    await _answer(repository, engine, user_id, question_id, area, True, streak=7)
+    progress = engine.get_progress(user_id)
+    assert progress.has(AchievementType.FIRST_STEPS)
+    assert progress.has(AchievementType.WEEK_WARRIOR)
+
+    mock_repo = AsyncMock()
+    result = await engine.record_answer(
+        user_id,
+        mock_repo,
+        content_area=area,
+        is_correct=True,
+        current_streak=7,
+    )
+
+    assert result is None
+    mock_repo.grant_achievement.assert_not_called()
+    mock_repo.get_total_questions_answered.assert_not_called()
+    assert engine.get_progress(user_id).total_answered == 2
+
+
+@pytest.mark.asyncio
+async def test_content_mastery_threshold(repository, sample_user_data, sample_question):
+    """Test that area mastery unlocks when min answers and accuracy are reached."""
+    engine = AchievementEngine()
+    user_id = await repository.create_user(telegram_id=sample_user_data["telegram_id"])
+    area = ContentArea.EXPERIMENTAL_DESIGN.value
+
+    unlocked = []
+    for i in range(20):
+        question_id = await _create_question(repository, sample_question, area)
+        # 19/20 correct = 95% accuracy
+        result = await _answer(repository, engine, user_id, question_id, area, i != 0)
+        if result:
+            unlocked.append(result)
+
+    assert unlocked == [AchievementType.FIRST_STEPS, AchievementType.DESIGN_SPECIALIST]
+    assert engine.get_progress(user_id).has(AchievementType.DESIGN_SPECIALIST)
+
+
+@pytest.mark.asyncio
+async def test_state_loaded_from_database(repository, sample_user_data, sample_question):
+    """Test that a fresh engine picks up existing answers and achievements."""
+    user_id = await repository.create_user(telegram_id=sample_user_data["telegram_id"])
+    area = ContentArea.ETHICS.value
+
+    first_engine = AchievementEngine()
+    q1 = await _create_question(repository, sample_question, area)
+    await _answer(repository, first_engine, user_id, q1, area, True)
+
+    # Simulate a restart: new engine, no cached state
+    engine = AchievementEngine()
+    q2 = await _create_question(repository, sample_question, area)
+    result = await _answer(repository, engine, user_id, q2, area, True)
+
+    assert result is None
+    progress = engine.get_progress(user_id)
+    assert progress.total_answered == 2
+    assert progress.has(AchievementType.FIRST_STEPS)
+
+
+def test_progress_cache_is_bounded():
+    """Test that least recently active users are evicted."""
+    from src.gamification.achievements import UserProgress
+
+    engine = AchievementEngine(max_users=2)
+    engine._store(1, UserProgress())
+    engine._store(2, UserProgress())
+    engine._store(3, UserProgress())
+
+    assert engine.get_progress(1) is None
+    assert engine.get_progress(2) is not None
+    assert engine.get_progress(3) is not None
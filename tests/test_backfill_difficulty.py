@@ -0,0 +1,109 @@
+"""
+Tests for the concurrent, resumable difficulty backfill.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import src.scripts.backfill_difficulty as backfill
+from src.config.settings import get_settings
+from src.database.repository import Repository
+from src.services.openai_client import set_client_factory
+from src.services.openai_standin import RESPONSES, StandInOpenAI
+
+
+async def _add_questions(repo: Repository, sample_question: dict, count: int) -> list[int]:
+    return [
+        await repo.create_question(**{**sample_question, "content": f"Question {i}?"})
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def backfill_env(temp_db_path, tmp_path, monkeypatch):
+    """Point the backfill at the temp database, a temp checkpoint and the stand-in."""
+    monkeypatch.setattr(get_settings(), "database_path", temp_db_path)
+    monkeypatch.setattr(backfill, "CHECKPOINT_FILE", tmp_path / "progress.json")
+
+    async def fresh_repository(db_path):
+        repo = Repository(db_path)
+        await repo.connect()
+        return repo
+
+    monkeypatch.setattr(backfill, "get_repository", fresh_repository)
+    standin = StandInOpenAI(time_scale=0)
+    set_client_factory(standin.client)
+    yield standin
+    set_client_factory(None)
+
+
+@pytest.mark.asyncio
+async def test_keyset_paging_and_bulk_update(repository, sample_question):
+    """Test paging NULL-difficulty questions by id and rating them in bulk."""
+    ids = await _add_questions(repository, sample_question, 5)
+    await repository.bulk_update_difficulty([(ids[0], 2)])
+
+    page = await repository.get_questions_with_null_difficulty(limit=2, after_id=0)
+    assert [q["id"] for q in page] == ids[1:3]
+    page = await repository.get_questions_with_null_difficulty(limit=2, after_id=page[-1]["id"])
+    assert [q["id"] for q in page] == ids[3:5]
+    assert await repository.count_questions_with_null_difficulty(after_id=ids[2]) == 2
+
+    # Unknown ids are not counted as updated
+    updated = await repository.bulk_update_difficulty([(ids[1], 4), (ids[4], 5), (99999, 1)])
+    assert updated == 2
+    assert (await repository.get_question_by_id(ids[4]))["difficulty"] == 5
+    assert await repository.count_questions_with_null_difficulty() == 2
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_after_checkpoint(
+    backfill_env, repository, sample_question
+):
+    """Test that a run resumes after the checkpointed id and clears it when done."""
+    ids = await _add_questions(repository, sample_question, 7)
+    backfill.save_checkpoint({"last_id": ids[2], "updated": 3, "failed": 0})
+
+    result = await backfill.backfill_difficulty(batch_size=2, concurrency=3, confirm=False)
+
+    assert result["status"] == "complete"
+    assert result["total"] == 4 and result["updated"] == 4
+    assert backfill_env.stats.calls[RESPONSES] == 2
+    assert backfill.load_checkpoint() is None
+    for question_id in ids:
+        difficulty = (await repository.get_question_by_id(question_id))["difficulty"]
+        assert (difficulty is None) == (question_id <= ids[2])
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_stops_before_unfinished_batch(
+    backfill_env, repository, sample_question, monkeypatch
+):
+    """Test that the checkpoint only advances past batches finished in order."""
+    ids = await _add_questions(repository, sample_question, 6)
+    rate_batch = backfill.rate_batch
+
+    async def failing_second_batch(client, questions, verbose=False):
+        if questions[0]["id"] == ids[2]:
+            raise RuntimeError("connection lost")
+        await asyncio.sleep(0.05)  # Still in flight when the failure surfaces
+        return await rate_batch(client, questions, verbose=verbose)
+
+    monkeypatch.setattr(backfill, "rate_batch", failing_second_batch)
+
+    with pytest.raises(RuntimeError):
+        await backfill.backfill_difficulty(batch_size=2, concurrency=3, confirm=False)
+
+    checkpoint = json.loads(backfill.CHECKPOINT_FILE.read_text())
+    assert checkpoint["last_id"] == ids[1]
+    # Batches in flight alongside the failure still wrote their ratings
+    rated = [(await repository.get_question_by_id(qid))["difficulty"] for qid in ids]
+    assert [rating is not None for rating in rated] == [True, True, False, False, True, True]
+
+    # The next run picks up at the failed batch
+    monkeypatch.setattr(backfill, "rate_batch", rate_batch)
+    result = await backfill.backfill_difficulty(batch_size=2, confirm=False)
+    assert result["status"] == "complete"
+    assert await repository.count_questions_with_null_difficulty() == 0
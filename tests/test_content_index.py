@@ -0,0 +1,65 @@
+"""
+Tests for hash-index deduplication of appended output documents.
+"""
+
+import json
+
+from src.preprocessing.content_index import ContentHashIndex, content_hash, legacy_content_hash
+from src.preprocessing.run_preprocessing import _append_to_file
+
+
+def test_append_dedupes_through_sidecar(tmp_path):
+    """Test that duplicates are caught from the sidecar without reading the markdown."""
+    path = tmp_path / "ethics.md"
+    assert _append_to_file(path, "First document", "a.pdf")
+    assert _append_to_file(path, "Second document", "b.pdf")
+
+    sidecar = json.loads((tmp_path / ".ethics.md.hashes.json").read_text())
+    assert sidecar["size"] == path.stat().st_size
+    assert sidecar["hashes"] == {
+        content_hash("First document"): "a.pdf",
+        content_hash("Second document"): "b.pdf",
+    }
+    assert f"<!-- hash:{content_hash('Second document')} -->" in path.read_text()
+
+    # Overwrite the markdown's bytes in place: a scan would no longer find the markers
+    size = path.stat().st_size
+    path.write_text("x" * size)
+    assert not _append_to_file(path, "First document", "c.pdf")
+
+
+def test_legacy_markers_are_indexed(tmp_path):
+    """Test that files written before the index dedupe against their MD5 markers."""
+    path = tmp_path / "legacy.md"
+    path.write_text(
+        f"# Legacy\n\n---\n\n<!-- hash:{legacy_content_hash('Old document')} -->\n"
+        "## Source: old.pdf\n\nOld document"
+    )
+
+    assert not _append_to_file(path, "Old document", "old.pdf")
+    assert _append_to_file(path, "New document", "new.pdf")
+    assert ContentHashIndex.load(path).contains("Old document")
+
+
+def test_uncommitted_append_is_rolled_back(tmp_path):
+    """Test that an append interrupted before the index update is redone, not skipped."""
+    path = tmp_path / "doc.md"
+    _append_to_file(path, "Committed", "a.pdf")
+    committed = path.read_text()
+
+    # Crash after writing part of the next document, before saving the index
+    with open(path, "a") as f:
+        f.write(
+            f"\n\n---\n\n<!-- hash:{content_hash('Interrupted')} -->\n## Source: b.pdf\n\nInter"
+        )
+
+    assert _append_to_file(path, "Interrupted", "b.pdf")
+    text = path.read_text()
+    assert text.startswith(committed) and text.count("## Source: b.pdf") == 1
+    assert text.endswith("Interrupted")
+
+    # Edited by hand: rebuilt from the markers instead of truncated
+    with open(path, "a") as f:
+        f.write("\n\nManual note")
+    assert not _append_to_file(path, "Committed", "a.pdf")
+    assert path.read_text().endswith("Manual note")
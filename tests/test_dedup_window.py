@@ -0,0 +1,67 @@
+"""
+Tests for the TTL-bounded notification dedup window.
+"""
+
+from src.services.dedup_window import DedupWindow
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeats_suppressed_within_window():
+    """Test that repeats are suppressed and counted until the window closes."""
+    clock = FakeClock()
+    window = DedupWindow(60, clock=clock)
+
+    assert window.allow("delivery_failure:1", context="ctx")
+    clock.now = 10
+    assert not window.allow("delivery_failure:1")
+    assert not window.allow("delivery_failure:1")
+    assert window.pop_closed() == []
+
+    clock.now = 61
+    closed = window.pop_closed()
+    assert len(closed) == 1
+    key, entry = closed[0]
+    assert key == "delivery_failure:1"
+    assert entry.suppressed == 2
+    assert entry.context == "ctx"
+    assert len(window) == 0
+
+    # A new window opens after expiry
+    assert window.allow("delivery_failure:1")
+
+
+def test_windows_without_repeats_are_not_reported():
+    """Test that keys that were never repeated expire silently."""
+    clock = FakeClock()
+    window = DedupWindow(60, clock=clock)
+
+    for user_id in range(100):
+        window.allow(f"delivery_failure:{user_id}")
+    clock.now = 120
+
+    assert window.pop_closed() == []
+    assert len(window) == 0
+
+
+def test_memory_capped_by_max_keys():
+    """Test that the oldest windows close early once max_keys is reached."""
+    clock = FakeClock()
+    window = DedupWindow(3600, max_keys=100, clock=clock)
+
+    window.allow("key:0")
+    window.allow("key:0")
+    for i in range(1, 1000):
+        window.allow(f"key:{i}")
+
+    assert len(window) == 100
+    closed = window.pop_closed()
+    assert [(key, entry.suppressed) for key, entry in closed] == [("key:0", 1)]
@@ -0,0 +1,88 @@
+"""
+Tests for splitting processed content into vector store shards.
+"""
+
+from src.preprocessing.markdown_chunker import chunk_markdown, parse_sections, write_shards
+from src.preprocessing.run_preprocessing import _append_to_file
+
+PARAGRAPH = (
+    "Reinforcement increases the future frequency of the behavior it follows. "
+    "Punishment decreases it. "
+) * 10
+
+
+def _content_file(path):
+    """A processed file built the way the pipeline builds them: two appended PDFs."""
+    _append_to_file(path, "\n\n".join([
+        "# Concepts",
+        "## Reinforcement",
+        PARAGRAPH,
+        "### Schedules",
+        "\n\n".join([PARAGRAPH] * 6),
+        "## Extinction",
+        "Short note.",
+    ]), "concepts.pdf")
+    _append_to_file(path, "# Glossary\n\n## Operant\n\nBehavior that operates on the environment.",
+                    "glossary.pdf")
+    return path
+
+
+def test_parse_sections_tracks_headings_and_sources(tmp_path):
+    """Test that pipeline markers are dropped and heading paths reset per source PDF."""
+    sections = parse_sections(_content_file(tmp_path / "concepts.md").read_text())
+
+    assert [(s.source_pdf, s.headings) for s in sections] == [
+        ("concepts.pdf", ["Concepts", "Reinforcement"]),
+        ("concepts.pdf", ["Concepts", "Reinforcement", "Schedules"]),
+        ("concepts.pdf", ["Concepts", "Extinction"]),
+        ("glossary.pdf", ["Glossary", "Operant"]),
+    ]
+    assert not any("<!-- hash:" in s.text or "Generated" in s.text for s in sections)
+
+
+def test_chunk_markdown_bounds_and_metadata(tmp_path):
+    """Test that shards stay within bounds, never span sources and carry their context."""
+    text = _content_file(tmp_path / "concepts.md").read_text()
+    shards = chunk_markdown(text, "concepts.md", max_chars=2000, min_chars=1000)
+
+    assert all(len(shard.text) <= 2000 for shard in shards)
+    assert [shard.source_pdf for shard in shards].count("glossary.pdf") == 1
+    # Small trailing section packed into the previous shard under its own label
+    assert "**Extinction**\n\nShort note." in shards[-2].text
+    assert all(s.headings[:2] == ["Concepts", "Reinforcement"] for s in shards[:-1])
+
+    rendered = shards[-1].render()
+    assert rendered.startswith("# Glossary > Operant\n")
+    assert "*Content file: concepts.md*" in rendered and "*Source: glossary.pdf*" in rendered
+    assert shards[-1].filename.startswith("concepts--")
+
+
+def test_oversized_table_repeats_header():
+    """Test that a table too big for one shard is split by rows with its header kept."""
+    rows = "\n".join(f"| Term {i} | Definition of term {i} |" for i in range(200))
+    text = f"## Source: t.pdf\n\n## Terms\n\n| Term | Definition |\n|---|---|\n{rows}"
+    shards = chunk_markdown(text, "terms.md", max_chars=1500, min_chars=500)
+
+    assert len(shards) > 1
+    assert all(s.text.startswith("| Term | Definition |\n|---|---|\n") for s in shards)
+    assert sum(s.text.count("| Term ") for s in shards) - len(shards) == 200
+
+
+def test_write_shards_only_touches_changed_shards(tmp_path):
+    """Test that re-sharding keeps unchanged shard files and removes stale ones."""
+    content_dir = tmp_path / "processed"
+    content_dir.mkdir()
+    shard_dir = tmp_path / "shards"
+    path = _content_file(content_dir / "concepts.md")
+    (content_dir / "00_index.md").write_text("# Index")
+
+    first = write_shards(content_dir, shard_dir, max_chars=2000, min_chars=1000)
+    before = {p.name: p.stat().st_mtime_ns for p in shard_dir.glob("*.md")}
+    assert first["written"] == len(before) and not any(n.startswith("00_index") for n in before)
+
+    _append_to_file(path, "## Respondent\n\nBehavior elicited by stimuli.", "glossary2.pdf")
+    second = write_shards(content_dir, shard_dir, max_chars=2000, min_chars=1000)
+    after = {p.name: p.stat().st_mtime_ns for p in shard_dir.glob("*.md")}
+
+    assert second == {"written": 1, "unchanged": len(before), "removed": 0}
+    assert all(after[name] == mtime for name, mtime in before.items())
@@ -0,0 +1,107 @@
+"""
+Tests for the batched notification log writer.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.notification_log_writer import NotificationLogWriter
+
+
+def make_writer(repository, **kwargs) -> NotificationLogWriter:
+    async def get_repo():
+        return repository
+
+    return NotificationLogWriter(get_repo, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batch_in_one_transaction(repository):
+    """Test that queued events are written with one commit per batch."""
+    writer = make_writer(repository, batch_size=50)
+    entries = [
+        writer.log("delivery_failure", "high", f"Failure {i}", "msg", {"user_id": i})
+        for i in range(20)
+    ]
+
+    with patch.object(repository.db, "commit", wraps=repository.db.commit) as commit:
+        await writer.flush()
+
+    assert commit.await_count == 1
+    assert all(entry.log_id for entry in entries)
+    events = await repository.get_recent_notification_events(limit=100)
+    assert len(events) == 20
+    assert events[0]["metadata"]["user_id"] in range(20)
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_sent_markers_written_in_bulk(repository):
+    """Test sent markers before and after the INSERT both land in the log."""
+    writer = make_writer(repository)
+    early = writer.log("system_error", "critical", "Early", "msg")
+    late = writer.log("pool_low", "high", "Late", "msg")
+
+    writer.mark_sent(early)
+    await writer.flush()
+    writer.mark_sent(late)
+
+    with patch.object(
+        repository, "mark_notifications_sent", wraps=repository.mark_notifications_sent
+    ) as mark:
+        await writer.flush()
+
+    mark.assert_awaited_once_with([late.log_id])
+    events = await repository.get_recent_notification_events()
+    assert all(event["sent_at"] for event in events)
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_sent_markers_are_retried(repository):
+    """Test that sent markers survive a failed update and land on the next flush."""
+    writer = make_writer(repository)
+    entry = writer.log("pool_low", "high", "Pool low", "msg")
+    await writer.flush()
+    writer.mark_sent(entry)
+
+    with patch.object(
+        repository, "mark_notifications_sent", side_effect=RuntimeError("database is locked")
+    ):
+        with pytest.raises(RuntimeError):
+            await writer.flush()
+
+    await writer.flush()
+    (event,) = await repository.get_recent_notification_events()
+    assert event["sent_at"]
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_drops_low_priority_first(repository):
+    """Test that a full queue sheds LOW, then MEDIUM, and never CRITICAL."""
+    writer = make_writer(repository, max_queue_size=3)
+    low = writer.log("new_user", "low", "Low", "msg")
+    medium = writer.log("ban_action", "medium", "Medium", "msg")
+    critical = writer.log("system_error", "critical", "Critical", "msg")
+
+    high = writer.log("pool_low", "high", "High", "msg")
+    assert low.dropped and not high.dropped
+
+    incoming_low = writer.log("new_user", "low", "Low 2", "msg")
+    assert incoming_low.dropped
+
+    writer.log("pool_low", "high", "High 2", "msg")
+    assert medium.dropped
+
+    # Only critical/high left; another critical never evicts a critical
+    writer.log("system_error", "critical", "Critical 2", "msg")
+    writer.log("system_error", "critical", "Critical 3", "msg")
+    assert not critical.dropped
+    assert writer.get_stats()["dropped"] == {"low": 2, "medium": 1, "high": 2}
+
+    await writer.flush()
+    titles = {event["title"] for event in await repository.get_recent_notification_events()}
+    assert titles == {"Critical", "Critical 2", "Critical 3"}
+    await writer.close()
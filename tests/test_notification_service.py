@@ -0,0 +1,139 @@
+"""
+Tests for the admin notification service.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.services.notification_log_writer import NotificationLogEntry
+from src.services.notification_service import NotificationEventType, NotificationService
+from src.services.telegram_sender import TelegramSender
+
+
+@pytest.fixture
+def bot():
+    """Bot stub that records sent messages."""
+    return SimpleNamespace(
+        send_message=AsyncMock(return_value=SimpleNamespace(message_id=1))
+    )
+
+
+@pytest.fixture
+def service(repository, bot):
+    """Notification service with two admins backed by the test repository."""
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0)
+    with patch(
+        "src.services.notification_service.get_repository",
+        AsyncMock(return_value=repository),
+    ), patch(
+        "src.services.notification_service.get_telegram_sender",
+        return_value=sender,
+    ):
+        service = NotificationService(SimpleNamespace(bot=bot))
+        service.settings = SimpleNamespace(
+            **{**vars(service.settings), "admin_users": [101, 102]}
+        )
+        yield service
+
+
+def log_entry() -> NotificationLogEntry:
+    return NotificationLogEntry(event_type="test", priority="high", title="t", message="m")
+
+
+def sent_chat_ids(bot) -> list[int]:
+    return [call.kwargs["chat_id"] for call in bot.send_message.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_realtime_fanout_uses_cached_settings(service, repository, bot):
+    """Test that settings are read once and respected for every event."""
+    await repository.update_admin_notification_setting(
+        102, NotificationEventType.DELIVERY_FAILURE.value, realtime_enabled=False
+    )
+
+    with patch.object(
+        repository,
+        "get_notification_settings_for_admins",
+        wraps=repository.get_notification_settings_for_admins,
+    ) as load:
+        for _ in range(3):
+            await service._send_realtime(
+                NotificationEventType.DELIVERY_FAILURE, "Delivery Failed", "x", log_entry()
+            )
+
+    assert load.await_count == 1
+    assert sent_chat_ids(bot) == [101, 101, 101]
+
+
+@pytest.mark.asyncio
+async def test_settings_write_invalidates_cache(service, repository, bot):
+    """Test that updating a setting is picked up by the next notification."""
+    event = NotificationEventType.POOL_LOW
+    await service._send_realtime(event, "Pool Low", "x", log_entry())
+    assert sent_chat_ids(bot) == [101, 102]
+
+    await repository.update_all_admin_notification_settings(
+        101, [event.value], realtime_enabled=False
+    )
+    bot.send_message.reset_mock()
+    await service._send_realtime(event, "Pool Low", "x", log_entry())
+
+    assert sent_chat_ids(bot) == [102]
+
+
+@pytest.mark.asyncio
+async def test_summary_respects_admin_settings(service, repository):
+    """Test that admins with the summary disabled are skipped."""
+    await repository.update_admin_settings(101, summary_enabled=False)
+
+    assert await service._summary_admins() == [102]
+
+
+@pytest.mark.asyncio
+async def test_notify_logs_without_blocking(service, repository, bot):
+    """Test that notify queues the log write and marks it sent after delivery."""
+    with patch.object(
+        repository, "log_notification_events", wraps=repository.log_notification_events
+    ) as write:
+        await service.notify(NotificationEventType.POOL_LOW, "Pool Low", "x")
+        assert write.await_count == 0
+
+        await service.close()
+        assert write.await_count == 1
+
+    events = await repository.get_recent_notification_events()
+    assert len(events) == 1
+    assert events[0]["sent_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_suppressed_repeats_reported_when_window_closes(service, repository, bot):
+    """Test that deduplicated repeats are reported instead of silently dropped."""
+    from src.services.dedup_window import DedupWindow
+
+    clock = SimpleNamespace(now=0.0)
+    service._dedup = DedupWindow(60, clock=lambda: clock.now)
+
+    for _ in range(3):
+        await service.notify(NotificationEventType.POOL_LOW, "Pool Low", "x", dedup_key="pool")
+    assert bot.send_message.await_count == 2  # One per admin
+
+    clock.now = 61
+    await service.flush_batch()
+
+    texts = [call.kwargs["text"] for call in bot.send_message.await_args_list[2:]]
+    assert len(texts) == 2
+    assert all("Pool Low: 2 more suppressed" in text for text in texts)
+
+    # The report is logged apart from real events, so they are counted once
+    await service.close()
+    counts = await repository.get_event_counts_by_type(hours=24)
+    assert counts == {"pool_low": 1, "dedup_suppressed": 1}
+    (report,) = [
+        event for event in await repository.get_recent_notification_events()
+        if event["event_type"] == "dedup_suppressed"
+    ]
+    assert report["metadata"]["event_type"] == "pool_low"
+    assert report["metadata"]["suppressed_count"] == 2
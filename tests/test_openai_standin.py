@@ -0,0 +1,139 @@
+"""
+Tests for the injectable OpenAI client factory, the stand-in and the pool benchmark.
+"""
+
+from types import SimpleNamespace
+
+import openai
+import pytest
+from openai.types import CreateEmbeddingResponse, Embedding
+from openai.types.create_embedding_response import Usage
+
+from src.config.constants import ContentArea
+from src.config.settings import get_settings
+from src.scripts.benchmark_pool import run_benchmark
+from src.services.dedup_service import EmbeddingDedupService
+from src.services.openai_client import set_client_factory
+from src.services.openai_standin import (
+    EMBEDDINGS,
+    RESPONSES,
+    LatencyModel,
+    RecordingOpenAI,
+    StandInClient,
+    StandInOpenAI,
+)
+from src.services.question_generator import QuestionGenerator
+
+
+@pytest.fixture
+def standin():
+    standin = StandInOpenAI(embedding_dim=64, time_scale=0)
+    set_client_factory(standin.client)
+    yield standin
+    set_client_factory(None)
+
+
+@pytest.mark.asyncio
+async def test_services_use_injected_client(standin):
+    """Test that services get stand-in clients and synthetic responses drive them."""
+    generator = QuestionGenerator()
+    dedup = EmbeddingDedupService()
+    assert isinstance(generator.client, StandInClient)
+    assert isinstance(dedup.client, StandInClient)
+
+    async def no_tracking(response, content_area):
+        pass
+
+    generator._vector_store_id = "vs_test"
+    generator._track_usage = no_tracking
+    questions = await generator.generate_question_batch(ContentArea.ETHICS, count=4)
+
+    assert len(questions) == 4
+    assert all(q["content_area"] == ContentArea.ETHICS.value for q in questions)
+    assert all(set(q["options"]) == {"A", "B", "C", "D"} for q in questions)
+
+    # Identical text embeds identically; distinct questions do not collide
+    repeat = await dedup.check_duplicate(questions[0], [questions[0]])
+    distinct = await dedup.check_duplicate(questions[1], questions[2:])
+    assert repeat.is_duplicate and not distinct.is_duplicate
+
+    assert standin.stats.calls[RESPONSES] == 1 and standin.stats.calls[EMBEDDINGS] == 2
+    assert standin.stats.output_tokens == 4 * standin.output_tokens_per_question
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_retried_then_raised():
+    """Test that injected 429s are retried up to max_retries before surfacing."""
+    standin = StandInOpenAI(rate_limit_rate=1.0, time_scale=0)
+    client = standin.client(max_retries=2)
+
+    with pytest.raises(openai.RateLimitError):
+        await client.responses.create(model="gpt-5.2", input="Hello")
+
+    assert standin.stats.rate_limited == 3
+    assert standin.stats.retries == 2 and standin.stats.raised == 1
+
+    model = LatencyModel.parse("uniform:1:2")
+    assert 1 <= model.sample(standin._rng) <= 2
+    with pytest.raises(ValueError):
+        LatencyModel.parse("gaussian:1")
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path):
+    """Test that responses recorded from a client are replayed by the stand-in."""
+    cassette = tmp_path / "cassette.jsonl"
+
+    async def create(**kwargs):
+        return CreateEmbeddingResponse(
+            data=[Embedding(embedding=[0.25, 0.5], index=0, object="embedding")],
+            model=kwargs["model"],
+            object="list",
+            usage=Usage(prompt_tokens=3, total_tokens=3),
+        )
+
+    async def unused(**kwargs):
+        raise AssertionError("not called")
+
+    live = SimpleNamespace(
+        embeddings=SimpleNamespace(create=create),
+        responses=SimpleNamespace(create=unused),
+        chat=SimpleNamespace(completions=SimpleNamespace(create=unused)),
+        files="passthrough",
+    )
+    recorder = RecordingOpenAI(live, cassette)
+    await recorder.embeddings.create(model="text-embedding-3-large", input="reinforcement")
+    assert recorder.files == "passthrough"
+
+    standin = StandInOpenAI(cassette=cassette, time_scale=0)
+    client = standin.client()
+    replayed = await client.embeddings.create(model="text-embedding-3-large", input="reinforcement")
+    # Unrecorded requests fall back to other recordings of the endpoint
+    other = await client.embeddings.create(model="text-embedding-3-large", input="extinction")
+
+    assert replayed.data[0].embedding == [0.25, 0.5]
+    assert other.data[0].embedding == [0.25, 0.5]
+    assert standin.stats.replayed == 2 and standin.stats.input_tokens == 6
+
+
+@pytest.mark.asyncio
+async def test_pool_benchmark(monkeypatch):
+    """Test that the benchmark replenishes a pool offline and reports its metrics."""
+    settings = get_settings()
+    for name in ("database_path", "pool_max_concurrent_generation", "pool_batch_size"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+
+    (result,) = await run_benchmark(
+        [3],
+        batch_size=12,
+        latency="fixed:0",
+        embedding_latency="fixed:0",
+        duplicate_rate=0.3,
+        time_scale=0,
+    )
+
+    assert result["concurrency"] == 3
+    assert result["accepted"] == 12
+    assert result["generation_calls"] > 0 and result["embedding_calls"] > 0
+    assert result["api_calls_per_question"] > result["generation_calls_per_question"]
+    assert result["dedup_checks"] >= 12 and 0 < result["dedup_share"] <= 1
@@ -0,0 +1,222 @@
+"""
+Tests for PDF splitting, streaming chunk preparation and usage accounting.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from src.preprocessing.pdf_processor import (
+    CallUsage,
+    ChunkJob,
+    PDFProcessor,
+    PersistentRateLimitError,
+    SplitChunk,
+    split_pdf,
+)
+from src.preprocessing.metrics import MetricsLog
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    writer = PdfWriter()
+    for page in range(pages):
+        writer.add_blank_page(width=200 + page, height=200)  # Distinct pages, distinct chunks
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+@pytest.fixture
+def processor():
+    processor = PDFProcessor(
+        api_key="test", delay_between_calls=0, split_workers=1, text_fast_path=False
+    )
+    processor.max_pages_per_request = 4
+    yield processor
+    processor.close()
+
+
+def test_split_pdf_by_pages_and_bytes(tmp_path):
+    """Test that chunks respect both the page limit and the byte limit."""
+    pdf = make_pdf(tmp_path / "big.pdf", 10)
+    spill = tmp_path / "spill"
+    spill.mkdir()
+
+    split = split_pdf(pdf, spill, max_pages=4, max_bytes=10**6)
+    assert split.total_pages == 10 and split.page_routes == []
+    assert [chunk.pages for chunk in split.chunks] == [4, 4, 2]
+    assert [len(PdfReader(chunk.path).pages) for chunk in split.chunks] == [4, 4, 2]
+
+    # A byte limit below a 4-page chunk's size halves ranges until they fit
+    max_bytes = split.chunks[0].path.stat().st_size - 1
+    split = split_pdf(pdf, spill, max_pages=4, max_bytes=max_bytes)
+    assert sum(chunk.pages for chunk in split.chunks) == 10
+    assert all(chunk.pages < 4 for chunk in split.chunks)
+    assert all(chunk.path.stat().st_size <= max_bytes for chunk in split.chunks)
+
+    small = make_pdf(tmp_path / "small.pdf", 2)
+    split = split_pdf(small, spill, max_pages=4, max_bytes=10**6)
+    assert split.chunks == [SplitChunk(small, 2)]
+
+
+@pytest.mark.asyncio
+async def test_streaming_bounds_spilled_chunks(processor, tmp_path):
+    """Test that at most a bounded number of chunks exist at once and all are cleaned up."""
+    pdfs = [make_pdf(tmp_path / f"doc{i}.pdf", 9) for i in range(6)]
+    spill_root = tmp_path / "spill"
+    spill_root.mkdir()
+    peak = 0
+
+    async def fake_process(job: ChunkJob, usage: CallUsage) -> str:
+        nonlocal peak
+        peak = max(peak, len(list(spill_root.glob("*/*.pdf"))))
+        assert job.read_bytes().startswith(b"%PDF")
+        await asyncio.sleep(0.01)
+        usage.input_tokens, usage.output_tokens = 100, 10
+        return f"{job.pdf_name}:{job.chunk_index}"
+
+    processor._process_chunk_job = fake_process
+    results = [
+        result
+        async for result in processor.process_pdfs_streaming(
+            pdfs, max_concurrent=2, spill_dir=spill_root
+        )
+    ]
+
+    assert [r.pdf_name for r in results] == [pdf.name for pdf in pdfs]
+    assert [c.markdown for c in results[0].chunks] == ["doc0.pdf:0", "doc0.pdf:1", "doc0.pdf:2"]
+    assert all(r.page_count == 9 for r in results)
+    # Workers + queue + the PDFs split ahead, regardless of corpus size
+    assert 0 < peak <= 2 * 2 + 2 * 3
+    assert list(spill_root.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_chunk_cache_resumes_failed_pdf(tmp_path):
+    """Test that re-runs only extract missing chunks and unchanged PDFs skip splitting."""
+    processor = PDFProcessor(
+        api_key="test",
+        delay_between_calls=0,
+        cache_dir=tmp_path / "cache",
+        split_workers=1,
+        text_fast_path=False,
+    )
+    processor.max_pages_per_request = 4
+    run_in_pool = processor._run_in_pool
+    pooled: list[str] = []
+
+    async def spy_run_in_pool(func, *args):
+        pooled.append(func.__name__)
+        return await run_in_pool(func, *args)
+
+    processor._run_in_pool = spy_run_in_pool
+    pdf = make_pdf(tmp_path / "doc.pdf", 10)
+    calls: list[int] = []
+    failing = {1}
+
+    async def flaky_process(job: ChunkJob, usage: CallUsage) -> str:
+        calls.append(job.chunk_index)
+        if job.chunk_index in failing:
+            raise PersistentRateLimitError("rate limited")
+        usage.input_tokens, usage.output_tokens = 100, 10
+        return f"part {job.chunk_index}"
+
+    processor._process_chunk_job = flaky_process
+
+    async def run() -> list:
+        return [r async for r in processor.process_pdfs_streaming([pdf], max_concurrent=1)]
+
+    (first,) = await run()
+    assert [c.error is not None for c in first.chunks] == [False, True, False]
+
+    calls.clear()
+    failing.clear()
+    (second,) = await run()
+    assert calls == [1]
+    assert [c.cached for c in second.chunks] == [True, False, True]
+    assert [c.input_tokens for c in second.chunks] == [100, 100, 100]
+
+    calls.clear()
+    pooled.clear()
+    (third,) = await run()
+    processor.close()
+    assert calls == []
+    assert pooled == ["document_key"]  # Not split again
+    assert [c.markdown for c in third.chunks] == ["part 0", "part 1", "part 2"]
+    assert third.page_count == 10 and all(c.cached for c in third.chunks)
+
+
+def completion(content: str, prompt_tokens: int, completion_tokens: int, finish_reason="stop"):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(finish_reason=finish_reason, message=SimpleNamespace(content=content))
+        ],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+@pytest.mark.asyncio
+async def test_usage_and_metrics_per_chunk(processor, tmp_path, monkeypatch):
+    """Test that concurrent PDFs keep their own usage, retries included, and are logged."""
+    pdfs = [make_pdf(tmp_path / "a.pdf", 8), make_pdf(tmp_path / "b.pdf", 4)]
+    processor.metrics = MetricsLog(tmp_path / "metrics.jsonl")
+    filtered: set[str] = set()
+
+    async def create(model, max_completion_tokens, messages):
+        prompt = messages[1]["content"][1]["text"]
+        await asyncio.sleep(0.01)
+        if prompt.endswith("b.pdf") and prompt not in filtered:
+            filtered.add(prompt)
+            return completion("", 50, 0, finish_reason="content_filter")
+        return completion("text", 1000 if prompt.endswith("a.pdf") else 2000, 10)
+
+    processor.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: sleep(min(delay, 0.01)))
+
+    results = {
+        r.pdf_name: r async for r in processor.process_pdfs_streaming(pdfs, max_concurrent=3)
+    }
+
+    a, b = results["a.pdf"].chunks, results["b.pdf"].chunks
+    assert [(c.input_tokens, c.output_tokens, c.api_calls, c.retries) for c in a] == [
+        (1000, 10, 1, 0), (1000, 10, 1, 0),
+    ]
+    # The filtered attempt's tokens are kept alongside the retry's
+    assert [(c.input_tokens, c.output_tokens, c.api_calls, c.retries) for c in b] == [
+        (2050, 10, 2, 1),
+    ]
+    assert processor.total_tokens == {"input": 4050, "output": 30, "calls": 4}
+
+    records = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    chunks = [r for r in records if r["event"] == "chunk"]
+    (run,) = [r for r in records if r["event"] == "run"]
+    assert sorted((r["pdf"], r["chunk"], r["pages"], r["retries"]) for r in chunks) == [
+        ("a.pdf", 0, 4, 0), ("a.pdf", 1, 4, 0), ("b.pdf", 0, 4, 1),
+    ]
+    assert all(r["status"] == "ok" and r["latency_s"] > 0 for r in chunks)
+    assert run["finished"] and run["pdfs"] == 2 and run["pages"] == 12
+    assert (run["api_calls"], run["retries"], run["input_tokens"]) == (4, 1, 4050)
+    assert run["max_concurrent"] == 3 and run["pages_per_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_streaming_surfaces_worker_errors(processor, tmp_path):
+    """Test that an exception escaping a worker ends the run instead of hanging it."""
+    pdfs = [make_pdf(tmp_path / f"doc{i}.pdf", 9) for i in range(4)]
+
+    async def broken_job(job, progress_tracker):
+        raise OSError("cache directory is read-only")
+
+    processor._run_chunk_job = broken_job
+    stream = processor.process_pdfs_streaming(pdfs, max_concurrent=2)
+
+    with pytest.raises(OSError, match="read-only"):
+        await asyncio.wait_for(stream.__anext__(), timeout=5)
+    await asyncio.wait_for(stream.aclose(), timeout=5)
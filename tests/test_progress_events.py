@@ -0,0 +1,89 @@
+"""
+Tests for the generation progress event stream.
+"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.web.progress_events import ProgressBroadcaster, stream_progress
+
+
+def parse_events(text: str) -> list[dict]:
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append({
+                "id": int(fields["id"]),
+                "event": fields["event"],
+                "data": json.loads(fields["data"]),
+            })
+    return events
+
+
+async def read_events(response, count: int) -> list[dict]:
+    text = ""
+    while text.count("event:") < count:
+        text += (await response.content.readuntil(b"\n\n")).decode()
+    return parse_events(text)
+
+
+@pytest.mark.asyncio
+async def test_events_since_replays_or_requests_snapshot():
+    """Test that missed events are replayed only while still in the history."""
+    broadcaster = ProgressBroadcaster(history=3)
+    for done in range(5):
+        broadcaster.publish("area", {"done": done})
+
+    assert [e.id for e in broadcaster.events_since(3)] == [4, 5]
+    assert broadcaster.events_since(5) == []
+    assert broadcaster.events_since(1) is None  # Aged out
+    assert broadcaster.events_since(9) is None  # From an earlier server run
+
+
+@pytest.mark.asyncio
+async def test_publish_wakes_all_waiters():
+    """Test that one publish fans out to every waiting subscriber."""
+    broadcaster = ProgressBroadcaster()
+    waiters = [asyncio.create_task(broadcaster.wait(0, timeout=5)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    broadcaster.publish("totals", {"generated": 1})
+    results = await asyncio.gather(*waiters)
+
+    assert [[e.data for e in events] for events in results] == [[{"generated": 1}]] * 3
+    assert await broadcaster.wait(1, timeout=0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_resumes_from_last_event_id():
+    """Test the SSE response for new and reconnecting clients."""
+    broadcaster = ProgressBroadcaster()
+    broadcaster.publish("started", {"running": True})
+    broadcaster.publish("area", {"name": "Ethics", "done": 2})
+
+    async def handler(request):
+        return await stream_progress(request, broadcaster, lambda: {"running": True})
+
+    app = web.Application()
+    app.router.add_get("/stream", handler)
+
+    async with TestClient(TestServer(app)) as client:
+        response = await client.get("/stream")
+        assert response.headers["Content-Type"] == "text/event-stream"
+        first = await read_events(response, 1)
+        response.close()
+
+        response = await client.get("/stream", headers={"Last-Event-ID": "1"})
+        broadcaster.publish("totals", {"generated": 2})
+        resumed = await read_events(response, 2)
+        response.close()
+
+    assert first == [{"id": 2, "event": "snapshot", "data": {"running": True}}]
+    assert [(e["id"], e["event"]) for e in resumed] == [(2, "area"), (3, "totals")]
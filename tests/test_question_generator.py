@@ -173,7 +173,7 @@ class TestQuestionGenerator:
     def test_vector_store_cache_initialization(self, mock_settings):
         """Test that vector store cache is initialized empty."""
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI"):
+            with patch("src.services.question_generator.create_openai_client"):
                 with patch("src.services.question_generator.get_vector_store_manager"):
                     generator = QuestionGenerator()
 
@@ -182,7 +182,7 @@ class TestQuestionGenerator:
     def test_clear_vector_store_cache(self, mock_settings):
         """Test clearing vector store cache."""
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI"):
+            with patch("src.services.question_generator.create_openai_client"):
                 with patch("src.services.question_generator.get_vector_store_manager"):
                     generator = QuestionGenerator()
                     generator._vector_store_id = "cached-store-id"
@@ -194,7 +194,7 @@ class TestQuestionGenerator:
     def test_select_category_returns_valid_category(self, mock_settings):
         """Test that _select_category returns valid categories."""
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI"):
+            with patch("src.services.question_generator.create_openai_client"):
                 with patch("src.services.question_generator.get_vector_store_manager"):
                     generator = QuestionGenerator()
 
@@ -207,7 +207,7 @@ class TestQuestionGenerator:
     def test_select_category_follows_distribution(self, mock_settings):
         """Test that _select_category roughly follows weights."""
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI"):
+            with patch("src.services.question_generator.create_openai_client"):
                 with patch("src.services.question_generator.get_vector_store_manager"):
                     generator = QuestionGenerator()
 
@@ -234,7 +234,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -261,7 +261,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -288,7 +288,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -307,7 +307,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value=None)
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -329,7 +329,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -356,7 +356,7 @@ class TestQuestionGenerator:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -392,7 +392,7 @@ class TestRetryLogic:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -416,7 +416,7 @@ class TestRetryLogic:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -442,7 +442,7 @@ class TestQuestionTypeDistribution:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -469,7 +469,7 @@ class TestQuestionTypeDistribution:
         mock_vsm.get_store_id = AsyncMock(return_value="test-store-id")
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI", return_value=mock_client):
+            with patch("src.services.question_generator.create_openai_client", return_value=mock_client):
                 with patch("src.services.question_generator.get_vector_store_manager", return_value=mock_vsm):
                     generator = QuestionGenerator()
 
@@ -495,7 +495,7 @@ class TestSingleton:
         qg._generator = None
 
         with patch("src.services.question_generator.get_settings", return_value=mock_settings):
-            with patch("src.services.question_generator.AsyncOpenAI"):
+            with patch("src.services.question_generator.create_openai_client"):
                 with patch("src.services.question_generator.get_vector_store_manager"):
                     generator1 = get_question_generator()
                     generator2 = get_question_generator()
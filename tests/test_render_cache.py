@@ -0,0 +1,105 @@
+"""
+Tests for the question render cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.bot import messages
+from src.bot.render_cache import VARIANT_BONUS, VARIANT_DAILY, QuestionRenderCache
+from src.database.repository import _question_change_listeners
+
+
+@pytest.fixture
+def question(sample_question):
+    """Question row as returned by the repository."""
+    return {
+        "id": 1,
+        **sample_question,
+        "source_citation": {"section": "1.01", "heading": "Reliance", "quote": "x" * 400},
+    }
+
+
+def test_question_rendered_once_per_variant(question):
+    """Test that repeat sends reuse the same rendered text and keyboard."""
+    cache = QuestionRenderCache()
+
+    with patch.object(messages, "format_question", wraps=messages.format_question) as fmt:
+        first = cache.get_question(question)
+        second = cache.get_question(question)
+        bonus = cache.get_question(question, VARIANT_BONUS)
+
+    assert first is second
+    assert fmt.call_count == 2
+    assert bonus.text.startswith("*Bonus Question!*")
+    assert bonus.text.endswith(first.text)
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_sent_question_rows_use_question_id(question):
+    """Test that join rows keyed by question_id share entries with question rows."""
+    cache = QuestionRenderCache()
+    daily_row = {k: v for k, v in question.items() if k != "id"}
+    daily_row["question_id"] = question["id"]
+
+    rendered = cache.get_question(daily_row, VARIANT_DAILY)
+    callback_data = rendered.keyboard.inline_keyboard[0][0].callback_data
+
+    assert rendered.text.startswith("*Your latest daily question:*")
+    assert callback_data.startswith(f"answer:{question['id']}:")
+
+
+def test_feedback_matches_uncached_formatting(question):
+    """Test that cached feedback is identical to direct formatting."""
+    cache = QuestionRenderCache()
+
+    for expanded in (False, True):
+        assert cache.get_incorrect_feedback(question, True, expanded) == (
+            messages.format_incorrect_answer(
+                correct_answer=question["correct_answer"],
+                explanation=question["explanation"],
+                streak_broken=True,
+                source_citation=question["source_citation"],
+                expanded=expanded,
+            )
+        )
+
+
+def test_invalidate_rerenders_changed_question(question):
+    """Test that invalidation causes the edited question to be re-rendered."""
+    cache = QuestionRenderCache()
+    before = cache.get_question(question)
+
+    question["content"] = "Edited question text"
+    assert cache.get_question(question) is before
+
+    cache.invalidate(question["id"])
+    assert "Edited question text" in cache.get_question(question).text
+
+
+@pytest.mark.asyncio
+async def test_repository_review_invalidates(repository, sample_question):
+    """Test that reviewing a question notifies registered listeners."""
+    changed = []
+    _question_change_listeners.append(changed.append)
+    try:
+        question_id = await repository.create_question(**sample_question)
+        await repository.create_question_review(
+            question_id=question_id,
+            reviewer_id="admin",
+            decision="approved",
+        )
+    finally:
+        _question_change_listeners.remove(changed.append)
+
+    assert changed == [question_id]
+
+
+def test_cache_is_bounded(question):
+    """Test that the least recently used renders are evicted."""
+    cache = QuestionRenderCache(max_entries=2)
+    for question_id in range(5):
+        cache.get_question({**question, "id": question_id})
+
+    assert cache.get_stats()["entries"] == 2
@@ -3,6 +3,7 @@ Tests for database repository operations.
 """
 
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
 
@@ -312,3 +313,201 @@ async def test_get_subscribed_users_by_timezone(repository, sample_user_data):
     la_users = await repository.get_subscribed_users_by_timezone("America/Los_Angeles")
     assert len(la_users) == 1
     assert la_users[0]["telegram_id"] == 333
+
+
+@pytest.mark.asyncio
+async def test_prune_and_restore_unreachable_user(repository, sample_user_data):
+    """Test that pruned users are unsubscribed with a reason and can be restored."""
+    telegram_id = sample_user_data["telegram_id"]
+    await repository.create_user(telegram_id=telegram_id)
+
+    assert await repository.prune_unreachable_user(telegram_id, "blocked")
+    # Already pruned - second call is a no-op
+    assert not await repository.prune_unreachable_user(telegram_id, "blocked")
+
+    user = await repository.get_user_by_telegram_id(telegram_id)
+    assert not user["is_subscribed"]
+    assert user["unsubscribed_reason"] == "blocked"
+    assert user["unsubscribed_at"] is not None
+    assert await repository.get_subscribed_users() == []
+    assert await repository.get_pruned_user_count(hours=24) == 1
+
+    assert await repository.restore_pruned_user(telegram_id)
+    user = await repository.get_user_by_telegram_id(telegram_id)
+    assert user["is_subscribed"]
+    assert user["unsubscribed_reason"] is None
+    assert await repository.get_pruned_user_count(hours=24) == 0
+
+
+@pytest.mark.asyncio
+async def test_restore_skips_voluntary_unsubscribe(repository, sample_user_data):
+    """Test that users who unsubscribed themselves are not resubscribed."""
+    telegram_id = sample_user_data["telegram_id"]
+    await repository.create_user(telegram_id=telegram_id)
+    await repository.update_user(telegram_id, is_subscribed=False)
+
+    assert not await repository.restore_pruned_user(telegram_id)
+    user = await repository.get_user_by_telegram_id(telegram_id)
+    assert not user["is_subscribed"]
+
+
+@pytest.mark.asyncio
+async def test_browse_table_keyset_pagination(repository):
+    """Test that cursor pages cover every row once, forwards and back."""
+    for i in range(12):
+        await repository.create_user(telegram_id=1000 + i, username=f"user{i % 4}")
+    await repository.db.execute("UPDATE users SET username = NULL WHERE telegram_id < 1003")
+    await repository.db.commit()
+
+    for sort_dir in ("asc", "desc"):
+        pages = []
+        data = await repository.browse_table("users", per_page=5, sort_col="username", sort_dir=sort_dir)
+        assert not data["has_prev"]
+        pages.append(data)
+        while data["has_next"]:
+            data = await repository.browse_table(
+                "users", per_page=5, sort_col="username", sort_dir=sort_dir,
+                after=data["next_cursor"],
+            )
+            pages.append(data)
+
+        ids = [row["id"] for page in pages for row in page["rows"]]
+        assert len(ids) == len(set(ids)) == 12
+        usernames = [row["username"] or "" for page in pages for row in page["rows"]]
+        assert usernames == sorted(usernames, reverse=sort_dir == "desc")
+
+        # Walking back from the last page returns the same pages
+        back = await repository.browse_table(
+            "users", per_page=5, sort_col="username", sort_dir=sort_dir,
+            before=pages[-1]["prev_cursor"],
+        )
+        assert back["rows"] == pages[-2]["rows"]
+        assert back["has_next"] and back["has_prev"]
+
+
+@pytest.mark.asyncio
+async def test_browse_questions_cursor_and_count(repository, sample_question):
+    """Test question browsing with filters, cursors and exact small counts."""
+    for i in range(5):
+        await repository.create_question(**{**sample_question, "content": f"Question {i}"})
+
+    first = await repository.browse_questions(per_page=3, content_area=sample_question["content_area"])
+    assert first["total"] == 5 and not first["total_approximate"]
+    assert first["has_next"]
+
+    second = await repository.browse_questions(
+        page=2, per_page=3, content_area=sample_question["content_area"],
+        after=first["next_cursor"],
+    )
+    assert [q["content"] for q in first["rows"] + second["rows"]] == [
+        f"Question {i}" for i in reversed(range(5))
+    ]
+    assert not second["has_next"]
+
+    # A malformed cursor falls back to the first page
+    bad = await repository.browse_questions(
+        per_page=3, content_area=sample_question["content_area"], after="not-a-cursor"
+    )
+    assert bad["rows"] == first["rows"]
+
+
+@pytest.mark.asyncio
+async def test_full_text_question_search(repository, sample_question):
+    """Test ranked prefix search with snippets, kept in sync by triggers."""
+    await repository.create_question(
+        **{**sample_question, "content": "Which reinforcement schedule is intermittent?",
+           "explanation": "Variable ratio schedules produce high rates."}
+    )
+    strong_id = await repository.create_question(
+        **{**sample_question, "content": "Reinforcement follows behavior; what is reinforcement?",
+           "explanation": "Reinforcement increases future behavior."}
+    )
+    other_id = await repository.create_question(**sample_question)
+
+    data = await repository.browse_questions(search="reinforc")
+    assert data["search_ranked"]
+    assert data["total"] == 2
+    assert data["rows"][0]["id"] == strong_id
+    assert "\x02" in data["rows"][0]["snippet"]
+
+    # Words are ANDed and FTS operators in the input are treated literally
+    assert (await repository.browse_questions(search="variable OR ratio"))["total"] == 0
+    assert (await repository.browse_questions(search="variable ratio"))["total"] == 1
+
+    await repository.db.execute(
+        "UPDATE questions SET explanation = 'Now mentions reinforcement' WHERE id = ?",
+        (other_id,),
+    )
+    await repository.db.execute("DELETE FROM questions WHERE id = ?", (strong_id,))
+    await repository.db.commit()
+
+    ids = {q["id"] for q in (await repository.browse_questions(search="reinforcement"))["rows"]}
+    assert other_id in ids and strong_id not in ids
+
+
+@pytest.mark.asyncio
+async def test_browse_table_uses_full_text_index(repository):
+    """Test that generic table search goes through the table's FTS index."""
+    await repository.log_notification_events([
+        {"event_type": "pool_low", "priority": "high", "title": "Pool low", "message": "Ethics pool running low"},
+        {"event_type": "new_user", "priority": "low", "title": "New user", "message": "Welcome aboard"},
+    ])
+
+    data = await repository.browse_table("notification_log", search="ethic")
+    assert [row["event_type"] for row in data["rows"]] == ["pool_low"]
+
+    # Tables without an index still use LIKE
+    await repository.create_user(telegram_id=4242, username="findme")
+    data = await repository.browse_table("users", search="indm")
+    assert len(data["rows"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_table_metadata_cache_and_row_counts(repository, sample_user_data):
+    """Test that row counts are trigger-maintained and schema changes are seen."""
+    counts = {t["name"]: t["count"] for t in await repository.get_all_tables()}
+    assert counts["users"] == 0
+    assert "table_row_counts" not in counts
+    assert not any(name.startswith("questions_fts") for name in counts)
+
+    user_id = await repository.create_user(telegram_id=sample_user_data["telegram_id"])
+    await repository.create_user(telegram_id=sample_user_data["telegram_id"] + 1)
+    await repository.db.execute("DELETE FROM users WHERE id = ?", (user_id,))
+    await repository.db.commit()
+
+    with patch.object(repository.db, "execute", wraps=repository.db.execute) as execute:
+        tables = {t["name"]: t["count"] for t in await repository.get_all_tables()}
+        schema = await repository.get_table_schema("users")
+    assert tables["users"] == 1
+    assert "telegram_id" in [c["name"] for c in schema]
+    assert not any("COUNT(*)" in str(call.args[0]) for call in execute.call_args_list)
+
+    await repository.db.execute("CREATE TABLE extra_table (id INTEGER PRIMARY KEY)")
+    await repository.db.commit()
+    assert "extra_table" in {t["name"] for t in await repository.get_all_tables()}
+    with pytest.raises(ValueError):
+        await repository.get_table_schema("no_such_table")
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_streams_in_batches(repository, sample_question):
+    """Test that iter_rows yields every matching row using bounded queries."""
+    for i in range(7):
+        await repository.create_user(telegram_id=2000 + i, timezone="UTC" if i % 2 else "America/Los_Angeles")
+
+    with patch.object(repository.db, "execute", wraps=repository.db.execute) as execute:
+        rows = [row async for row in repository.iter_rows("users", batch_size=3)]
+    assert [row["telegram_id"] for row in rows] == list(range(2000, 2007))
+    assert "__rowid" not in rows[0]
+    assert sum("LIMIT" in str(call.args[0]) for call in execute.call_args_list) == 3
+
+    utc_rows = [row async for row in repository.iter_rows("users", filters={"timezone": "UTC"})]
+    assert len(utc_rows) == 3
+    with pytest.raises(ValueError):
+        [row async for row in repository.iter_rows("users", filters={"nope": 1})]
+
+    await repository.create_question(**sample_question)
+    await repository.create_question(**{**sample_question, "content": "Extinction burst?", "content_area": "Ethics"})
+    questions = [q async for q in repository.iter_questions(search="extinction")]
+    assert [q["content"] for q in questions] == ["Extinction burst?"]
+    assert isinstance(questions[0]["options"], dict)
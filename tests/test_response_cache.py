@@ -0,0 +1,129 @@
+"""
+Tests for the admin GUI response cache.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.web.response_cache import ResponseCache, cached_response
+
+
+@pytest.fixture
+def clock():
+    return SimpleNamespace(now=0.0)
+
+
+@pytest.fixture
+def cache(clock):
+    cache = ResponseCache(clock=lambda: clock.now)
+    with patch("src.web.response_cache._response_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def calls():
+    return SimpleNamespace(count=0)
+
+
+@pytest.fixture
+def app(repository, cache, calls):
+    """App with cached routes counting how often they render."""
+
+    @cached_response("test_page", default_ttl=10, tables=("users",))
+    async def page(request):
+        calls.count += 1
+        return web.Response(text="<p>row</p>" * 200, content_type="text/html")
+
+    @cached_response("test_dashboard", default_ttl=10)
+    async def dashboard(request):
+        calls.count += 1
+        return web.Response(text="<p>totals</p>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/dashboard", dashboard)
+
+    with patch(
+        "src.web.response_cache.get_repository", AsyncMock(return_value=repository)
+    ):
+        yield app
+
+
+@pytest.mark.asyncio
+async def test_cached_until_ttl_then_revalidated(app, calls, cache, clock, repository):
+    """Test that pages re-render only after the TTL and a database write."""
+    async with TestClient(TestServer(app)) as client:
+        first = await client.get("/page")
+        body = await first.text()
+        await client.get("/page")
+        assert calls.count == 1
+
+        # TTL expired, nothing written: revalidated without rendering
+        clock.now = 11
+        assert await (await client.get("/page")).text() == body
+        assert calls.count == 1
+
+        await repository.create_user(telegram_id=42)
+        await client.get("/page")
+        assert calls.count == 1  # Still within the renewed TTL
+
+        clock.now = 22
+        await client.get("/page")
+        assert calls.count == 2
+        assert cache.renders == 2
+
+        # Different query string is a separate entry
+        await client.get("/page?filter=x")
+        assert calls.count == 3
+
+
+@pytest.mark.asyncio
+async def test_etag_and_gzip(app):
+    """Test conditional GETs and precompressed bodies."""
+    async with TestClient(TestServer(app)) as client:
+        response = await client.get("/page", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert (await response.text()).startswith("<p>row</p>")
+        etag = response.headers["ETag"]
+
+        response = await client.get("/page", headers={"If-None-Match": etag})
+        assert response.status == 304
+
+        response = await client.get("/page", headers={"If-None-Match": '"stale"'})
+        assert response.status == 200
+        assert response.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_writes_to_unread_tables_keep_entries(app, calls, clock, repository):
+    """Test that only writes to a route's tables re-render it; TTL-only routes expire."""
+    async with TestClient(TestServer(app)) as client:
+        await client.get("/page")
+        await client.get("/dashboard")
+        assert calls.count == 2
+
+        # Bot activity on other tables doesn't invalidate the users page
+        await repository.record_api_usage(
+            input_tokens=10, output_tokens=5, model="gpt-5.2", estimated_cost=0.01
+        )
+        clock.now = 11
+        await client.get("/page")
+        assert calls.count == 2
+
+        # An update (not just an insert or delete) to a read table does
+        await repository.create_user(telegram_id=42)
+        clock.now = 22
+        await client.get("/page")
+        assert calls.count == 3
+        await repository.update_user(42, timezone="UTC")
+        clock.now = 33
+        await client.get("/page")
+        assert calls.count == 4
+
+        # Routes without tables re-render once their TTL is up
+        await client.get("/dashboard")
+        assert calls.count == 5
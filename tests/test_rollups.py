@@ -0,0 +1,181 @@
+"""
+Tests for analytics rollups and raw event retention.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+import src.database.repository as repository_module
+from src.services.rollup_compactor import RollupCompactor
+
+
+def ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def add_usage(repository, when: datetime, model: str = "gpt-5.2", cost: float = 0.01):
+    await repository.db.execute(
+        """
+        INSERT INTO api_usage
+        (timestamp, input_tokens, output_tokens, model, content_area, estimated_cost)
+        VALUES (?, 100, 50, ?, 'Ethics', ?)
+        """,
+        (ts(when), model, cost),
+    )
+    await repository.db.commit()
+
+
+async def add_answer(repository, user_id: int, question_id: int, when: datetime, correct: bool):
+    await repository.db.execute(
+        """
+        INSERT INTO user_answers (user_id, question_id, user_answer, is_correct, answered_at)
+        VALUES (?, ?, 'A', ?, ?)
+        """,
+        (user_id, question_id, correct, ts(when)),
+    )
+    await repository.db.commit()
+
+
+async def add_event(repository, event_type: str, when: datetime):
+    await repository.db.execute(
+        """
+        INSERT INTO notification_log (event_type, priority, title, message, created_at)
+        VALUES (?, 'high', 't', 'm', ?)
+        """,
+        (event_type, ts(when)),
+    )
+    await repository.db.commit()
+
+
+async def snapshot(repository, day) -> tuple:
+    return (
+        await repository.get_api_usage_stats(hours=24),
+        await repository.get_daily_stats(day),
+        await repository.get_active_user_count(days=7),
+        await repository.get_event_counts_by_type(hours=24),
+    )
+
+
+@pytest_asyncio.fixture
+async def seeded(repository, sample_question):
+    """Repository with raw rows spread across the last few weeks."""
+    now = datetime.now()
+    utc_now = datetime.now(timezone.utc)
+    question_id = await repository.create_question(**sample_question)
+    users = [await repository.create_user(telegram_id=500 + i) for i in range(3)]
+
+    for hours_ago in (0.1, 1.5, 5, 23.9, 24.5, 30, 24 * 100):
+        await add_usage(repository, now - timedelta(hours=hours_ago))
+    await add_usage(repository, now - timedelta(hours=2), model="gpt-4o", cost=0.5)
+
+    for days_ago, user in ((0, 0), (0, 1), (0, 0), (3, 2), (6.9, 2), (8, 1), (40, 0)):
+        await add_answer(
+            repository, users[user], question_id, now - timedelta(days=days_ago), user == 0
+        )
+
+    for hours_ago, event_type in ((1, "pool_low"), (2, "pool_low"), (20, "new_user"), (40, "pool_low")):
+        await add_event(repository, event_type, utc_now - timedelta(hours=hours_ago))
+    for days_ago in (31, 45):
+        await add_event(repository, "delivery_failure", utc_now - timedelta(days=days_ago))
+
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_rollup_stats_match_raw_stats(seeded):
+    """Test that stats are identical before, during and after compaction."""
+    repository = seeded
+    today = datetime.now().date()
+    raw = await snapshot(repository, today)
+    assert raw[0]["total_calls"] == 5
+    assert raw[1]["answers_count"] == 3 and raw[1]["active_users"] == 2
+    assert raw[2] == 3
+    assert raw[3] == {"pool_low": 2, "new_user": 1}
+
+    compacted = await repository.compact_rollups()
+    assert compacted == {"api_usage": 8, "user_answers": 7, "notification_log": 6}
+    assert await snapshot(repository, today) == raw
+
+    # New rows after compaction are read from the raw tail
+    async with repository.db.execute("SELECT id FROM questions") as cursor:
+        question_id = (await cursor.fetchone())[0]
+    user_id = await repository.create_user(telegram_id=999)
+    await add_answer(repository, user_id, question_id, datetime.now(), True)
+    await add_usage(repository, datetime.now())
+
+    stats = await snapshot(repository, today)
+    assert stats[0]["total_calls"] == 6
+    assert stats[1]["answers_count"] == 4 and stats[1]["active_users"] == 3
+    assert stats[2] == 4
+
+    assert (await repository.compact_rollups())["user_answers"] == 1
+    assert await snapshot(repository, today) == stats
+
+
+@pytest.mark.asyncio
+async def test_retention_only_expires_compacted_rows(seeded, tmp_path):
+    """Test that retention archives old rows without changing recent stats."""
+    repository = seeded
+    today = datetime.now().date()
+    before = await snapshot(repository, today)
+
+    compactor = RollupCompactor(
+        retention_days={"api_usage": 90, "notification_log": 30, "user_answers": 1},
+        archive_dir=str(tmp_path),
+        batch_size=1,
+    )
+    with patch(
+        "src.services.rollup_compactor.get_repository",
+        AsyncMock(return_value=repository),
+    ):
+        removed = await compactor.apply_retention()
+
+    assert removed == {"api_usage": 1, "notification_log": 2}
+    assert await snapshot(repository, today) == before
+
+    archived = [
+        json.loads(line)
+        for path in sorted(tmp_path.glob("notification_log-*.jsonl"))
+        for line in path.read_text().splitlines()
+    ]
+    assert [row["event_type"] for row in archived] == ["delivery_failure"] * 2
+
+    async with repository.db.execute("SELECT COUNT(*) FROM user_answers") as cursor:
+        assert (await cursor.fetchone())[0] == 7
+
+
+@pytest.mark.asyncio
+async def test_uncompacted_rows_are_never_expired(repository):
+    """Test that rows above the watermark survive retention."""
+    await add_usage(repository, datetime.now() - timedelta(days=200))
+
+    expired = await repository.get_expired_rows("api_usage", datetime.now())
+    assert expired == []
+
+    await repository.compact_rollups()
+    expired = await repository.get_expired_rows("api_usage", datetime.now())
+    assert len(expired) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_compaction_keeps_other_pending_writes(repository, monkeypatch):
+    """Test that a failed compaction rolls back only its own savepoint."""
+    await add_usage(repository, datetime.now())
+    monkeypatch.setitem(
+        repository_module._ROLLUP_STATEMENTS,
+        "api_usage",
+        ["INSERT INTO no_such_table SELECT ?, ?"],
+    )
+
+    # Another coroutine's write, not yet committed on the shared connection
+    await repository.db.execute("INSERT INTO users (telegram_id) VALUES (424242)")
+    with pytest.raises(Exception, match="no_such_table"):
+        await repository.compact_rollups()
+    await repository.db.commit()
+
+    assert await repository.get_user_by_telegram_id(424242) is not None
+    assert await repository.get_rollup_watermark("api_usage") == 0
@@ -0,0 +1,47 @@
+"""
+Tests for scheduled question delivery.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.services import scheduler
+from src.services.telegram_sender import SendOutcome, SendResult
+
+
+@pytest.mark.asyncio
+async def test_failed_sends_alert_admins_but_unreachable_chats_do_not():
+    """Test that only sends that exhausted their retries reach the admin alert."""
+    outcomes = {
+        1: SendResult(1, SendOutcome.SENT, message=SimpleNamespace(message_id=1)),
+        2: SendResult(2, SendOutcome.FAILED, error="Timed out"),
+        3: SendResult(3, SendOutcome.PERMANENT_FAILURE, unreachable_reason="blocked"),
+        4: None,  # No unseen question
+    }
+
+    async def send_question_to_user(user_id, context, is_scheduled):
+        return outcomes[user_id]
+
+    repo = SimpleNamespace(
+        get_subscribed_users_by_timezone=AsyncMock(
+            return_value=[{"telegram_id": uid} for uid in outcomes]
+        )
+    )
+    notify = AsyncMock()
+
+    with (
+        patch("src.services.scheduler.get_repository", AsyncMock(return_value=repo)),
+        patch("src.bot.handlers.send_question_to_user", send_question_to_user),
+        patch("src.services.scheduler.notify_admins_of_failure", notify),
+        patch.dict(scheduler._delivery_stats, {"by_timezone": {}}),
+    ):
+        await scheduler.deliver_scheduled_questions(
+            SimpleNamespace(), "America/New_York", is_morning=True
+        )
+        stats = scheduler._delivery_stats["by_timezone"]["America/New_York"]
+
+    notify.assert_awaited_once()
+    assert notify.await_args.args[1:] == (2, "Timed out")
+    assert stats["success"] == 1 and stats["failures"] == 3
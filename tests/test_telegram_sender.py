@@ -0,0 +1,199 @@
+"""
+Tests for the flood-control aware Telegram sender.
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut
+
+from src.services.telegram_sender import SendOutcome, TelegramSender
+
+
+def make_bot(side_effect=None) -> SimpleNamespace:
+    """Create a bot whose send_message records call times."""
+    calls: list[tuple[int, float]] = []
+
+    async def send_message(chat_id, text, **kwargs):
+        calls.append((chat_id, time.monotonic()))
+        if side_effect:
+            return side_effect(chat_id, len(calls))
+        return SimpleNamespace(message_id=len(calls))
+
+    return SimpleNamespace(send_message=send_message, calls=calls)
+
+
+@pytest.mark.asyncio
+async def test_global_rate_limit():
+    """Test that sends across chats are spaced by the global budget."""
+    bot = make_bot()
+    sender = TelegramSender(bot, rate_per_second=50, per_chat_interval=0)
+
+    results = await asyncio.gather(*(
+        sender.send_message(chat_id, "hi") for chat_id in range(10)
+    ))
+
+    assert all(result.ok for result in results)
+    times = [t for _, t in bot.calls]
+    # 10 sends at 50/s need at least 9 intervals of 20ms
+    assert times[-1] - times[0] >= 0.17
+    assert sender.get_stats()["sent"] == 10
+    assert sender.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_per_chat_spacing():
+    """Test that sends to the same chat respect the per-chat interval."""
+    bot = make_bot()
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0.05)
+
+    await asyncio.gather(*(sender.send_message(1, "hi") for _ in range(3)))
+    await sender.send_message(2, "other chat")
+
+    chat_times = [t for chat_id, t in bot.calls if chat_id == 1]
+    gaps = [b - a for a, b in zip(chat_times, chat_times[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_pool():
+    """Test that RetryAfter pauses all chats and the send is retried."""
+
+    def flood_once(chat_id, count):
+        if count == 1:
+            raise RetryAfter(0.1)
+        return SimpleNamespace(message_id=count)
+
+    bot = make_bot(flood_once)
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0)
+
+    start = time.monotonic()
+    first = await sender.send_message(1, "hi")
+    second = await sender.send_message(2, "hi")
+
+    assert first.ok and second.ok
+    assert bot.calls[1][1] - start >= 0.09
+    assert sender.get_stats()["retry_after_count"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::telegram.warnings.PTBDeprecationWarning")
+async def test_retry_after_does_not_use_retry_budget():
+    """Test that repeated flood-control pauses don't fail a healthy send."""
+
+    def flood_three_times(chat_id, count):
+        if count <= 3:
+            raise RetryAfter(timedelta(milliseconds=10))
+        return SimpleNamespace(message_id=count)
+
+    bot = make_bot(flood_three_times)
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0, max_retries=1)
+
+    result = await sender.send_message(1, "hi")
+
+    assert result.ok and len(bot.calls) == 4
+    assert sender.get_stats()["retry_after_count"] == 3
+
+    # A separate cap still bounds endless flood control
+    bot = make_bot(lambda chat_id, count: (_ for _ in ()).throw(RetryAfter(timedelta(0))))
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0, max_flood_waits=2)
+    result = await sender.send_message(1, "hi")
+    assert result.outcome == SendOutcome.FAILED and len(bot.calls) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [Forbidden("bot was blocked by the user"), BadRequest("Chat not found")])
+async def test_permanent_errors_not_retried(error):
+    """Test that Forbidden/BadRequest fail immediately without retries."""
+    bot = SimpleNamespace(send_message=AsyncMock(side_effect=error))
+    sender = TelegramSender(bot, rate_per_second=1000, per_chat_interval=0)
+
+    result = await sender.send_message(1, "hi")
+
+    assert result.outcome == SendOutcome.PERMANENT_FAILURE
+    assert result.is_permanent
+    assert result.error_type == type(error).__name__
+    assert bot.send_message.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_retried():
+    """Test that network timeouts are retried up to max_retries."""
+    bot = SimpleNamespace(send_message=AsyncMock(side_effect=TimedOut()))
+    sender = TelegramSender(
+        bot, rate_per_second=1000, per_chat_interval=0, max_retries=3, retry_delays=[0, 0, 0]
+    )
+
+    result = await sender.send_message(1, "hi")
+
+    assert result.outcome == SendOutcome.FAILED
+    assert bot.send_message.await_count == 3
+    assert sender.get_stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_blocked_chat_triggers_unreachable_hook():
+    """Test that a blocked chat is reported once and not retried."""
+    pruned = []
+
+    async def on_unreachable(chat_id, reason):
+        pruned.append((chat_id, reason))
+
+    bot = SimpleNamespace(
+        send_message=AsyncMock(side_effect=Forbidden("Forbidden: bot was blocked by the user"))
+    )
+    sender = TelegramSender(
+        bot, rate_per_second=1000, per_chat_interval=0, on_unreachable=on_unreachable
+    )
+
+    result = await sender.send_message(42, "hi")
+
+    assert result.unreachable_reason == "blocked"
+    assert pruned == [(42, "blocked")]
+    assert bot.send_message.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_message_errors_do_not_prune():
+    """Test that message-specific BadRequests don't mark the chat unreachable."""
+    on_unreachable = AsyncMock()
+    bot = SimpleNamespace(
+        send_message=AsyncMock(side_effect=BadRequest("Can't parse entities"))
+    )
+    sender = TelegramSender(
+        bot, rate_per_second=1000, per_chat_interval=0, on_unreachable=on_unreachable
+    )
+
+    result = await sender.send_message(42, "*broken")
+
+    assert result.is_permanent
+    assert result.unreachable_reason is None
+    on_unreachable.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_interactive_send_skips_bulk_wave():
+    """Test that an interactive send during a large wave goes out right away."""
+    bot = make_bot()
+    sender = TelegramSender(bot, rate_per_second=50, per_chat_interval=0)
+
+    # 500 bulk sends at 50/s would reserve slots 10s ahead under plain FIFO
+    wave = [asyncio.create_task(sender.send_message(chat_id, "bulk")) for chat_id in range(500)]
+    await asyncio.sleep(0.1)
+
+    started = time.monotonic()
+    result = await sender.send_message(10_000, "your question", interactive=True)
+    latency = time.monotonic() - started
+
+    for task in wave:
+        task.cancel()
+    await asyncio.gather(*wave, return_exceptions=True)
+
+    assert result.ok
+    assert latency < 0.1
+    # The wave kept its pace while the interactive send went through
+    assert 3 <= sum(1 for chat_id, _ in bot.calls if chat_id < 10_000) <= 10
@@ -0,0 +1,214 @@
+"""
+Tests for the local text-layer fast path.
+"""
+
+from pathlib import Path
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject, NumberObject, StreamObject
+
+from src.preprocessing.pdf_processor import CallUsage, ChunkJob, PDFProcessor, split_pdf
+from src.preprocessing.text_layer import (
+    classify_page,
+    format_page_ranges,
+    normalize_text,
+    summarize_routes,
+)
+
+PROSE = [
+    "1.2 Reinforcement Schedules",
+    "Behavior analysts use schedules of reinforce-",
+    "ment to shape and maintain behavior over time. A fixed",
+    "ratio schedule delivers reinforcement after a set number of",
+    "responses, while a variable ratio schedule delivers it after",
+    "an average number of responses.",
+    "- Fixed ratio",
+    "- Variable ratio",
+    "12",
+]
+
+TABLE = [
+    "Schedule     Response rate     Pattern",
+    "FR     High     Post-reinforcement pause",
+    "VR     High     Steady",
+    "FI     Moderate     Scallop",
+    "VI     Moderate     Steady",
+] + PROSE[1:6]
+
+
+def _add_page(writer: PdfWriter, lines: list[str], image: bool = False) -> None:
+    page = writer.add_blank_page(width=612, height=792)
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+        NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+    })
+    resources = DictionaryObject({
+        NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})
+    })
+    ops = ["BT", "/F1 10 Tf", "14 TL", "50 750 Td"]
+    ops += [f"({line}) Tj T*" for line in lines]
+    ops.append("ET")
+
+    if image:
+        pixel = StreamObject()
+        pixel.set_data(b"\x00")
+        pixel.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(1),
+            NameObject("/Height"): NumberObject(1),
+            NameObject("/ColorSpace"): NameObject("/DeviceGray"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+        })
+        resources[NameObject("/XObject")] = DictionaryObject(
+            {NameObject("/Im1"): writer._add_object(pixel)}
+        )
+        ops.append("q 100 0 0 100 50 50 cm /Im1 Do Q")
+
+    content = StreamObject()
+    content.set_data("\n".join(ops).encode("cp1252"))
+    page[NameObject("/Resources")] = resources
+    page[NameObject("/Contents")] = writer._add_object(content)
+
+
+def make_text_pdf(path: Path, pages: list[dict]) -> Path:
+    writer = PdfWriter()
+    for page in pages:
+        _add_page(writer, **page)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Prose, prose, image, table, short caption, prose."""
+    return make_text_pdf(tmp_path / "manual.pdf", [
+        {"lines": PROSE},
+        {"lines": PROSE},
+        {"lines": PROSE, "image": True},
+        {"lines": TABLE},
+        {"lines": ["Figure 3: Cumulative record"]},
+        {"lines": PROSE},
+    ])
+
+
+def test_classify_pages(mixed_pdf):
+    """Test that only pages needing vision or layout go to the model."""
+    reader = PdfReader(mixed_pdf)
+    routes = [classify_page(page, i + 1)[0] for i, page in enumerate(reader.pages)]
+
+    assert [(r.local, r.reason) for r in routes] == [
+        (True, "text"),
+        (True, "text"),
+        (False, "images"),
+        (False, "table"),
+        (False, "sparse text"),
+        (True, "text"),
+    ]
+    assert summarize_routes(routes) == {
+        "local_pages": 3,
+        "vision_pages": 3,
+        "local": "1-2, 6",
+        "vision": "3-5",
+        "vision_reasons": {"images": 1, "table": 1, "sparse text": 1},
+    }
+
+
+def test_textless_pages_with_drawings_go_to_model(tmp_path):
+    """Test that only truly empty text-less pages are treated as blank."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)  # No content stream at all
+    for ops in (
+        "1 g 0 0 612 792 re f",  # White background only
+        # Vector diagram: boxes and connecting lines, no text operators
+        "\n".join(
+            f"{50 + 60 * i} 600 50 30 re S {75 + 60 * i} 600 m {75 + 60 * i} 500 l S"
+            for i in range(8)
+        ),
+    ):
+        page = writer.add_blank_page(width=612, height=792)
+        content = StreamObject()
+        content.set_data(ops.encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    path = tmp_path / "drawings.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    reader = PdfReader(path)
+    routes = [classify_page(page, i + 1)[0] for i, page in enumerate(reader.pages)]
+    assert [(r.local, r.reason) for r in routes] == [
+        (True, "blank"),
+        (True, "blank"),
+        (False, "no text layer"),
+    ]
+
+
+def test_normalize_text():
+    """Test paragraph rejoining, dehyphenation, lists, headings and page numbers."""
+    markdown = normalize_text("\n".join(PROSE + ["• Interval schedules", "GLOSSARY"]))
+
+    assert markdown == (
+        "### 1.2 Reinforcement Schedules\n\n"
+        "Behavior analysts use schedules of reinforcement to shape and maintain "
+        "behavior over time. A fixed ratio schedule delivers reinforcement after a "
+        "set number of responses, while a variable ratio schedule delivers it after "
+        "an average number of responses.\n\n"
+        "- Fixed ratio\n"
+        "- Variable ratio\n"
+        "- Interval schedules\n\n"
+        "## GLOSSARY"
+    )
+    assert format_page_ranges([7, 1, 2, 3, 9, 10]) == "1-3, 7, 9-10"
+
+
+def test_split_pdf_routes_runs_of_pages(mixed_pdf, tmp_path):
+    """Test that text pages become local chunks and the rest PDF chunks."""
+    split = split_pdf(mixed_pdf, tmp_path, max_pages=2, max_bytes=10**6, text_fast_path=True)
+
+    assert [(chunk.path is None, chunk.pages) for chunk in split.chunks] == [
+        (True, 2), (False, 2), (False, 1), (True, 1),
+    ]
+    assert split.chunks[0].markdown.count("### 1.2 Reinforcement Schedules") == 2
+    assert len(PdfReader(split.chunks[1].path).pages) == 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_skips_api_for_text_pages(mixed_pdf, tmp_path):
+    """Test that local chunks make no API calls and their routing survives the cache."""
+    processor = PDFProcessor(
+        api_key="test", delay_between_calls=0, cache_dir=tmp_path / "cache", split_workers=1
+    )
+    processor.max_pages_per_request = 2
+    calls: list[int] = []
+
+    async def fake_process(job: ChunkJob, usage: CallUsage) -> str:
+        calls.append(job.chunk_index)
+        usage.input_tokens, usage.output_tokens = 100, 10
+        return f"model part {job.chunk_index}"
+
+    processor._process_chunk_job = fake_process
+
+    async def run():
+        (result,) = [
+            r async for r in processor.process_pdfs_streaming([mixed_pdf], max_concurrent=2)
+        ]
+        return result
+
+    try:
+        first = await run()
+        second = await run()
+    finally:
+        processor.close()
+
+    assert sorted(calls) == [1, 2]
+    assert [c.local for c in first.chunks] == [True, False, False, True]
+    assert [c.input_tokens for c in first.chunks] == [0, 100, 100, 0]
+    assert first.chunks[1].markdown == "model part 1"
+
+    assert all(c.cached for c in second.chunks)
+    assert [c.markdown for c in second.chunks] == [c.markdown for c in first.chunks]
+    assert second.page_routes == first.page_routes
@@ -0,0 +1,186 @@
+"""
+Tests for the per-user ordered update processor.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.bot.update_processor import PerUserUpdateProcessor
+
+
+def make_update(user_id: int) -> SimpleNamespace:
+    """Create a minimal update-like object for a user."""
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id),
+        effective_chat=SimpleNamespace(id=user_id),
+    )
+
+
+class TestUpdateKey:
+    """Tests for update key extraction."""
+
+    def test_key_uses_user_id(self):
+        """Test that updates are keyed by the effective user."""
+        assert PerUserUpdateProcessor.get_update_key(make_update(42)) == ("user", 42)
+
+    def test_key_falls_back_to_chat(self):
+        """Test that chat ID is used when there is no user."""
+        update = SimpleNamespace(effective_user=None, effective_chat=SimpleNamespace(id=7))
+        assert PerUserUpdateProcessor.get_update_key(update) == ("chat", 7)
+
+    def test_key_none_without_user_or_chat(self):
+        """Test that updates without user or chat have no key."""
+        assert PerUserUpdateProcessor.get_update_key(object()) is None
+
+
+class TestPerUserOrdering:
+    """Tests for concurrent processing with per-user ordering."""
+
+    @pytest.mark.asyncio
+    async def test_interleaved_updates_from_many_users(self):
+        """Test that thousands of users run concurrently but stay ordered per user."""
+        num_users = 2000
+        updates_per_user = 5
+        processor = PerUserUpdateProcessor(max_concurrent_updates=256)
+        rng = random.Random(1234)
+
+        processed: dict[int, list[int]] = {uid: [] for uid in range(num_users)}
+        in_flight: dict[int, int] = {uid: 0 for uid in range(num_users)}
+        overlap_violations = 0
+        concurrent = 0
+        max_concurrent = 0
+
+        async def handler(user_id: int, seq: int, delay: float) -> None:
+            nonlocal overlap_violations, concurrent, max_concurrent
+            in_flight[user_id] += 1
+            if in_flight[user_id] > 1:
+                overlap_violations += 1
+            concurrent += 1
+            max_concurrent = max(max_concurrent, concurrent)
+
+            await asyncio.sleep(delay)
+            processed[user_id].append(seq)
+
+            concurrent -= 1
+            in_flight[user_id] -= 1
+
+        # Interleave updates: round-robin across users in shuffled order
+        schedule = []
+        for seq in range(updates_per_user):
+            users = list(range(num_users))
+            rng.shuffle(users)
+            schedule.extend((uid, seq) for uid in users)
+
+        async with processor:
+            tasks = [
+                asyncio.create_task(
+                    processor.process_update(
+                        make_update(uid),
+                        handler(uid, seq, rng.uniform(0, 0.002)),
+                    )
+                )
+                for uid, seq in schedule
+            ]
+            await asyncio.gather(*tasks)
+
+            assert processor.active_keys == 0
+
+        assert overlap_violations == 0
+        assert max_concurrent > 1
+        assert max_concurrent <= 256
+        for uid in range(num_users):
+            assert processed[uid] == list(range(updates_per_user)), f"user {uid} out of order"
+
+    @pytest.mark.asyncio
+    async def test_slow_user_does_not_block_others(self):
+        """Test that a slow handler for one user doesn't stall other users."""
+        processor = PerUserUpdateProcessor(max_concurrent_updates=16)
+        slow_started = asyncio.Event()
+        release_slow = asyncio.Event()
+        fast_done = []
+
+        async def slow_handler() -> None:
+            slow_started.set()
+            await release_slow.wait()
+
+        async def fast_handler(user_id: int) -> None:
+            fast_done.append(user_id)
+
+        async with processor:
+            slow_task = asyncio.create_task(
+                processor.process_update(make_update(1), slow_handler())
+            )
+            await slow_started.wait()
+
+            await asyncio.wait_for(
+                asyncio.gather(*(
+                    processor.process_update(make_update(uid), fast_handler(uid))
+                    for uid in range(2, 12)
+                )),
+                timeout=1.0,
+            )
+            assert sorted(fast_done) == list(range(2, 12))
+            assert not slow_task.done()
+
+            release_slow.set()
+            await slow_task
+
+    @pytest.mark.asyncio
+    async def test_handler_error_releases_user_queue(self):
+        """Test that a failing handler doesn't block later updates for that user."""
+        processor = PerUserUpdateProcessor(max_concurrent_updates=4)
+        results = []
+
+        async def failing_handler() -> None:
+            raise RuntimeError("boom")
+
+        async def ok_handler() -> None:
+            results.append("ok")
+
+        async with processor:
+            with pytest.raises(RuntimeError):
+                await processor.process_update(make_update(5), failing_handler())
+            await processor.process_update(make_update(5), ok_handler())
+
+        assert results == ["ok"]
+        assert processor.active_keys == 0
+
+    @pytest.mark.asyncio
+    async def test_user_backlog_does_not_hold_slots(self):
+        """Test that one user's queued updates can't take every concurrency slot."""
+        limit = 4
+        processor = PerUserUpdateProcessor(max_concurrent_updates=limit)
+        release_slow = asyncio.Event()
+        running = 0
+        max_running = 0
+
+        async def slow_handler() -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await release_slow.wait()
+            running -= 1
+
+        async def other_handler() -> str:
+            return "done"
+
+        async with processor:
+            backlog = [
+                asyncio.create_task(processor.process_update(make_update(1), slow_handler()))
+                for _ in range(limit * 3)
+            ]
+            await asyncio.sleep(0.01)
+
+            await asyncio.wait_for(
+                processor.process_update(make_update(2), other_handler()),
+                timeout=1.0,
+            )
+            assert max_running == 1
+
+            release_slow.set()
+            await asyncio.gather(*backlog)
+
+        assert processor.active_keys == 0
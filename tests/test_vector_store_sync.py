@@ -0,0 +1,167 @@
+"""
+Tests for incremental, batched vector store sync.
+"""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.vector_store_manager import VectorStoreManager
+
+
+class FakeOpenAI:
+    """Records uploads, batches and deletes made by the manager."""
+
+    def __init__(self) -> None:
+        self.uploaded: list[str] = []
+        self.batches: list[list[str]] = []
+        self.deleted: list[str] = []
+        self.attached: set[str] = set()
+        self.fail_batch = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._next_id = 0
+
+        self.files = SimpleNamespace(create=self._create_file, delete=self._delete_file)
+        self.vector_stores = SimpleNamespace(
+            files=SimpleNamespace(delete=self._detach_file),
+            file_batches=SimpleNamespace(create_and_poll=self._create_batch),
+        )
+
+    async def _create_file(self, file, purpose):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self._next_id += 1
+        self.uploaded.append(os.path.basename(file.name))
+        return SimpleNamespace(id=f"file-{self._next_id}")
+
+    async def _create_batch(self, vector_store_id, file_ids, chunking_strategy, poll_interval_ms):
+        if self.fail_batch:
+            raise RuntimeError("connection reset")
+        self.batches.append(sorted(file_ids))
+        self.attached.update(file_ids)
+        return SimpleNamespace(
+            id="vsfb-1",
+            status="completed",
+            file_counts=SimpleNamespace(completed=len(file_ids)),
+        )
+
+    async def _delete_file(self, file_id):
+        self.deleted.append(file_id)
+
+    async def _detach_file(self, vector_store_id, file_id):
+        if file_id not in self.attached:
+            raise RuntimeError(f"No file found with id '{file_id}' in vector store")
+        self.attached.discard(file_id)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = VectorStoreManager()
+    manager.client = FakeOpenAI()
+    manager.state_file = tmp_path / "state.json"
+    manager.content_dir = tmp_path / "processed"
+    manager.content_dir.mkdir()
+    manager.shard_dir = tmp_path / "shards"
+    for i in range(12):
+        (manager.content_dir / f"doc{i:02d}.md").write_text(f"Document {i}")
+    (manager.content_dir / "00_index.md").write_text("Index")
+    manager._save_state({"vector_store_id": "vs_test", "files": {}})
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_sync_uploads_concurrently_and_attaches_in_one_batch(manager):
+    """Test that new files upload in parallel and are attached with a single batch."""
+    result = await manager.sync()
+
+    client = manager.client
+    assert len(result.added) == 12 and not result.errors
+    assert 1 < client.max_in_flight <= manager.MAX_CONCURRENT_UPLOADS
+    assert len(client.batches) == 1 and len(client.batches[0]) == 12
+
+    state = json.loads(manager.state_file.read_text())
+    assert {entry["status"] for entry in state["files"].values()} == {"attached"}
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_unchanged_files_without_hashing(manager, monkeypatch):
+    """Test that files with matching size and mtime are neither hashed nor uploaded."""
+    await manager.sync()
+    client = manager.client
+    shards = {p.name.split("--")[0]: p for p in manager.shard_dir.glob("*.md")}
+    state = json.loads(manager.state_file.read_text())
+    old_id = state["files"][shards["doc03"].name]["file_id"]
+
+    # Same size, same bytes, new mtime: hashed once, then skipped
+    touched = shards["doc05"]
+    os.utime(touched, ns=(0, touched.stat().st_mtime_ns + 10**9))
+    # Re-sharding an edited or touched source only rewrites changed shards
+    (manager.content_dir / "doc03.md").write_text("Document 3, revised")
+    os.utime(manager.content_dir / "doc07.md")
+    (manager.content_dir / "doc11.md").unlink()
+
+    hashed: list[str] = []
+    compute = manager._compute_checksum
+    monkeypatch.setattr(
+        manager, "_compute_checksum", lambda p: hashed.append(p.name) or compute(p)
+    )
+
+    result = await manager.sync()
+
+    (new_shard,) = result.added
+    assert new_shard.startswith("doc03--") and new_shard != shards["doc03"].name
+    assert sorted(hashed) == sorted([new_shard, shards["doc05"].name])
+    assert sorted(result.removed) == [shards["doc03"].name, shards["doc11"].name]
+    assert len(result.unchanged) == 10
+    assert not shards["doc03"].exists()
+    assert old_id in client.deleted
+
+    hashed.clear()
+    result = await manager.sync()
+    assert hashed == [] and len(result.unchanged) == 11
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_resumes_without_reuploading(manager):
+    """Test that files uploaded before a failed batch are attached on the next sync."""
+    client = manager.client
+    client.fail_batch = True
+    result = await manager.sync()
+
+    assert result.added == [] and len(result.errors) == 12
+    state = json.loads(manager.state_file.read_text())
+    assert {entry["status"] for entry in state["files"].values()} == {"uploaded"}
+
+    client.fail_batch = False
+    result = await manager.sync()
+
+    assert len(result.added) == 12
+    assert len(client.uploaded) == 12
+    assert client.batches == [sorted(e["file_id"] for e in state["files"].values())]
+
+
+@pytest.mark.asyncio
+async def test_removing_unattached_upload_deletes_file(manager):
+    """Test that a file uploaded but never attached is deleted without detaching."""
+    client = manager.client
+    client.fail_batch = True
+    await manager.sync()
+    state = json.loads(manager.state_file.read_text())
+    (removed_shard,) = [name for name in state["files"] if name.startswith("doc04--")]
+    file_id = state["files"][removed_shard]["file_id"]
+
+    (manager.content_dir / "doc04.md").unlink()
+    client.fail_batch = False
+    result = await manager.sync()
+
+    assert result.removed == [removed_shard] and not result.errors
+    assert file_id in client.deleted
+    state = json.loads(manager.state_file.read_text())
+    assert removed_shard not in state["files"]
+    assert {entry["status"] for entry in state["files"].values()} == {"attached"}